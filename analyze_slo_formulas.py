@@ -8,6 +8,8 @@ import csv
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional
+from benchmark_snapshot import load_score_matrix
+from score_matrix import MODEL_FIELDS
 
 def load_latency_data(csv_file: str = "model_latency_performance.csv") -> pd.DataFrame:
     """Load latency data from CSV"""
@@ -19,13 +21,17 @@ def load_latency_data(csv_file: str = "model_latency_performance.csv") -> pd.Dat
         return pd.DataFrame()
 
 def load_benchmark_data(csv_file: str = "opensource_all_benchmarks.csv") -> pd.DataFrame:
-    """Load benchmark data"""
+    """Load benchmark data as 0-1 scores (NaN where missing)"""
     try:
-        df = pd.read_csv(csv_file)
-        return df
+        matrix = load_score_matrix(csv_file)
     except FileNotFoundError:
         print(f"⚠ File {csv_file} not found.")
         return pd.DataFrame()
+    
+    df = pd.DataFrame(np.where(matrix.mask, matrix.scores, np.nan), columns=matrix.benchmarks)
+    for position, field in enumerate(MODEL_FIELDS):
+        df.insert(position, field, [model[field] for model in matrix.models])
+    return df
 
 def create_sample_latency_data() -> List[Dict]:
     """
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Weight sensitivity / rank stability analysis for use-case scoring
+Perturbs a use case's benchmark weights with Monte Carlo sampling (Dirichlet
+around the configured weights) and reports each model's rank distribution
+and probability of landing in the top-k.
+
+All samples in a chunk are scored with one matrix product; chunks are spread
+across a process pool, and every worker maps the same benchmark snapshot.
+
+Usage:
+    # 100k perturbations of a predefined use case on 8 workers
+    python3 analyze_weight_sensitivity.py --usecase code_completion --samples 100000 --workers 8
+
+    # Custom weights from JSON (same format as create_usecase_scores.py)
+    python3 analyze_weight_sensitivity.py --json '{"use_case": {"type": "custom", "weights": {"lcr": 0.5, "hle": 0.5}}}'
+
+    # Several use cases: writes sensitivity_code_completion.csv, sensitivity_translation.csv
+    python3 analyze_weight_sensitivity.py --config usecases.json --output sensitivity.csv
+"""
+import csv
+import os
+import re
+import sys
+import argparse
+import numpy as np
+from multiprocessing import Pool
+from typing import Dict, List, Optional
+
+from benchmark_snapshot import load_score_matrix
+from create_usecase_scores import MASTER_CSV, USE_CASE_WEIGHTS, process_json_config
+from score_matrix import ScoreMatrix, format_score, rank_order
+
+DEFAULT_SAMPLES = 10000
+DEFAULT_CONCENTRATION = 50.0
+DEFAULT_TOP_K = 5
+MAX_TRACKED_RANK = 100          # rank histogram resolution (ranks beyond this share one bucket)
+CHUNK_ELEMENTS = 20_000_000     # models x samples per matrix product
+
+_worker_matrix = None
+
+def sample_weight_vectors(base_vector: np.ndarray, n_samples: int, concentration: float,
+                          rng: np.random.Generator) -> np.ndarray:
+    """Draw n_samples weight vectors from a Dirichlet centred on base_vector
+
+    Benchmarks with zero weight stay at zero. Higher concentration keeps the
+    samples closer to the configured weights.
+    """
+    active = np.flatnonzero(base_vector > 0)
+    samples = np.zeros((n_samples, len(base_vector)), dtype=np.float64)
+    alpha = concentration * base_vector[active] / base_vector[active].sum()
+    samples[:, active] = rng.dirichlet(alpha, size=n_samples)
+    return samples
+
+def new_rank_stats(n_models: int) -> Dict[str, np.ndarray]:
+    """Empty accumulators for rank statistics"""
+    return {
+        'samples': np.zeros(1, dtype=np.int64),
+        'rank_sum': np.zeros(n_models, dtype=np.float64),
+        'rank_sq_sum': np.zeros(n_models, dtype=np.float64),
+        'best_rank': np.full(n_models, n_models, dtype=np.int64),
+        'worst_rank': np.zeros(n_models, dtype=np.int64),
+        'top1': np.zeros(n_models, dtype=np.int64),
+        'top_k': np.zeros(n_models, dtype=np.int64),
+        'histogram': np.zeros((n_models, MAX_TRACKED_RANK + 1), dtype=np.int64),
+    }
+
+def merge_rank_stats(total: Dict[str, np.ndarray], part: Dict[str, np.ndarray]):
+    """Fold one chunk's statistics into the running total"""
+    for key in ('samples', 'rank_sum', 'rank_sq_sum', 'top1', 'top_k', 'histogram'):
+        total[key] += part[key]
+    np.minimum(total['best_rank'], part['best_rank'], out=total['best_rank'])
+    np.maximum(total['worst_rank'], part['worst_rank'], out=total['worst_rank'])
+
+def rank_stats_for_weights(matrix: ScoreMatrix, weight_samples: np.ndarray, top_k: int) -> Dict[str, np.ndarray]:
+    """Rank every model under each sampled weight vector and accumulate statistics"""
+    n_models = len(matrix)
+    stats = new_rank_stats(n_models)
+    chunk_size = max(1, CHUNK_ELEMENTS // max(n_models, 1))
+    positions = np.arange(1, n_models + 1, dtype=np.int64)[:, np.newaxis]
+
+    for start in range(0, len(weight_samples), chunk_size):
+        weights = weight_samples[start:start + chunk_size]
+        scores = matrix.score(weights)                         # N x C
+        scores = np.where(np.isnan(scores), -np.inf, scores)
+        order = np.argsort(-scores, axis=0, kind='stable')     # ties in input order, as rank_order
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.broadcast_to(positions, order.shape), axis=0)
+
+        stats['samples'] += ranks.shape[1]
+        stats['rank_sum'] += ranks.sum(axis=1)
+        stats['rank_sq_sum'] += (ranks.astype(np.float64) ** 2).sum(axis=1)
+        np.minimum(stats['best_rank'], ranks.min(axis=1), out=stats['best_rank'])
+        np.maximum(stats['worst_rank'], ranks.max(axis=1), out=stats['worst_rank'])
+        stats['top1'] += (ranks == 1).sum(axis=1)
+        stats['top_k'] += (ranks <= top_k).sum(axis=1)
+        buckets = np.minimum(ranks, MAX_TRACKED_RANK + 1) - 1
+        model_ids = np.broadcast_to(np.arange(n_models)[:, np.newaxis], buckets.shape)
+        np.add.at(stats['histogram'], (model_ids.ravel(), buckets.ravel()), 1)
+
+    return stats
+
+def _init_worker(csv_file: str):
+    global _worker_matrix
+    _worker_matrix = load_score_matrix(csv_file)
+
+def _run_chunk(task):
+    base_vector, n_samples, concentration, top_k, seed = task
+    rng = np.random.default_rng(seed)
+    weights = sample_weight_vectors(base_vector, n_samples, concentration, rng)
+    return rank_stats_for_weights(_worker_matrix, weights, top_k)
+
+def analyze_sensitivity(weights: Dict[str, float], n_samples: int = DEFAULT_SAMPLES,
+                        concentration: float = DEFAULT_CONCENTRATION, top_k: int = DEFAULT_TOP_K,
+                        workers: int = 1, seed: Optional[int] = None, matrix: ScoreMatrix = None,
+                        csv_file: str = MASTER_CSV, task_size: int = 10000) -> Dict[str, np.ndarray]:
+    """Monte Carlo rank statistics for a {benchmark: weight} dict
+
+    Samples are split into tasks of task_size; with workers > 1 the tasks run
+    on a process pool whose workers each load the master data once.
+    """
+    if n_samples < 1:
+        raise ValueError(f"Number of samples must be at least 1, got {n_samples}")
+    if not concentration > 0:
+        raise ValueError(f"Concentration must be positive, got {concentration}")
+    if top_k < 1 or task_size < 1:
+        raise ValueError(f"top_k and task_size must be at least 1, got {top_k} and {task_size}")
+    if matrix is None:
+        matrix = load_score_matrix(csv_file)
+    base_vector = matrix.weight_vector(weights)
+    if not (base_vector > 0).any():
+        raise ValueError("Weights do not reference any scored benchmark")
+
+    seeds = np.random.SeedSequence(seed).spawn((n_samples + task_size - 1) // task_size)
+    tasks = []
+    remaining = n_samples
+    for child_seed in seeds:
+        size = min(task_size, remaining)
+        tasks.append((base_vector, size, concentration, top_k, child_seed))
+        remaining -= size
+
+    total = new_rank_stats(len(matrix))
+    if workers > 1:
+        with Pool(workers, initializer=_init_worker, initargs=(csv_file,)) as pool:
+            for part in pool.imap_unordered(_run_chunk, tasks):
+                merge_rank_stats(total, part)
+    else:
+        global _worker_matrix
+        _worker_matrix = matrix
+        for task in tasks:
+            merge_rank_stats(total, _run_chunk(task))
+    return total
+
+def median_rank(histogram_row: np.ndarray, samples: int) -> str:
+    """Median rank from a rank histogram ("> MAX_TRACKED_RANK" if beyond resolution)"""
+    position = int(np.searchsorted(np.cumsum(histogram_row), (samples + 1) // 2))
+    if position >= MAX_TRACKED_RANK:
+        return f">{MAX_TRACKED_RANK}"
+    return str(position + 1)
+
+def summarize_sensitivity(matrix: ScoreMatrix, weights: Dict[str, float], stats: Dict[str, np.ndarray],
+                          top_k: int) -> List[Dict]:
+    """Per-model report rows, ordered by probability of being in the top-k"""
+    base_scores = matrix.score_weights(weights)
+    base_rank = np.empty(len(matrix), dtype=np.int64)
+    base_rank[rank_order(base_scores)] = np.arange(1, len(matrix) + 1)
+    samples = int(stats['samples'][0])
+    mean = stats['rank_sum'] / samples
+    std = np.sqrt(np.maximum(stats['rank_sq_sum'] / samples - mean ** 2, 0.0))
+
+    rows = []
+    for i in np.flatnonzero(~np.isnan(base_scores)):
+        model = matrix.models[i]
+        rows.append({
+            'Model Name': model['Model Name'],
+            'Provider': model['Provider'],
+            'Dataset': model['Dataset'],
+            'Base Score': format_score(base_scores[i]),
+            'Base Rank': int(base_rank[i]),
+            'Mean Rank': f"{mean[i]:.2f}",
+            'Rank Std': f"{std[i]:.2f}",
+            'Median Rank': median_rank(stats['histogram'][i], samples),
+            'Best Rank': int(stats['best_rank'][i]),
+            'Worst Rank': int(stats['worst_rank'][i]),
+            'P(Top-1)': f"{stats['top1'][i] / samples * 100:.2f}%",
+            f'P(Top-{top_k})': f"{stats['top_k'][i] / samples * 100:.2f}%",
+            '_top_k': stats['top_k'][i],
+            '_mean': mean[i],
+        })
+    rows.sort(key=lambda r: (-r['_top_k'], r['_mean']))
+    for row in rows:
+        del row['_top_k']
+        del row['_mean']
+    return rows
+
+def output_filename(output: Optional[str], usecase_name: str, several: bool) -> str:
+    """CSV path for one use case; with several use cases each gets --output suffixed by its name"""
+    safe_name = re.sub(r'[^A-Za-z0-9._-]+', '_', usecase_name).lstrip('.') or 'usecase'
+    if not output:
+        return f"sensitivity_{safe_name}.csv"
+    if not several:
+        return output
+    base, ext = os.path.splitext(output)
+    return f"{base}_{safe_name}{ext or '.csv'}"
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Monte Carlo weight sensitivity / rank stability analysis',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 analyze_weight_sensitivity.py --usecase code_completion
+  python3 analyze_weight_sensitivity.py --usecase document_analysis_rag --samples 1000000 --workers 16 --top-k 3
+  python3 analyze_weight_sensitivity.py --config usecase_config.json --concentration 20
+
+Concentration controls how far samples stray from the configured weights:
+  ~10   = large perturbations, 50 = moderate (default), 500+ = small
+        """
+    )
+    parser.add_argument('--usecase', '-u', type=str, help='Predefined use case name')
+    parser.add_argument('--config', '-c', type=str, help='Path to JSON configuration file')
+    parser.add_argument('--json', '-j', type=str, help='JSON configuration as string')
+    parser.add_argument('--samples', '-n', type=int, default=DEFAULT_SAMPLES, help=f'Number of weight samples (default: {DEFAULT_SAMPLES})')
+    parser.add_argument('--concentration', type=float, default=DEFAULT_CONCENTRATION, help=f'Dirichlet concentration (default: {DEFAULT_CONCENTRATION})')
+    parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K, help=f'Report probability of being in the top K (default: {DEFAULT_TOP_K})')
+    parser.add_argument('--workers', '-w', type=int, default=1, help='Worker processes (default: 1)')
+    parser.add_argument('--seed', type=int, help='Random seed for reproducible runs')
+    parser.add_argument('--output', '-o', type=str,
+                        help='Output CSV (default: sensitivity_{usecase_name}.csv; with several use cases, '
+                             'each file gets the use case name appended)')
+
+    args = parser.parse_args()
+
+    if args.samples < 1 or not args.concentration > 0 or args.top_k < 1:
+        print(f"Error: --samples and --top-k must be at least 1 and --concentration positive "
+              f"(got {args.samples}, {args.top_k}, {args.concentration})")
+        sys.exit(1)
+
+    if args.usecase:
+        if args.usecase not in USE_CASE_WEIGHTS:
+            print(f"Error: Unknown use case {args.usecase}. Available: {list(USE_CASE_WEIGHTS.keys())}")
+            sys.exit(1)
+        use_cases = [(args.usecase, USE_CASE_WEIGHTS[args.usecase])]
+    elif args.config or args.json:
+        use_cases = process_json_config(config_file=args.config, json_string=args.json)
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+    matrix = load_score_matrix(MASTER_CSV)
+
+    for usecase_name, weights_config in use_cases:
+        print("=" * 70)
+        print(f"  Weight Sensitivity: {usecase_name}")
+        print("=" * 70)
+        print(f"Samples: {args.samples:,}  Concentration: {args.concentration}  Workers: {args.workers}")
+
+        stats = analyze_sensitivity(weights_config['weights'], args.samples, args.concentration,
+                                    args.top_k, args.workers, args.seed, matrix)
+        rows = summarize_sensitivity(matrix, weights_config['weights'], stats, args.top_k)
+
+        output_file = output_filename(args.output, usecase_name, len(use_cases) > 1)
+        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()) if rows else ['Model Name'])
+            writer.writeheader()
+            writer.writerows(rows)
+
+        print(f"\n  Most stable top-{args.top_k} candidates:")
+        for row in rows[:10]:
+            print(f"    {row['Model Name']:<45} base #{row['Base Rank']:<4} "
+                  f"mean #{row['Mean Rank']:<7} P(top-{args.top_k}) {row[f'P(Top-{args.top_k})']}")
+        print(f"\n✓ Saved {len(rows)} models to {output_file}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,547 @@
+#!/usr/bin/env python3
+"""
+On-disk approximate nearest-neighbour index (IVF-Flat, cosine similarity)
+
+Vectors are L2-normalized and partitioned into `nlist` inverted lists by a
+spherical k-means coarse quantizer. A query only scores the vectors of its
+`nprobe` closest lists, so search cost grows with sqrt(n) instead of n.
+Below MIN_TRAIN_SIZE live vectors the index is not trained and every search
+is exact.
+
+Directory layout:
+    meta.json       dimension, a free-form tag (e.g. the embedding model) and
+                    the current generation of the files below
+    vectors.f32     float32[n_slots, dim], append-only
+    entries.jsonl   append-only log of {"op": "add", "key", "slot", "data"} /
+                    {"op": "del", "key"} records, replayed on open
+    ivf.npz         centroids and slot -> list assignments of the last training
+    .lock           writer lock
+
+Inserts write rows at their slot offset and append log lines (no rewrite);
+deletes append a tombstone. Slots added after training are assigned to their
+closest centroid on open. The index retrains once it has doubled since the
+last training and compacts away dead slots once they outnumber live ones.
+
+Compaction writes the next generation (vectors.<g>.f32, entries.<g>.jsonl,
+ivf.<g>.npz) and switches to it by replacing meta.json, so a crash leaves
+either the old or the new files, never a mix. Writers serialize on the lock
+file and reload first if another process changed the index since they read it.
+
+Usage:
+    # Recall@k vs latency against exact search on synthetic clustered vectors
+    python3 ann_index.py --benchmark --synthetic 50000
+
+    # ... or on an existing index directory
+    python3 ann_index.py --benchmark --index usecase_registry
+"""
+import json
+import os
+import sys
+import contextlib
+import time
+import argparse
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from embedding_index import l2_normalize
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, one writer at a time
+    fcntl = None
+
+META_FILE = 'meta.json'
+VECTORS_FILE = 'vectors.f32'
+LOG_FILE = 'entries.jsonl'
+IVF_FILE = 'ivf.npz'
+LOCK_FILE = '.lock'
+
+MIN_TRAIN_SIZE = 1024
+DEFAULT_NPROBE = 16
+KMEANS_ITERATIONS = 12
+KMEANS_SAMPLE_PER_LIST = 64
+BENCHMARK_NPROBES = (1, 2, 4, 8, 16, 32)
+
+def default_nlist(n: int) -> int:
+    """Number of inverted lists for n vectors (~2 * sqrt(n))"""
+    return max(1, int(round(2 * np.sqrt(n))))
+
+def generation_file(name: str, generation: int) -> str:
+    """File name of a data file in a generation (generation 0 keeps the plain name)"""
+    if not generation:
+        return name
+    base, ext = os.path.splitext(name)
+    return f"{base}.{generation}{ext}"
+
+def read_meta(path: str) -> Optional[Dict]:
+    meta_file = os.path.join(path, META_FILE)
+    if not os.path.exists(meta_file):
+        return None
+    with open(meta_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def index_version(path: str) -> Optional[Tuple]:
+    """(generation, (mtime, size) of each data file), None when nothing was added yet"""
+    meta = read_meta(path)
+    generation = meta.get('generation', 0) if meta else 0
+    versions = []
+    for name in (LOG_FILE, VECTORS_FILE, IVF_FILE):
+        try:
+            stat = os.stat(os.path.join(path, generation_file(name, generation)))
+            versions.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            versions.append(None)
+    return (generation, *versions) if versions[0] is not None else None
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, best first"""
+    if k >= len(scores):
+        return np.argsort(-scores, kind='stable')
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part], kind='stable')]
+
+def spherical_kmeans(vectors: np.ndarray, nlist: int, iterations: int = KMEANS_ITERATIONS,
+                     seed: int = 0) -> np.ndarray:
+    """Unit-length centroids of normalized vectors (Lloyd iterations on cosine similarity)"""
+    rng = np.random.default_rng(seed)
+    nlist = min(nlist, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        counts = np.bincount(assignments, minlength=nlist)
+        empty = counts == 0
+        if empty.any():
+            # Re-seed empty lists with random points so every list stays in use
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        centroids = l2_normalize(sums)
+    return centroids
+
+class IVFIndex:
+    """Cosine top-k over string keys with incremental add/remove, persisted in a directory
+
+    Every key can carry a JSON-serializable `data` payload (see get()).
+    """
+
+    def __init__(self, path: str, dim: Optional[int] = None, tag: Optional[str] = None):
+        self.path = path
+        self.meta = read_meta(path) or {'dim': dim, 'tag': tag, 'generation': 0}
+        if dim is not None and self.meta['dim'] is not None and dim != self.meta['dim']:
+            raise ValueError(f"Index {path} has dimension {self.meta['dim']}, got {dim}")
+        self._lock_file = None
+        self._lock_depth = 0
+        self._reset()
+        self._load()
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self.meta['dim']
+
+    @property
+    def tag(self) -> Optional[str]:
+        return self.meta.get('tag')
+
+    @property
+    def generation(self) -> int:
+        return self.meta.get('generation', 0)
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    def _reset(self):
+        self.vectors = np.zeros((0, self.dim or 0), dtype=np.float32)
+        self.size = 0
+        self.alive = np.zeros(0, dtype=bool)
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self.slot_keys: List[Optional[str]] = []
+        self.positions: Dict[str, int] = {}
+        self.data: Dict[str, object] = {}
+        self.centroids = None
+        self.trained_slots = 0
+        self._lists = None
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, key: str):
+        return key in self.positions
+
+    def keys(self) -> List[str]:
+        return list(self.positions)
+
+    def get(self, key: str, default=None):
+        """Payload stored with key"""
+        return self.data.get(key, default)
+
+    def vector(self, key: str) -> np.ndarray:
+        return self.vectors[self.positions[key]]
+
+    # Storage
+
+    def _file(self, name: str, generation: Optional[int] = None) -> str:
+        """Path of a file in the index directory (data files of the current generation by default)"""
+        if name in (VECTORS_FILE, LOG_FILE, IVF_FILE):
+            name = generation_file(name, self.generation if generation is None else generation)
+        return os.path.join(self.path, name)
+
+    @contextlib.contextmanager
+    def _writing(self):
+        """Hold the writer lock (re-entrant) with the in-memory state synced to disk"""
+        if self._lock_depth == 0:
+            os.makedirs(self.path, exist_ok=True)
+            self._lock_file = open(self._file(LOCK_FILE), 'a')
+            if fcntl is not None:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            if index_version(self.path) != self._version:
+                # Another process wrote since we read the index: start from its state
+                self.meta = read_meta(self.path) or self.meta
+                self._reset()
+                self._load()
+        self._lock_depth += 1
+        try:
+            yield
+        finally:
+            self._lock_depth -= 1
+            if self._lock_depth == 0:
+                self._version = index_version(self.path)
+                self._lock_file.close()  # releases the lock
+                self._lock_file = None
+
+    def _load(self):
+        self._version = index_version(self.path)
+        if self.dim is None or not os.path.exists(self._file(VECTORS_FILE)):
+            return
+        vectors = np.fromfile(self._file(VECTORS_FILE), dtype=np.float32)
+        n_rows = len(vectors) // self.dim  # a torn trailing row is ignored (and overwritten by the next add)
+        self._grow(n_rows)
+        self.vectors[:n_rows] = vectors[:n_rows * self.dim].reshape(n_rows, self.dim)
+        self.size = n_rows
+        self.slot_keys = [None] * n_rows
+
+        if os.path.exists(self._file(LOG_FILE)):
+            with open(self._file(LOG_FILE), 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line of an interrupted write
+                    if entry['op'] == 'add' and entry['slot'] < n_rows:
+                        self._apply_add(entry['key'], entry['slot'], entry.get('data'))
+                    elif entry['op'] == 'del':
+                        self._apply_remove(entry['key'])
+
+        if os.path.exists(self._file(IVF_FILE)):
+            with np.load(self._file(IVF_FILE)) as ivf:
+                self.centroids = ivf['centroids']
+                assigned = ivf['assignments'][:n_rows]
+            self.trained_slots = len(assigned)
+            self.assignments[:len(assigned)] = assigned
+            self._assign(np.arange(len(assigned), n_rows))
+
+    def _write_meta(self):
+        os.makedirs(self.path, exist_ok=True)
+        tmp = self._file(META_FILE + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, self._file(META_FILE))
+
+    def _append_log(self, entries: List[Dict]):
+        with open(self._file(LOG_FILE), 'a+b') as f:
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')  # terminate the torn last line of an interrupted write
+            f.write(''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries).encode('utf-8'))
+
+    def _grow(self, n: int):
+        """Make room for n slots (capacity doubles, so appends are amortized O(1))"""
+        if n <= len(self.alive):
+            return
+        capacity = max(n, 2 * len(self.alive), 64)
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        vectors[:self.size] = self.vectors[:self.size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self.size] = self.alive[:self.size]
+        assignments = np.full(capacity, -1, dtype=np.int32)
+        assignments[:self.size] = self.assignments[:self.size]
+        self.vectors, self.alive, self.assignments = vectors, alive, assignments
+
+    def _apply_add(self, key: str, slot: int, data):
+        if key in self.positions:
+            self.alive[self.positions[key]] = False
+        self.positions[key] = slot
+        self.slot_keys[slot] = key
+        self.alive[slot] = True
+        self.data[key] = data
+
+    def _apply_remove(self, key: str) -> bool:
+        slot = self.positions.pop(key, None)
+        if slot is None:
+            return False
+        self.alive[slot] = False
+        self.data.pop(key, None)
+        return True
+
+    def _assign(self, slots: np.ndarray):
+        if self.centroids is not None and len(slots):
+            self.assignments[slots] = np.argmax(self.vectors[slots] @ self.centroids.T, axis=1)
+        self._lists = None
+
+    # Updates
+
+    def add(self, keys: Sequence[str], vectors: np.ndarray, data: Optional[Sequence] = None):
+        """Insert (or replace) keys with their vectors and optional payloads"""
+        keys = list(keys)
+        if not keys:
+            return
+        with self._writing():
+            self._add(keys, vectors, data)
+
+    def _add(self, keys: List[str], vectors: np.ndarray, data: Optional[Sequence]):
+        vectors = l2_normalize(np.asarray(vectors, dtype=np.float32).reshape(len(keys), -1))
+        if self.dim is None:
+            self.meta['dim'] = vectors.shape[1]
+            self.vectors = np.zeros((0, self.dim), dtype=np.float32)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Index {self.path} has dimension {self.dim}, got {vectors.shape[1]}")
+        if not os.path.exists(self._file(META_FILE)):
+            self._write_meta()
+        data = list(data) if data is not None else [None] * len(keys)
+
+        start = self.size
+        slots = np.arange(start, start + len(keys))
+        # Vectors first: a crash before the log line leaves an unreferenced (dead) row.
+        # Rows go to their slot offset, overwriting a torn row left by an interrupted add.
+        with open(self._file(VECTORS_FILE), 'r+b' if os.path.exists(self._file(VECTORS_FILE)) else 'wb') as f:
+            f.seek(start * self.dim * vectors.itemsize)
+            f.write(vectors.tobytes())
+            f.truncate()
+        self._append_log([{'op': 'add', 'key': key, 'slot': int(slot), 'data': payload}
+                          for key, slot, payload in zip(keys, slots, data)])
+
+        self._grow(start + len(keys))
+        self.vectors[slots] = vectors
+        self.size = start + len(keys)
+        self.slot_keys.extend([None] * len(keys))
+        for key, slot, payload in zip(keys, slots, data):
+            self._apply_add(key, int(slot), payload)
+        self._assign(slots)
+        self._maybe_train()
+
+    def remove(self, keys: Iterable[str]) -> int:
+        """Delete keys; returns how many existed"""
+        keys = list(keys)
+        with self._writing():
+            removed = [key for key in keys if key in self.positions]
+            if not removed:
+                return 0
+            self._append_log([{'op': 'del', 'key': key} for key in removed])
+            for key in removed:
+                self._apply_remove(key)
+            if self.size - len(self) > max(len(self), MIN_TRAIN_SIZE):
+                self.compact()
+        return len(removed)
+
+    def _maybe_train(self):
+        if len(self) >= MIN_TRAIN_SIZE and (not self.trained or self.size >= 2 * self.trained_slots):
+            self.train()
+
+    def train(self, nlist: Optional[int] = None, seed: int = 0):
+        """(Re)build the coarse quantizer from the live vectors and persist it"""
+        with self._writing():
+            live = np.flatnonzero(self.alive[:self.size])
+            if not len(live):
+                return
+            nlist = nlist or default_nlist(len(live))
+            rng = np.random.default_rng(seed)
+            sample_size = min(len(live), KMEANS_SAMPLE_PER_LIST * nlist)
+            sample = self.vectors[rng.choice(live, sample_size, replace=False)]
+            self.centroids = spherical_kmeans(sample, nlist, seed=seed)
+            self._assign(np.arange(self.size))
+            self.trained_slots = self.size
+            self._save_ivf()
+
+    def _save_ivf(self, generation: Optional[int] = None):
+        tmp = self._file(IVF_FILE + '.tmp.npz')
+        np.savez(tmp, centroids=self.centroids, assignments=self.assignments[:self.size])
+        os.replace(tmp, self._file(IVF_FILE, generation))
+
+    def compact(self):
+        """Rewrite the vectors and log without dead slots, as the next generation"""
+        with self._writing():
+            self._compact()
+
+    def _compact(self):
+        live = np.flatnonzero(self.alive[:self.size])
+        keys = [self.slot_keys[slot] for slot in live]
+        vectors = self.vectors[live].copy()
+        assignments = self.assignments[live].copy()
+        old_generation = self.generation
+        generation = old_generation + 1
+
+        with open(self._file(VECTORS_FILE, generation), 'wb') as f:
+            f.write(vectors.tobytes())
+        with open(self._file(LOG_FILE, generation), 'w', encoding='utf-8') as f:
+            for slot, key in enumerate(keys):
+                f.write(json.dumps({'op': 'add', 'key': key, 'slot': slot, 'data': self.data.get(key)},
+                                   ensure_ascii=False) + '\n')
+
+        centroids, data = self.centroids, self.data
+        self._reset()
+        self._grow(len(keys))
+        self.vectors[:len(keys)] = vectors
+        self.size = len(keys)
+        self.slot_keys = [None] * len(keys)
+        for slot, key in enumerate(keys):
+            self._apply_add(key, slot, data.get(key))
+        if centroids is not None:
+            self.centroids = centroids
+            self.assignments[:len(keys)] = assignments
+            self.trained_slots = len(keys)
+            self._save_ivf(generation)
+
+        # The switch: until meta.json is replaced, readers (and a crash) see the old generation whole
+        self.meta['generation'] = generation
+        self._write_meta()
+        for name in (VECTORS_FILE, LOG_FILE, IVF_FILE):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self._file(name, old_generation))
+
+    # Search
+
+    def _inverted_lists(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(slots grouped by list, list boundaries), rebuilt after inserts"""
+        if self._lists is None:
+            assignments = self.assignments[:self.size]
+            order = np.argsort(assignments, kind='stable')
+            bounds = np.searchsorted(assignments[order], np.arange(len(self.centroids) + 1))
+            self._lists = (order, bounds)
+        return self._lists
+
+    def candidates(self, query: np.ndarray, nprobe: Optional[int] = None) -> np.ndarray:
+        """Live slots a query scores: its nprobe closest lists, or everything when untrained"""
+        if not self.trained:
+            return np.flatnonzero(self.alive[:self.size])
+        order, bounds = self._inverted_lists()
+        probes = top_k_indices(self.centroids @ query, nprobe or DEFAULT_NPROBE)
+        slots = np.concatenate([order[bounds[p]:bounds[p + 1]] for p in probes])
+        return slots[self.alive[slots]]
+
+    def search(self, query: np.ndarray, k: int = 10, nprobe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """(key, cosine similarity) of the approximate top-k, best first"""
+        query = l2_normalize(np.asarray(query, dtype=np.float32).reshape(-1))
+        slots = self.candidates(query, nprobe)
+        scores = self.vectors[slots] @ query
+        return [(self.slot_keys[slots[i]], float(scores[i])) for i in top_k_indices(scores, k)]
+
+    def search_exact(self, query: np.ndarray, k: int = 10) -> List[Tuple[str, float]]:
+        """(key, cosine similarity) of the exact top-k by brute force"""
+        query = l2_normalize(np.asarray(query, dtype=np.float32).reshape(-1))
+        slots = np.flatnonzero(self.alive[:self.size])
+        scores = self.vectors[slots] @ query
+        return [(self.slot_keys[slots[i]], float(scores[i])) for i in top_k_indices(scores, k)]
+
+def benchmark_recall(index: IVFIndex, queries: np.ndarray, k: int = 10,
+                     nprobes: Sequence[int] = BENCHMARK_NPROBES) -> List[Dict]:
+    """Recall@k and per-query latency of ANN search for each nprobe, with exact search as baseline"""
+    rows = []
+    latencies = []
+    exact = []
+    for query in queries:
+        t = time.perf_counter()
+        exact.append({key for key, _ in index.search_exact(query, k)})
+        latencies.append(time.perf_counter() - t)
+    rows.append({'nprobe': 'exact', 'recall': 1.0, 'mean_ms': 1000 * np.mean(latencies),
+                 'p95_ms': 1000 * np.percentile(latencies, 95), 'scanned': len(index)})
+
+    for nprobe in nprobes:
+        if index.trained and nprobe > len(index.centroids):
+            break
+        latencies = []
+        hits = 0
+        scanned = 0
+        for query, expected in zip(queries, exact):
+            t = time.perf_counter()
+            found = index.search(query, k, nprobe)
+            latencies.append(time.perf_counter() - t)
+            hits += len(expected & {key for key, _ in found})
+            scanned += len(index.candidates(l2_normalize(query), nprobe))
+        rows.append({'nprobe': nprobe, 'recall': hits / max(1, sum(len(e) for e in exact)),
+                     'mean_ms': 1000 * np.mean(latencies), 'p95_ms': 1000 * np.percentile(latencies, 95),
+                     'scanned': scanned / len(queries)})
+        if not index.trained:
+            break
+    return rows
+
+def print_benchmark(rows: List[Dict], k: int):
+    print(f"\n  {'nprobe':>8s} {f'recall@{k}':>10s} {'mean ms':>9s} {'p95 ms':>9s} {'scanned':>9s}")
+    for row in rows:
+        print(f"  {str(row['nprobe']):>8s} {row['recall']:10.3f} {row['mean_ms']:9.3f} "
+              f"{row['p95_ms']:9.3f} {row['scanned']:9.0f}")
+
+def perturbed_queries(index: IVFIndex, n: int, noise: float = 0.05, seed: int = 1) -> np.ndarray:
+    """Noisy copies of n indexed vectors, standing in for queries near registered entries"""
+    rng = np.random.default_rng(seed)
+    keys = index.keys()
+    picked = rng.choice(len(keys), min(n, len(keys)), replace=False)
+    queries = np.stack([index.vector(keys[i]) for i in picked])
+    return l2_normalize(queries + noise * rng.standard_normal(queries.shape).astype(np.float32))
+
+def run_benchmark(index: IVFIndex, queries: np.ndarray, k: int = 10):
+    lists = len(index.centroids) if index.trained else 'untrained, exact'
+    print(f"  {len(index):,} vectors, dim {index.dim}, lists: {lists}, {len(queries)} queries")
+    print_benchmark(benchmark_recall(index, queries, k), k)
+
+def synthetic_vectors(n: int, dim: int = 384, clusters: int = 200, seed: int = 0) -> np.ndarray:
+    """Normalized vectors drawn around random cluster centres (embedding-like structure)"""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+    points = centres[rng.integers(0, clusters, n)] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32)
+    return l2_normalize(points)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the IVF approximate nearest-neighbour index against exact search',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 ann_index.py --benchmark --synthetic 50000
+  python3 ann_index.py --benchmark --index usecase_registry --k 5
+        """
+    )
+    parser.add_argument('--benchmark', action='store_true', help='Measure recall@k and latency per nprobe')
+    parser.add_argument('--index', type=str, help='Existing index directory to benchmark')
+    parser.add_argument('--synthetic', type=int, metavar='N', help='Benchmark a fresh index of N synthetic vectors')
+    parser.add_argument('--dim', type=int, default=384, help='Dimension of synthetic vectors (default: 384)')
+    parser.add_argument('--queries', type=int, default=200, help='Number of queries (default: 200)')
+    parser.add_argument('--k', type=int, default=10, help='k for recall@k (default: 10)')
+
+    args = parser.parse_args()
+
+    if not args.benchmark or not (args.index or args.synthetic):
+        parser.print_help()
+        sys.exit(1)
+
+    if args.synthetic:
+        import tempfile
+        vectors = synthetic_vectors(args.synthetic + args.queries, args.dim)
+        with tempfile.TemporaryDirectory(prefix='ann_index_') as tmp_dir:
+            start = time.perf_counter()
+            index = IVFIndex(tmp_dir)
+            index.add([f"v{i}" for i in range(args.synthetic)], vectors[:args.synthetic])
+            print(f"✓ Built index of {len(index):,} vectors in {time.perf_counter() - start:.1f}s")
+            run_benchmark(index, vectors[args.synthetic:], args.k)
+        return
+
+    index = IVFIndex(args.index)
+    if not len(index):
+        print(f"Error: index {args.index} is empty")
+        sys.exit(1)
+    run_benchmark(index, perturbed_queries(index, args.queries), args.k)
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,57 @@
 """
 API Client for artificialanalysis.ai to fetch real intelligence evaluation scores
 """
-import requests
 import json
 from typing import Dict, List, Optional, Any
 
+import fetch_engine
+from endpoint_discovery import EndpointResolver
+
 API_KEY = "aa_OXmwOTJvjVHpPnJQsOgimbFMwsPoVgOT"
 BASE_URL = "https://api.artificialanalysis.ai"
 
+# Candidate URL patterns per method, in order of preference; the endpoint
+# resolver probes them concurrently and remembers the one that answers
+MODELS_ENDPOINTS = [
+    f"{BASE_URL}/v1/models",
+    f"{BASE_URL}/models",
+    f"{BASE_URL}/v1/models/open-source",
+    f"{BASE_URL}/open-source/models",
+]
+BENCHMARKS_ENDPOINTS = [
+    f"{BASE_URL}/v1/benchmarks",
+    f"{BASE_URL}/benchmarks",
+    f"{BASE_URL}/v1/benchmarks/list",
+]
+MODEL_SCORES_ENDPOINTS = [
+    f"{BASE_URL}/v1/models/{{model_id}}/scores",
+    f"{BASE_URL}/v1/models/{{model_id}}/evaluations",
+    f"{BASE_URL}/models/{{model_id}}/scores",
+    f"{BASE_URL}/v1/evaluations?model_id={{model_id}}",
+]
+EVALUATIONS_ENDPOINTS = [
+    f"{BASE_URL}/v1/evaluations",
+    f"{BASE_URL}/v1/benchmarks/results",
+    f"{BASE_URL}/v1/models/evaluations",
+    f"{BASE_URL}/evaluations/all",
+]
+
+def _parse_models(data: Any) -> Optional[List[Dict]]:
+    if isinstance(data, list):
+        return data
+    elif isinstance(data, dict) and 'models' in data:
+        return data['models']
+    elif isinstance(data, dict) and 'data' in data:
+        return data['data']
+    return None
+
+def _parse_benchmarks(data: Any) -> Optional[List[Dict]]:
+    if isinstance(data, list):
+        return data
+    elif isinstance(data, dict) and 'benchmarks' in data:
+        return data['benchmarks']
+    return None
+
 class ArtificialAnalysisClient:
     def __init__(self, api_key: str):
         self.api_key = api_key
@@ -19,97 +63,29 @@ class ArtificialAnalysisClient:
             "Content-Type": "application/json",
             "Accept": "application/json"
         }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        self.resolver = EndpointResolver(verbose=True)
 
     def get_models(self) -> Optional[List[Dict]]:
         """Get list of all models"""
-        endpoints = [
-            f"{BASE_URL}/v1/models",
-            f"{BASE_URL}/models",
-            f"{BASE_URL}/v1/models/open-source",
-            f"{BASE_URL}/open-source/models"
-        ]
-        
-        for endpoint in endpoints:
-            try:
-                response = self.session.get(endpoint, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    if isinstance(data, list):
-                        return data
-                    elif isinstance(data, dict) and 'models' in data:
-                        return data['models']
-                    elif isinstance(data, dict) and 'data' in data:
-                        return data['data']
-            except Exception as e:
-                print(f"Error with {endpoint}: {e}")
-                continue
-        
-        return None
+        return fetch_engine.run(self.resolver.fetch('get_models', MODELS_ENDPOINTS, _parse_models, self.headers))
 
     def get_benchmarks(self) -> Optional[List[Dict]]:
         """Get list of all benchmarks"""
-        endpoints = [
-            f"{BASE_URL}/v1/benchmarks",
-            f"{BASE_URL}/benchmarks",
-            f"{BASE_URL}/v1/benchmarks/list"
-        ]
-        
-        for endpoint in endpoints:
-            try:
-                response = self.session.get(endpoint, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    if isinstance(data, list):
-                        return data
-                    elif isinstance(data, dict) and 'benchmarks' in data:
-                        return data['benchmarks']
-            except Exception as e:
-                print(f"Error with {endpoint}: {e}")
-                continue
-        
-        return None
+        return fetch_engine.run(self.resolver.fetch('get_benchmarks', BENCHMARKS_ENDPOINTS, _parse_benchmarks,
+                                                    self.headers))
 
     def get_model_scores(self, model_id: str) -> Optional[Dict]:
         """Get scores for a specific model"""
-        endpoints = [
-            f"{BASE_URL}/v1/models/{model_id}/scores",
-            f"{BASE_URL}/v1/models/{model_id}/evaluations",
-            f"{BASE_URL}/models/{model_id}/scores",
-            f"{BASE_URL}/v1/evaluations?model_id={model_id}"
-        ]
-        
-        for endpoint in endpoints:
-            try:
-                response = self.session.get(endpoint, timeout=10)
-                if response.status_code == 200:
-                    return response.json()
-            except Exception as e:
-                print(f"Error with {endpoint}: {e}")
-                continue
-        
-        return None
+        return fetch_engine.run(self.get_model_scores_async(model_id))
+
+    async def get_model_scores_async(self, model_id: str) -> Optional[Dict]:
+        """get_model_scores on the shared fetch engine"""
+        return await self.resolver.fetch('get_model_scores', MODEL_SCORES_ENDPOINTS, headers=self.headers,
+                                         model_id=model_id)
 
     def get_all_evaluations(self) -> Optional[Dict]:
         """Get all evaluations (models with their scores)"""
-        endpoints = [
-            f"{BASE_URL}/v1/evaluations",
-            f"{BASE_URL}/v1/benchmarks/results",
-            f"{BASE_URL}/v1/models/evaluations",
-            f"{BASE_URL}/evaluations/all"
-        ]
-        
-        for endpoint in endpoints:
-            try:
-                response = self.session.get(endpoint, timeout=10)
-                if response.status_code == 200:
-                    return response.json()
-            except Exception as e:
-                print(f"Error with {endpoint}: {e}")
-                continue
-        
-        return None
+        return fetch_engine.run(self.resolver.fetch('get_all_evaluations', EVALUATIONS_ENDPOINTS, headers=self.headers))
 
     def fetch_complete_data(self) -> Dict:
         """Fetch complete evaluation data structure"""
@@ -138,10 +114,16 @@ class ArtificialAnalysisClient:
         
         if models:
             print(f"Processing {len(models)} models...")
-            for model in models[:20]:  # Limit to first 20 for testing
-                model_id = model.get('id') or model.get('model_id') or model.get('name', '').lower().replace(' ', '-')
-                print(f"  Fetching scores for {model.get('name', model_id)}...")
-                scores = self.get_model_scores(model_id)
+            models = models[:20]  # Limit to first 20 for testing
+            model_ids = [model.get('id') or model.get('model_id') or model.get('name', '').lower().replace(' ', '-')
+                         for model in models]
+            # Scores for all models at once; the others wait for the first model's endpoint probe,
+            # then request only the remembered endpoint
+            all_scores = fetch_engine.run_all(lambda engine, model_id: self.get_model_scores_async(model_id), model_ids)
+            for model, model_id, scores in zip(models, model_ids, all_scores):
+                print(f"  Fetched scores for {model.get('name', model_id)}")
+                if isinstance(scores, Exception):
+                    scores = None
                 
                 model_data = {
                     "id": model_id,
@@ -251,5 +233,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        fetch_engine.close_default_engine()
 
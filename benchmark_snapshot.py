@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Versioned, memory-mapped binary snapshot of opensource_all_benchmarks.csv
+
+The snapshot stores the model x benchmark scores as a raw float64 array, a
+missing-value bitmap and an interned UTF-8 string table for model, provider
+and dataset names. Loading it maps the file read-only instead of parsing
+"N/A"/"xx.xx%" text, so cold-load time stays flat as the catalog grows and
+several processes share the same pages.
+
+File layout (little-endian, every section aligned to 64 bytes):
+    header          magic, version, counts and section offsets (see HEADER_FORMAT)
+    scores          float64[n_models, n_benchmarks], 0.0 where missing
+    missing         uint8[n_models, ceil(n_benchmarks / 8)], bit set = missing
+    model_refs      uint32[n_models, 3], string ids of name/provider/dataset
+    benchmark_refs  uint32[n_benchmarks], string ids of benchmark column names
+    string_offsets  uint64[n_strings + 1]
+    string_data     UTF-8 bytes
+
+Usage:
+    # Build a snapshot from the existing master CSV
+    python3 benchmark_snapshot.py --csv opensource_all_benchmarks.csv
+
+    # Show what a snapshot contains
+    python3 benchmark_snapshot.py --info opensource_all_benchmarks.snapshot
+"""
+import mmap
+import os
+import struct
+import sys
+import argparse
+import numpy as np
+from typing import Dict, List, Optional
+
+from score_matrix import MODEL_FIELDS, ScoreMatrix
+
+SNAPSHOT_MAGIC = b'AABS'
+SNAPSHOT_VERSION = 2  # v2: float64 scores, so snapshot rankings match the CSV bit for bit
+DEFAULT_CSV_FILE = 'opensource_all_benchmarks.csv'
+DEFAULT_SNAPSHOT_FILE = 'opensource_all_benchmarks.snapshot'
+
+# magic, version, flags, n_models, n_benchmarks, n_strings,
+# offsets of: scores, missing, model_refs, benchmark_refs, string_offsets, string_data
+HEADER_FORMAT = '<4sHHQII6Q'
+HEADER_SIZE = 128
+SECTION_ALIGN = 64
+
+def _align(offset: int) -> int:
+    return (offset + SECTION_ALIGN - 1) // SECTION_ALIGN * SECTION_ALIGN
+
+class StringTable:
+    """Interned UTF-8 strings addressed by integer id"""
+
+    def __init__(self, offsets: np.ndarray, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def get(self, string_id: int) -> str:
+        start = int(self.offsets[string_id])
+        end = int(self.offsets[string_id + 1])
+        return bytes(self.data[start:end]).decode('utf-8')
+
+class SnapshotModels:
+    """Read-only sequence of model dicts decoded on demand from the string table"""
+
+    def __init__(self, model_refs: np.ndarray, strings: StringTable):
+        self.model_refs = model_refs
+        self.strings = strings
+
+    def __len__(self):
+        return len(self.model_refs)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        refs = self.model_refs[index]
+        return {field: self.strings.get(int(refs[k])) for k, field in enumerate(MODEL_FIELDS)}
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+def write_snapshot(models: List[Dict], benchmarks: List[str], scores: np.ndarray,
+                   mask: np.ndarray, filename: str = DEFAULT_SNAPSHOT_FILE):
+    """Write a snapshot from model dicts and 0-1 score/mask arrays
+
+    The file is written to a temporary name and renamed into place, so readers
+    that already mapped the old snapshot keep a consistent view.
+    """
+    n_models, n_benchmarks = len(models), len(benchmarks)
+    scores = np.where(mask, scores, 0.0).astype('<f8').reshape(n_models, n_benchmarks)
+    missing = np.packbits(~mask.astype(bool), axis=1).reshape(n_models, -1)
+
+    # Intern every string once (providers/datasets repeat across models)
+    string_ids = {}
+    strings = []
+
+    def intern(value: str) -> int:
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value.encode('utf-8'))
+        return string_ids[value]
+
+    model_refs = np.array(
+        [[intern(model.get(field, '') or '') for field in MODEL_FIELDS] for model in models],
+        dtype='<u4'
+    ).reshape(n_models, len(MODEL_FIELDS))
+    benchmark_refs = np.array([intern(b) for b in benchmarks], dtype='<u4')
+    string_offsets = np.zeros(len(strings) + 1, dtype='<u8')
+    string_offsets[1:] = np.cumsum([len(s) for s in strings])
+    string_data = b''.join(strings)
+
+    sections = [scores.tobytes(), missing.tobytes(), model_refs.tobytes(),
+                benchmark_refs.tobytes(), string_offsets.tobytes(), string_data]
+    offsets = []
+    position = HEADER_SIZE
+    for section in sections:
+        position = _align(position)
+        offsets.append(position)
+        position += len(section)
+
+    header = struct.pack(HEADER_FORMAT, SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0,
+                         n_models, n_benchmarks, len(strings), *offsets)
+
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, 'wb') as f:
+        f.write(header.ljust(HEADER_SIZE, b'\0'))
+        for offset, section in zip(offsets, sections):
+            f.seek(offset)
+            f.write(section)
+    os.replace(tmp_filename, filename)
+
+def write_snapshot_from_csv(csv_file: str = DEFAULT_CSV_FILE, filename: str = DEFAULT_SNAPSHOT_FILE):
+    """Convert an existing master CSV into a snapshot"""
+    matrix = ScoreMatrix.from_csv(csv_file)
+    write_snapshot(matrix.models, matrix.benchmarks, matrix.scores, matrix.mask, filename)
+    return matrix
+
+def load_snapshot(filename: str = DEFAULT_SNAPSHOT_FILE) -> ScoreMatrix:
+    """Map a snapshot read-only and wrap it as a ScoreMatrix (no parsing, no copies of scores)"""
+    with open(filename, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, _flags, n_models, n_benchmarks, n_strings, *offsets = struct.unpack_from(HEADER_FORMAT, buffer, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"{filename} is not a benchmark snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {version} in {filename} (expected {SNAPSHOT_VERSION})")
+    scores_at, missing_at, model_refs_at, benchmark_refs_at, string_offsets_at, string_data_at = offsets
+
+    scores = np.frombuffer(buffer, dtype='<f8', count=n_models * n_benchmarks, offset=scores_at)
+    scores = scores.reshape(n_models, n_benchmarks)
+    bitmap_width = (n_benchmarks + 7) // 8
+    missing = np.frombuffer(buffer, dtype=np.uint8, count=n_models * bitmap_width, offset=missing_at)
+    missing = missing.reshape(n_models, bitmap_width)
+    mask = ~np.unpackbits(missing, axis=1, count=n_benchmarks).astype(bool)
+    model_refs = np.frombuffer(buffer, dtype='<u4', count=n_models * len(MODEL_FIELDS), offset=model_refs_at)
+    model_refs = model_refs.reshape(n_models, len(MODEL_FIELDS))
+    benchmark_refs = np.frombuffer(buffer, dtype='<u4', count=n_benchmarks, offset=benchmark_refs_at)
+    string_offsets = np.frombuffer(buffer, dtype='<u8', count=n_strings + 1, offset=string_offsets_at)
+    strings = StringTable(string_offsets, memoryview(buffer)[string_data_at:])
+
+    benchmarks = [strings.get(int(ref)) for ref in benchmark_refs]
+    matrix = ScoreMatrix(SnapshotModels(model_refs, strings), benchmarks, scores, mask)
+    matrix.snapshot_buffer = buffer  # keep the mapping alive as long as the matrix
+    return matrix
+
+def load_score_matrix(csv_file: str = DEFAULT_CSV_FILE, snapshot_file: Optional[str] = None) -> ScoreMatrix:
+    """Load the master benchmark data for ranking
+
+    Uses the binary snapshot when it exists and is at least as new as the CSV,
+    and falls back to parsing the CSV otherwise (also when the snapshot was
+    written by another format version).
+    """
+    if snapshot_file is None:
+        snapshot_file = os.path.splitext(csv_file)[0] + '.snapshot'
+    if os.path.exists(snapshot_file):
+        if not os.path.exists(csv_file):
+            return load_snapshot(snapshot_file)
+        if os.path.getmtime(snapshot_file) >= os.path.getmtime(csv_file):
+            try:
+                return load_snapshot(snapshot_file)
+            except ValueError as e:
+                print(f"Warning: ignoring {snapshot_file}: {e}", file=sys.stderr)
+    return ScoreMatrix.from_csv(csv_file)
+
+def print_snapshot_info(filename: str):
+    """Print a summary of a snapshot file"""
+    matrix = load_snapshot(filename)
+    present = int(matrix.mask.sum())
+    print(f"Snapshot: {filename} (format v{SNAPSHOT_VERSION}, {os.path.getsize(filename):,} bytes)")
+    print(f"  Models: {len(matrix)}")
+    print(f"  Benchmarks: {len(matrix.benchmarks)}")
+    print(f"  Scores present: {present}/{matrix.scores.size}")
+    print(f"  Interned strings: {len(matrix.models.strings)}")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Build or inspect the binary benchmark snapshot',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 benchmark_snapshot.py --csv opensource_all_benchmarks.csv
+  python3 benchmark_snapshot.py --info opensource_all_benchmarks.snapshot
+        """
+    )
+    parser.add_argument('--csv', type=str, default=DEFAULT_CSV_FILE, help='Master CSV to convert')
+    parser.add_argument('--output', '-o', type=str, default=DEFAULT_SNAPSHOT_FILE, help='Snapshot file to write')
+    parser.add_argument('--info', type=str, help='Print information about an existing snapshot')
+
+    args = parser.parse_args()
+
+    if args.info:
+        print_snapshot_info(args.info)
+        return
+
+    if not os.path.exists(args.csv):
+        print(f"Error: {args.csv} not found")
+        sys.exit(1)
+
+    matrix = write_snapshot_from_csv(args.csv, args.output)
+    print(f"✓ Wrote {args.output} with {len(matrix)} models x {len(matrix.benchmarks)} benchmarks")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Keyword-first cascade matcher with a semantic fallback
+Custom use case descriptions are first scored by the cheap keyword matcher
+(get_best_models.find_best_matching_usecases). When its top match beats the
+runner-up by at least the cascade margin, that use case answers the request
+and the embedding model is never loaded; only ambiguous descriptions fall
+through to the MiniLM matcher in get_best_models_semantic.
+
+Every answer reports its tier: 'keyword' or 'semantic' (predefined configs
+are answered directly and report 'predefined').
+
+Set the margin with CASCADE_MARGIN (default 0.15, on the keyword matcher's
+0-1 scale: 0.7 for a use case name in the text plus up to 0.3 for keywords).
+
+Usage:
+    # Fraction of traffic the keyword tier answers (never touching torch)
+    python3 cascade_matcher.py --benchmark --traffic requests.jsonl
+
+    # ... and how often its answer agrees with the semantic top match
+    python3 cascade_matcher.py --benchmark --traffic requests.jsonl --compare
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import argparse
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import get_best_models as keyword_matcher
+import get_best_models_semantic as semantic
+
+CASCADE_MARGIN = float(os.environ.get('CASCADE_MARGIN', 0.15))
+KEYWORD_TIER = 'keyword'
+SEMANTIC_TIER = 'semantic'
+PREDEFINED_TIER = 'predefined'
+
+_tier_counts = Counter()
+_use_case_embeddings = None
+
+def keyword_matches(description: str) -> List[Tuple[str, float]]:
+    """(use case, keyword score) for every predefined use case, best first"""
+    return keyword_matcher.find_best_matching_usecases(description, top_n=len(keyword_matcher.PREDEFINED_USE_CASES))
+
+def keyword_margin(matches: List[Tuple[str, float]]) -> float:
+    """How far the top keyword match is ahead of the runner-up"""
+    if not matches:
+        return 0.0
+    runner_up = matches[1][1] if len(matches) > 1 else 0.0
+    return matches[0][1] - runner_up
+
+def cascade_tier(description: str, margin: Optional[float] = None) -> Tuple[str, List[Tuple[str, float]]]:
+    """('keyword', keyword matches) when the keyword matcher is confident, else ('semantic', keyword matches)"""
+    margin = CASCADE_MARGIN if margin is None else margin
+    matches = keyword_matches(description)
+    if matches and matches[0][1] > 0 and keyword_margin(matches) >= margin:
+        return KEYWORD_TIER, matches
+    return SEMANTIC_TIER, matches
+
+def get_best_models_cascade(usecase_config: Dict, use_case_embeddings: Dict = None, top_k: int = None,
+                            margin: Optional[float] = None) -> Tuple[List[Dict], Dict, str]:
+    """(models, match_info, tier) for a use case configuration
+
+    use_case_embeddings are only generated (lazily) when the semantic tier answers.
+    """
+    global _use_case_embeddings
+    usecase_type = usecase_config.get('type', 'predefined')
+    if usecase_type != 'custom':
+        tier = PREDEFINED_TIER
+        models, match_info = semantic.get_best_models_for_usecase(usecase_config, use_case_embeddings or {}, top_k)
+    else:
+        tier, matches = cascade_tier(usecase_config.get('description', ''), margin)
+        if tier == KEYWORD_TIER:
+            best_match_name, best_score = matches[0]
+            print(f"\nKeyword tier: {best_match_name} ({best_score:.3f}, "
+                  f"margin {keyword_margin(matches):.3f} over {matches[1][0]})")
+            models, match_info = semantic.get_best_models_for_usecase(
+                {'type': 'predefined', 'name': best_match_name}, use_case_embeddings or {}, top_k)
+        else:
+            if use_case_embeddings is None:
+                if _use_case_embeddings is None:
+                    _use_case_embeddings = semantic.generate_use_case_embeddings()
+                use_case_embeddings = _use_case_embeddings
+            models, match_info = semantic.get_best_models_for_usecase(usecase_config, use_case_embeddings, top_k)
+    _tier_counts[tier] += 1
+    return models, match_info, tier
+
+def cascade_stats() -> Dict[str, int]:
+    """Requests answered per tier in this process"""
+    return dict(_tier_counts)
+
+def load_traffic(filename: str) -> List[str]:
+    """Custom use case descriptions from a JSONL file of use case configs (batch format) or a text file"""
+    descriptions = []
+    with open(filename, 'r', encoding='utf-8') as f:
+        lines = [line.strip() for line in f if line.strip()]
+    for line in lines:
+        if not line.startswith('{'):
+            descriptions.append(line)
+            continue
+        for usecase_config in semantic.usecase_configs_from_data(json.loads(line)):
+            if usecase_config.get('type') == 'custom' and usecase_config.get('description'):
+                descriptions.append(usecase_config['description'])
+    return descriptions
+
+def sample_traffic() -> List[str]:
+    """Request texts shipped with the repo: test_extract_usecase inputs and configs/examples"""
+    from extract_usecase_from_text import extract_use_case_description
+    from test_extract_usecase import TEST_CASES
+    descriptions = [extract_use_case_description(test_case['input']) for test_case in TEST_CASES]
+    examples_dir = os.path.join('configs', 'examples')
+    if os.path.isdir(examples_dir):
+        for name in sorted(os.listdir(examples_dir)):
+            if name.endswith('.json'):
+                with open(os.path.join(examples_dir, name), 'r', encoding='utf-8') as f:
+                    for usecase_config in semantic.usecase_configs_from_data(json.load(f)):
+                        if usecase_config.get('type') == 'custom' and usecase_config.get('description'):
+                            descriptions.append(usecase_config['description'])
+    return descriptions
+
+def benchmark_cascade(descriptions: List[str], margins: List[float], compare: bool = False) -> List[Dict]:
+    """Keyword-tier share (requests that never need the embedding model) per margin
+
+    With compare, also the share of keyword answers whose use case equals the
+    semantic top match among the predefined use cases (loads the model).
+    """
+    start = time.perf_counter()
+    keyword = [keyword_matches(description) for description in descriptions]
+    keyword_ms = 1000 * (time.perf_counter() - start) / max(1, len(descriptions))
+
+    semantic_top = None
+    if compare:
+        with contextlib.redirect_stdout(io.StringIO()):
+            embeddings = semantic.generate_use_case_embeddings()
+            semantic_top = []
+            for description in descriptions:
+                similarities = semantic.calculate_semantic_similarity(description, embeddings)
+                semantic_top.append(next(name for name, _ in similarities if name in keyword_matcher.PREDEFINED_USE_CASES))
+
+    rows = []
+    for margin in margins:
+        answered = [i for i, matches in enumerate(keyword)
+                    if matches[0][1] > 0 and keyword_margin(matches) >= margin]
+        row = {'margin': margin, 'keyword': len(answered), 'total': len(descriptions),
+               'keyword_share': len(answered) / max(1, len(descriptions)), 'keyword_ms': keyword_ms}
+        if semantic_top is not None:
+            agree = sum(keyword[i][0][0] == semantic_top[i] for i in answered)
+            row['agreement'] = agree / len(answered) if answered else None
+        rows.append(row)
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the keyword-first cascade matcher',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 cascade_matcher.py --benchmark
+  python3 cascade_matcher.py --benchmark --traffic requests.jsonl --margins 0.05 0.1 0.15 0.3
+  python3 cascade_matcher.py --benchmark --traffic descriptions.txt --compare
+  python3 get_best_models_semantic.py --cascade --json '{"use_case": {"type": "custom", "description": "translate documents"}}'
+        """
+    )
+    parser.add_argument('--benchmark', action='store_true', help='Report the keyword-tier share of the traffic per margin')
+    parser.add_argument('--traffic', type=str,
+                        help='JSONL use case configs (batch format) or one description per line (default: repo samples)')
+    parser.add_argument('--margins', type=float, nargs='+', help=f'Margins to evaluate (default: {CASCADE_MARGIN} and neighbours)')
+    parser.add_argument('--compare', action='store_true', help='Check keyword answers against the semantic top match (loads the model)')
+
+    args = parser.parse_args()
+
+    if not args.benchmark:
+        parser.print_help()
+        sys.exit(1)
+
+    descriptions = load_traffic(args.traffic) if args.traffic else sample_traffic()
+    if not descriptions:
+        print("Error: no custom use case descriptions in the traffic")
+        sys.exit(1)
+    margins = args.margins or sorted({0.05, 0.1, CASCADE_MARGIN, 0.3, 0.5})
+
+    print("=" * 60)
+    print(f"Cascade matcher on {len(descriptions)} request(s) ({args.traffic or 'repo samples'})")
+    print("=" * 60)
+    rows = benchmark_cascade(descriptions, margins, args.compare)
+    print(f"\n  {'margin':>7s} {'keyword tier':>14s} {'share':>7s} {'agree':>7s}")
+    for row in rows:
+        agreement = row.get('agreement')
+        agreement = f"{agreement:7.1%}" if agreement is not None else f"{'-':>7s}"
+        marker = '  (default)' if row['margin'] == CASCADE_MARGIN else ''
+        print(f"  {row['margin']:7.2f} {row['keyword']:>6d} / {row['total']:<5d} {row['keyword_share']:7.1%} {agreement}{marker}")
+    print(f"\n  Keyword tier: {rows[0]['keyword_ms']:.3f} ms/request; semantic-tier requests load the embedding model")
+    print(f"  torch imported by this benchmark: {'yes' if 'torch' in sys.modules else 'no'}")
+
+if __name__ == "__main__":
+    main()
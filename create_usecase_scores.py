@@ -12,11 +12,34 @@ Usage:
 
     # Generate from JSON string
     python3 create_usecase_scores.py --json '{"use_case": {"type": "predefined", "name": "code_completion"}}'
+
+    # Rewrite every output even if its inputs did not change
+    python3 create_usecase_scores.py --force
+
+    # Print the top 10 models per use case without writing CSVs
+    python3 create_usecase_scores.py --top-k 10
+
+    # Score thousands of weight configs (JSONL, one use case per line) in one pass
+    python3 create_usecase_scores.py --batch team_weights.jsonl --top-k 20
 """
 import csv
 import json
+import os
 import sys
 import argparse
+from benchmark_snapshot import load_score_matrix
+from score_matrix import (
+    BENCHMARK_COLUMN_MAP,
+    format_score,
+    parse_percentage,
+    rank_order,
+    top_k_order
+)
+
+MASTER_CSV = 'opensource_all_benchmarks.csv'
+MANIFEST_FILE = 'opensource_usecase_manifest.json'
+BATCH_OUTPUT_FILE = 'usecase_batch_rankings.ndjson'
+BATCH_CHUNK_SIZE = 512
 
 # Benchmark weights for each use case
 # Based on: https://artificialanalysis.ai/methodology/intelligence-benchmarking
@@ -118,44 +141,14 @@ USE_CASE_WEIGHTS = {
     }
 }
 
-def parse_percentage(value):
-    """Parse percentage string to float (0-1)"""
-    if value == 'N/A' or not value:
-        return None
-    try:
-        # Remove % and convert
-        clean = str(value).replace('%', '').strip()
-        num = float(clean)
-        # If > 1, assume it's already a percentage, convert to decimal
-        if num > 1:
-            return num / 100.0
-        return num
-    except (ValueError, TypeError):
-        return None
-
 def calculate_usecase_score(model_row, weights):
-    """Calculate weighted score for a use case"""
+    """Calculate weighted score for a use case (single row; see ScoreMatrix for bulk scoring)"""
     total_score = 0.0
     total_weight = 0.0
     
     for benchmark, weight in weights.items():
         # Map benchmark names to CSV column names
-        column_map = {
-            'mmlu_pro': 'mmlu_pro',
-            'hle': 'hle',
-            'ifbench': 'ifbench',
-            'lcr': 'lcr',
-            'gpqa': 'gpqa',
-            'livecodebench': 'livecodebench',
-            'scicode': 'scicode',
-            'terminalbench_hard': 'terminalbench_hard',
-            'tau2': 'tau2',
-            'artificial_analysis_intelligence_index': 'artificial_analysis_intelligence_index',
-            'artificial_analysis_coding_index': 'artificial_analysis_coding_index',
-            'artificial_analysis_math_index': 'artificial_analysis_math_index',
-        }
-        
-        column_name = column_map.get(benchmark)
+        column_name = BENCHMARK_COLUMN_MAP.get(benchmark)
         if not column_name:
             continue
             
@@ -171,43 +164,33 @@ def calculate_usecase_score(model_row, weights):
         return total_score / total_weight
     return None
 
-def create_usecase_csv(usecase_name, weights_config):
-    """Create a CSV file for a specific use case"""
+def create_usecase_csv(usecase_name, weights_config, matrix=None, scores=None):
+    """Create a CSV file for a specific use case
+
+    Pass a preloaded ScoreMatrix (and optionally its precomputed score column)
+    to avoid re-reading the master CSV for every use case.
+    """
     print(f"\nCreating CSV for: {usecase_name}")
     print(f"Description: {weights_config['description']}")
     
     # Read master CSV
-    with open('opensource_all_benchmarks.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        models = list(reader)
+    if matrix is None:
+        matrix = load_score_matrix(MASTER_CSV)
     
-    # Calculate scores for each model
-    scored_models = []
-    for model in models:
-        score = calculate_usecase_score(model, weights_config['weights'])
-        if score is not None:
-            scored_models.append({
-                'Model Name': model['Model Name'],
-                'Provider': model['Provider'],
-                'Dataset': model['Dataset'],
-                'Use Case Score': f"{score * 100:.2f}%",
-                'raw_score': score  # For sorting
-            })
-        else:
-            scored_models.append({
-                'Model Name': model['Model Name'],
-                'Provider': model['Provider'],
-                'Dataset': model['Dataset'],
-                'Use Case Score': 'N/A',
-                'raw_score': 0.0
-            })
-    
-    # Sort by score (descending)
-    scored_models.sort(key=lambda x: x['raw_score'], reverse=True)
+    # Calculate scores for all models at once
+    if scores is None:
+        scores = matrix.score_weights(weights_config['weights'])
     
-    # Remove raw_score from output
-    for model in scored_models:
-        del model['raw_score']
+    # Sort by score (descending, missing scores count as 0)
+    scored_models = []
+    for i in rank_order(scores):
+        model = matrix.models[i]
+        scored_models.append({
+            'Model Name': model['Model Name'],
+            'Provider': model['Provider'],
+            'Dataset': model['Dataset'],
+            'Use Case Score': format_score(scores[i])
+        })
     
     # Write CSV
     filename = f"opensource_{usecase_name}.csv"
@@ -226,6 +209,158 @@ def create_usecase_csv(usecase_name, weights_config):
         if model['Use Case Score'] != 'N/A':
             print(f"    {i}. {model['Model Name']} ({model['Provider']}): {model['Use Case Score']}")
 
+def print_top_k(usecase_name, weights_config, matrix, k):
+    """Print the top-k models for a use case using the threshold-algorithm index"""
+    indices, scores, models_scored = matrix.top_k(weights_config['weights'], k)
+    print(f"\nTop {k} models for: {usecase_name}")
+    print(f"Description: {weights_config['description']}")
+    print(f"  (scored {models_scored} of {len(matrix)} models)")
+    for rank, (i, score) in enumerate(zip(indices, scores), 1):
+        model = matrix.models[i]
+        print(f"    {rank}. {model['Model Name']} ({model['Provider']}): {format_score(score)}")
+
+def load_manifest(manifest_file=MANIFEST_FILE):
+    """Load the manifest of inputs each use-case CSV was last generated from"""
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return manifest.get('use_cases', {})
+
+def save_manifest(entries, manifest_file=MANIFEST_FILE):
+    """Save the manifest of use-case inputs"""
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump({'master': MASTER_CSV, 'use_cases': entries}, f, indent=2, sort_keys=True)
+
+def usecase_fingerprint(matrix, weights, column_hashes, models_hash):
+    """Weight vector and content hashes of the benchmark columns a use case reads"""
+    vector = matrix.weight_vector(weights)
+    used = {matrix.benchmarks[j]: float(vector[j]) for j in range(len(vector)) if vector[j] != 0}
+    return {
+        'weights': used,
+        'columns': {benchmark: column_hashes[benchmark] for benchmark in used},
+        'models': models_hash
+    }
+
+def generate_usecase_csvs(use_cases, matrix=None, force=False, manifest_file=MANIFEST_FILE):
+    """Regenerate only the use-case CSVs whose weights or benchmark columns changed
+
+    use_cases is a list of (usecase_name, weights_config) pairs. The master data
+    is read once and all dirty use cases are scored in one vectorized pass.
+    Returns (rebuilt, unchanged) lists of use-case names.
+    """
+    if matrix is None:
+        matrix = load_score_matrix(MASTER_CSV)
+    
+    manifest = load_manifest(manifest_file)
+    column_hashes = matrix.column_hashes()
+    models_hash = matrix.models_hash()
+    
+    dirty = []
+    unchanged = []
+    fingerprints = {}
+    for usecase_name, weights_config in use_cases:
+        fingerprint = usecase_fingerprint(matrix, weights_config['weights'], column_hashes, models_hash)
+        fingerprints[usecase_name] = fingerprint
+        up_to_date = (
+            not force
+            and manifest.get(usecase_name) == fingerprint
+            and os.path.exists(f"opensource_{usecase_name}.csv")
+        )
+        if up_to_date:
+            unchanged.append(usecase_name)
+        else:
+            dirty.append((usecase_name, weights_config))
+    
+    for usecase_name in unchanged:
+        print(f"\n✓ Up to date: opensource_{usecase_name}.csv")
+    
+    if dirty:
+        all_scores = matrix.score_configs([wc['weights'] for _, wc in dirty])
+        for k, (usecase_name, weights_config) in enumerate(dirty):
+            create_usecase_csv(usecase_name, weights_config, matrix, all_scores[:, k])
+            manifest[usecase_name] = fingerprints[usecase_name]
+        save_manifest(manifest, manifest_file)
+    
+    return [name for name, _ in dirty], unchanged
+
+def iter_batch_configs(batch_file):
+    """Yield (usecase_name, weights_config) pairs from a JSONL file, one use case per line
+
+    Each line is either a bare use case object ({"type": "custom", "weights": {...}})
+    or wrapped as {"use_case": {...}}. Blank lines are skipped.
+    """
+    with open(batch_file, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            config_data = json.loads(line)
+            if 'use_case' not in config_data:
+                config_data = {'use_case': config_data}
+            try:
+                yield load_usecase_from_json(config_data)
+            except ValueError as e:
+                raise ValueError(f"{batch_file}:{line_number}: {e}") from e
+
+def score_usecase_batch(use_cases, matrix=None, top_k=None, chunk_size=BATCH_CHUNK_SIZE):
+    """Score many weight configs against the master data and yield their rankings
+
+    use_cases is any iterable of (usecase_name, weights_config) pairs. Configs are
+    compiled chunk by chunk into a K x B weight matrix and scored in one vectorized
+    pass per chunk, so memory stays bounded however many configs stream in.
+    Yields (usecase_name, weights_config, model_indices, scores) in input order;
+    model_indices is the full ranking, or only the top_k scored models.
+    """
+    if matrix is None:
+        matrix = load_score_matrix(MASTER_CSV)
+    
+    chunk = []
+    
+    def flush():
+        all_scores = matrix.score_configs([wc['weights'] for _, wc in chunk])
+        for k, (usecase_name, weights_config) in enumerate(chunk):
+            scores = all_scores[:, k]
+            order = top_k_order(scores, top_k) if top_k is not None else rank_order(scores)
+            yield usecase_name, weights_config, order, scores[order]
+        chunk.clear()
+    
+    for use_case in use_cases:
+        chunk.append(use_case)
+        if len(chunk) >= chunk_size:
+            yield from flush()
+    if chunk:
+        yield from flush()
+
+def write_batch_rankings(use_cases, output_file=BATCH_OUTPUT_FILE, matrix=None, top_k=None):
+    """Stream per-config rankings to an NDJSON file (one JSON object per config)"""
+    if matrix is None:
+        matrix = load_score_matrix(MASTER_CSV)
+    
+    count = 0
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for usecase_name, weights_config, order, scores in score_usecase_batch(use_cases, matrix, top_k):
+            rankings = []
+            for rank, (i, score) in enumerate(zip(order, scores), 1):
+                model = matrix.models[i]
+                rankings.append({
+                    'rank': rank,
+                    'Model Name': model['Model Name'],
+                    'Provider': model['Provider'],
+                    'Dataset': model['Dataset'],
+                    'Use Case Score': format_score(score)
+                })
+            record = {
+                'name': usecase_name,
+                'description': weights_config.get('description', ''),
+                'weights': weights_config['weights'],
+                'rankings': rankings
+            }
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            count += 1
+    return count
+
 def normalize_weights(weights):
     """Normalize weights to sum to 1.0"""
     total = sum(weights.values())
@@ -328,6 +463,19 @@ Examples:
   # Generate from JSON string
   python3 create_usecase_scores.py --json '{"use_case": {"type": "predefined", "name": "code_completion"}}'
 
+  # Rewrite every output even if its inputs did not change
+  python3 create_usecase_scores.py --force
+
+  # Print the top 10 models per use case without writing CSVs
+  python3 create_usecase_scores.py --top-k 10
+  python3 create_usecase_scores.py --json '{"use_case": {"type": "custom", "weights": {"lcr": 0.6, "hle": 0.4}}}' --top-k 5
+
+  # Score thousands of weight configs (JSONL, one use case per line) in one pass
+  python3 create_usecase_scores.py --batch team_weights.jsonl --top-k 20 --batch-output rankings.ndjson
+
+Only use cases whose weights or referenced benchmark columns changed since
+the last run (recorded in opensource_usecase_manifest.json) are rewritten.
+
 JSON Format:
   Predefined use case:
     {
@@ -364,6 +512,11 @@ JSON Format:
     )
     parser.add_argument('--config', '-c', type=str, help='Path to JSON configuration file')
     parser.add_argument('--json', '-j', type=str, help='JSON configuration as string')
+    parser.add_argument('--force', action='store_true', help='Rewrite every output, even if its inputs are unchanged')
+    parser.add_argument('--top-k', type=int, help='Only print the top K models per use case (no CSV files written)')
+    parser.add_argument('--batch', '-b', type=str, help='JSONL file of use cases to score in one vectorized pass')
+    parser.add_argument('--batch-output', type=str, default=BATCH_OUTPUT_FILE,
+                        help=f'NDJSON output for --batch (default: {BATCH_OUTPUT_FILE})')
     
     args = parser.parse_args()
     
@@ -377,6 +530,22 @@ JSON Format:
     print("- Missing scores handled gracefully (excluded from calculation)")
     print()
     
+    if args.batch:
+        count = write_batch_rankings(iter_batch_configs(args.batch), args.batch_output, top_k=args.top_k)
+        print(f"✓ Scored {count} use case(s) from {args.batch}")
+        print(f"✓ Rankings written to {args.batch_output}")
+        return
+    
+    if args.top_k is not None:
+        if args.config or args.json:
+            use_cases = process_json_config(config_file=args.config, json_string=args.json)
+        else:
+            use_cases = list(USE_CASE_WEIGHTS.items())
+        matrix = load_score_matrix(MASTER_CSV)
+        for usecase_name, weights_config in use_cases:
+            print_top_k(usecase_name, weights_config, matrix, args.top_k)
+        return
+    
     # Determine which use cases to process
     if args.config or args.json:
         # Process from JSON config
@@ -385,27 +554,25 @@ JSON Format:
             print("Error: Failed to load use cases from JSON config")
             sys.exit(1)
         
-        for usecase_name, weights_config in use_cases:
-            create_usecase_csv(usecase_name, weights_config)
+        rebuilt, unchanged = generate_usecase_csvs(use_cases, force=args.force)
         
         print("\n" + "=" * 60)
         print("Summary")
         print("=" * 60)
-        print(f"✓ Created {len(use_cases)} use-case specific CSV file(s)")
+        print(f"✓ Created {len(rebuilt)} use-case specific CSV file(s), {len(unchanged)} already up to date")
         print("\nFiles created:")
-        for usecase_name, _ in use_cases:
+        for usecase_name in rebuilt:
             print(f"  - opensource_{usecase_name}.csv")
     else:
-        # Default: process all predefined use cases
-        for usecase_name, weights_config in USE_CASE_WEIGHTS.items():
-            create_usecase_csv(usecase_name, weights_config)
+        # Default: process all predefined use cases (one load, only changed outputs rewritten)
+        rebuilt, unchanged = generate_usecase_csvs(list(USE_CASE_WEIGHTS.items()), force=args.force)
         
         print("\n" + "=" * 60)
         print("Summary")
         print("=" * 60)
-        print(f"✓ Created {len(USE_CASE_WEIGHTS)} use-case specific CSV files")
+        print(f"✓ Created {len(rebuilt)} use-case specific CSV files, {len(unchanged)} already up to date")
         print("\nFiles created:")
-        for usecase_name in USE_CASE_WEIGHTS.keys():
+        for usecase_name in rebuilt:
             print(f"  - opensource_{usecase_name}.csv")
         
         print("\n" + "=" * 60)
@@ -2,12 +2,28 @@
 """
 Enhanced data fetcher for artificialanalysis.ai intelligence evaluations
 """
-import requests
 import json
 from typing import Dict, List, Any, Optional
 
+import fetch_engine
+from endpoint_discovery import EndpointResolver
+
 API_KEY = "aa_OXmwOTJvjVHpPnJQsOgimbFMwsPoVgOT"
 
+# Candidate URL patterns, in order of preference (probed concurrently, the working one remembered)
+MODEL_SCORES_ENDPOINTS = [
+    "https://api.artificialanalysis.ai/v1/models/{model_id}/scores",
+    "https://api.artificialanalysis.ai/v1/models/{model_id}/evaluations",
+    "https://api.artificialanalysis.ai/models/{model_id}",
+]
+ALL_MODELS_DATA_ENDPOINTS = [
+    "https://api.artificialanalysis.ai/v1/models?include_scores=true",
+    "https://api.artificialanalysis.ai/v1/benchmarks/results",
+    "https://api.artificialanalysis.ai/v1/evaluations/all",
+]
+
+_resolver = None
+
 # Known benchmarks from the website
 BENCHMARKS = [
     {"id": "mmlu", "name": "MMLU", "full_name": "Massive Multitask Language Understanding"},
@@ -22,56 +38,30 @@ BENCHMARKS = [
     {"id": "winogrande", "name": "Winogrande", "full_name": "Winogrande Benchmark"},
 ]
 
-def fetch_model_scores(model_id: str) -> Optional[Dict]:
-    """Fetch scores for a specific model"""
-    headers = {
+def _endpoint_resolver() -> EndpointResolver:
+    global _resolver
+    if _resolver is None:
+        _resolver = EndpointResolver()
+    return _resolver
+
+def _get_headers() -> Dict[str, str]:
+    return {
         "Authorization": f"Bearer {API_KEY}",
         "X-API-Key": API_KEY,
         "Content-Type": "application/json"
     }
-    
-    # Try different endpoint patterns
-    endpoints = [
-        f"https://api.artificialanalysis.ai/v1/models/{model_id}/scores",
-        f"https://api.artificialanalysis.ai/v1/models/{model_id}/evaluations",
-        f"https://api.artificialanalysis.ai/models/{model_id}",
-    ]
-    
-    for endpoint in endpoints:
-        try:
-            response = requests.get(endpoint, headers=headers, timeout=10)
-            if response.status_code == 200:
-                return response.json()
-        except:
-            continue
-    
-    return None
+
+def fetch_model_scores(model_id: str) -> Optional[Dict]:
+    """Fetch scores for a specific model"""
+    return fetch_engine.run(_endpoint_resolver().fetch('data_fetcher.fetch_model_scores', MODEL_SCORES_ENDPOINTS,
+                                                       headers=_get_headers(), model_id=model_id))
 
 def fetch_all_models_data() -> Dict:
     """Fetch data for all models"""
-    headers = {
-        "Authorization": f"Bearer {API_KEY}",
-        "X-API-Key": API_KEY,
-        "Content-Type": "application/json"
-    }
-    
     # Try to get all models with their scores
-    endpoints = [
-        "https://api.artificialanalysis.ai/v1/models?include_scores=true",
-        "https://api.artificialanalysis.ai/v1/benchmarks/results",
-        "https://api.artificialanalysis.ai/v1/evaluations/all",
-    ]
-    
-    for endpoint in endpoints:
-        try:
-            response = requests.get(endpoint, headers=headers, timeout=10)
-            if response.status_code == 200:
-                return response.json()
-        except Exception as e:
-            print(f"Error with {endpoint}: {e}")
-            continue
-    
-    return {}
+    data = fetch_engine.run(_endpoint_resolver().fetch('data_fetcher.fetch_all_models_data', ALL_MODELS_DATA_ENDPOINTS,
+                                                       headers=_get_headers(), verbose=True))
+    return data if data is not None else {}
 
 def get_sample_data() -> Dict:
     """Return expanded sample data structure with all open source models and datasets"""
@@ -376,4 +366,7 @@ def main():
     return data
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        fetch_engine.close_default_engine()
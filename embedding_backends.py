@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Selectable embedding backends for the semantic matchers
+    torch      SentenceTransformer on PyTorch (default)
+    onnx       ONNX Runtime, fp32 export of the same transformer
+    onnx-int8  ONNX Runtime, dynamically quantized int8 weights
+
+The ONNX backends only need onnxruntime and tokenizers at run time (no torch),
+which cuts encode latency and resident memory on CPU-only hosts. Artifacts are
+exported once with sentence-transformers/torch and cached locally under
+<EMBEDDING_CACHE_DIR>/onnx/<model>@<revision>/.
+
+Select the backend with EMBEDDING_BACKEND=torch|onnx|onnx-int8.
+
+Usage:
+    # Export (and quantize) the ONNX artifacts ahead of time
+    python3 embedding_backends.py --export
+
+    # Compare backends on a few descriptions
+    python3 embedding_backends.py --compare "I need code autocomplete" "math solver"
+"""
+import json
+import os
+import re
+import sys
+import time
+import argparse
+import numpy as np
+from typing import List, Optional
+
+from embedding_cache import DEFAULT_CACHE_DIR, resolve_model_revision
+
+EMBEDDING_BACKENDS = ('torch', 'onnx', 'onnx-int8')
+DEFAULT_EMBEDDING_BACKEND = 'torch'
+ONNX_OPSET = 14
+ONNX_FP32_FILE = 'model.onnx'
+ONNX_INT8_FILE = 'model.int8.onnx'
+ENCODER_CONFIG_FILE = 'encoder_config.json'
+
+def get_embedding_backend() -> str:
+    """Backend selected by EMBEDDING_BACKEND (default: torch)"""
+    backend = os.environ.get('EMBEDDING_BACKEND', DEFAULT_EMBEDDING_BACKEND).strip().lower()
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {backend}. Available: {list(EMBEDDING_BACKENDS)}")
+    return backend
+
+def onnx_artifact_dir(model_name: str, revision: Optional[str] = None, cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    slug = re.sub(r'[^A-Za-z0-9._-]+', '_', f"{model_name}@{resolve_model_revision(model_name, revision)}")
+    return os.path.join(cache_dir, 'onnx', slug)
+
+def _load_sentence_transformer(model_name: str, revision: Optional[str] = None):
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        print("Error: Required packages not installed.")
+        print("Please install: pip install sentence-transformers")
+        sys.exit(1)
+    if revision:
+        return SentenceTransformer(model_name, revision=revision)
+    return SentenceTransformer(model_name)
+
+def export_onnx_model(model_name: str, revision: Optional[str] = None, cache_dir: str = DEFAULT_CACHE_DIR,
+                      quantize: bool = True) -> str:
+    """Export the transformer of a SentenceTransformer to ONNX (plus an int8 copy)
+
+    Writes model.onnx, model.int8.onnx, tokenizer.json and encoder_config.json
+    (pooling mode, normalization, max sequence length) and returns the directory.
+    """
+    import torch
+    output_dir = onnx_artifact_dir(model_name, revision, cache_dir)
+    os.makedirs(output_dir, exist_ok=True)
+
+    st_model = _load_sentence_transformer(model_name, revision)
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+    tokenizer.save_pretrained(output_dir)
+    pooling = st_model[1].get_pooling_mode_str() if len(st_model) > 1 else 'mean'
+    normalize = any(type(module).__name__ == 'Normalize' for module in st_model)
+
+    class LastHiddenState(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.model(input_ids=input_ids, attention_mask=attention_mask,
+                              token_type_ids=token_type_ids)[0]
+
+    sample = tokenizer(["export sample"], return_tensors='pt')
+    if 'token_type_ids' not in sample:
+        sample['token_type_ids'] = torch.zeros_like(sample['input_ids'])
+    fp32_path = os.path.join(output_dir, ONNX_FP32_FILE)
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in ('input_ids', 'attention_mask', 'token_type_ids')}
+    dynamic_axes['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+    with torch.no_grad():
+        torch.onnx.export(
+            LastHiddenState(transformer),
+            (sample['input_ids'], sample['attention_mask'], sample['token_type_ids']),
+            fp32_path,
+            input_names=['input_ids', 'attention_mask', 'token_type_ids'],
+            output_names=['last_hidden_state'],
+            dynamic_axes=dynamic_axes,
+            opset_version=ONNX_OPSET,
+        )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(fp32_path, os.path.join(output_dir, ONNX_INT8_FILE), weight_type=QuantType.QInt8)
+
+    with open(os.path.join(output_dir, ENCODER_CONFIG_FILE), 'w', encoding='utf-8') as f:
+        json.dump({'model': model_name, 'pooling': pooling, 'normalize': normalize,
+                   'max_seq_length': int(st_model.max_seq_length)}, f, indent=2)
+    return output_dir
+
+class OnnxEncoder:
+    """SentenceTransformer-compatible encode() on ONNX Runtime + tokenizers (no torch)"""
+
+    def __init__(self, artifact_dir: str, quantized: bool = False, threads: Optional[int] = None):
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(artifact_dir, ENCODER_CONFIG_FILE), 'r', encoding='utf-8') as f:
+            self.config = json.load(f)
+        self.tokenizer = Tokenizer.from_file(os.path.join(artifact_dir, 'tokenizer.json'))
+        self.tokenizer.enable_truncation(max_length=self.config['max_seq_length'])
+        self.tokenizer.enable_padding()
+
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        model_file = ONNX_INT8_FILE if quantized else ONNX_FP32_FILE
+        self.session = onnxruntime.InferenceSession(os.path.join(artifact_dir, model_file), options,
+                                                    providers=['CPUExecutionProvider'])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def encode(self, sentences, batch_size: int = 32, show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        sentences = [sentences] if single else list(sentences)
+        batches = []
+        for start in range(0, len(sentences), batch_size):
+            encodings = self.tokenizer.encode_batch(sentences[start:start + batch_size])
+            feeds = {
+                'input_ids': np.array([e.ids for e in encodings], dtype=np.int64),
+                'attention_mask': np.array([e.attention_mask for e in encodings], dtype=np.int64),
+                'token_type_ids': np.array([e.type_ids for e in encodings], dtype=np.int64),
+            }
+            hidden = self.session.run(None, {k: v for k, v in feeds.items() if k in self.input_names})[0]
+            batches.append(self._pool(hidden, feeds['attention_mask']))
+        embeddings = np.vstack(batches) if batches else np.zeros((0, 0), dtype=np.float32)
+        return embeddings[0] if single else embeddings
+
+    def _pool(self, hidden: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        if self.config['pooling'] == 'cls':
+            pooled = hidden[:, 0]
+        else:
+            mask = attention_mask[..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        if self.config['normalize']:
+            pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.astype(np.float32)
+
+def load_embedding_model(model_name: str, revision: Optional[str] = None, backend: Optional[str] = None,
+                         cache_dir: str = DEFAULT_CACHE_DIR, threads: Optional[int] = None):
+    """Embedding model with a SentenceTransformer-style encode() for the selected backend
+
+    ONNX artifacts are exported on first use when they are not cached yet.
+    threads sets the intra-op thread count (default: the runtime's own choice).
+    """
+    backend = backend or get_embedding_backend()
+    if backend == 'torch':
+        model = _load_sentence_transformer(model_name, revision)
+        if threads:
+            import torch
+            torch.set_num_threads(threads)
+        return model
+
+    try:
+        import onnxruntime  # noqa: F401
+        import tokenizers  # noqa: F401
+    except ImportError:
+        print("Error: Required packages not installed.")
+        print("Please install: pip install onnxruntime tokenizers")
+        sys.exit(1)
+    artifact_dir = onnx_artifact_dir(model_name, revision, cache_dir)
+    model_file = ONNX_INT8_FILE if backend == 'onnx-int8' else ONNX_FP32_FILE
+    if not os.path.exists(os.path.join(artifact_dir, model_file)) or \
+            not os.path.exists(os.path.join(artifact_dir, ENCODER_CONFIG_FILE)):
+        print(f"  Exporting {model_name} to ONNX (one-time)...")
+        export_onnx_model(model_name, revision, cache_dir)
+    return OnnxEncoder(artifact_dir, quantized=backend == 'onnx-int8', threads=threads)
+
+def compare_backends(texts: List[str], model_name: str, revision: Optional[str] = None):
+    """Print encode latency and cosine agreement of every backend against torch"""
+    reference = None
+    for backend in EMBEDDING_BACKENDS:
+        model = load_embedding_model(model_name, revision, backend)
+        model.encode(texts)  # warm-up
+        start = time.perf_counter()
+        embeddings = np.asarray(model.encode(texts), dtype=np.float32)
+        elapsed = (time.perf_counter() - start) * 1000
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        if reference is None:
+            reference = embeddings
+        agreement = float((embeddings * reference).sum(axis=1).min())
+        print(f"  {backend:10s} {elapsed:8.1f} ms   min cosine vs torch: {agreement:.4f}")
+
+def main():
+    from get_best_models_semantic import EMBEDDING_MODEL_NAME, EMBEDDING_MODEL_REVISION
+
+    parser = argparse.ArgumentParser(
+        description='Export or compare embedding backends (torch, ONNX fp32, ONNX int8)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 embedding_backends.py --export
+  python3 embedding_backends.py --compare "I need code autocomplete" "math solver"
+  EMBEDDING_BACKEND=onnx-int8 python3 extract_and_match_usecase.py --text "I need a chatbot"
+        """
+    )
+    parser.add_argument('--export', action='store_true', help='Export and quantize the ONNX artifacts')
+    parser.add_argument('--compare', nargs='+', metavar='TEXT', help='Compare backends on these texts')
+
+    args = parser.parse_args()
+
+    if args.export:
+        output_dir = export_onnx_model(EMBEDDING_MODEL_NAME, EMBEDDING_MODEL_REVISION)
+        print(f"✓ Exported ONNX artifacts to {output_dir}")
+    elif args.compare:
+        compare_backends(args.compare, EMBEDDING_MODEL_NAME, EMBEDDING_MODEL_REVISION)
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache for description embeddings
+Embeddings are keyed by embedding model name, model revision, embedding
+backend (see embedding_backends.py) and a content hash of each text, so only new or edited descriptions are re-encoded and a
+cold start with unchanged descriptions does not encode (or even load the
+model) at all.
+
+Each model/revision pair gets one .npz file in the cache directory (the
+torch backend has no suffix, e.g. <model>@<revision>+onnx-int8.npz for int8):
+    vectors  float32[n_rows, dim] embeddings
+    keys     sha256(text) of each row
+    meta     JSON {"model", "revision", "backend", "dim"}
+The file is replaced atomically, so vectors and keys always match. Before
+saving, rows another process added in the meantime are merged in.
+
+Usage:
+    # Show what is cached
+    python3 embedding_cache.py --info
+
+    # Drop every cached embedding
+    python3 embedding_cache.py --clear
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+import argparse
+import numpy as np
+from typing import Callable, List, Optional
+
+DEFAULT_CACHE_DIR = os.environ.get('EMBEDDING_CACHE_DIR', '.embedding_cache')
+UNKNOWN_REVISION = 'unknown'
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def resolve_model_revision(model_name: str, revision: Optional[str] = None) -> str:
+    """Model revision for cache keys
+
+    An explicit revision wins. Otherwise the commit hash that the local Hugging
+    Face cache resolved for the model is used, without loading the model.
+    """
+    if revision:
+        return revision
+    hub_cache = os.environ.get('HF_HUB_CACHE') or os.path.join(
+        os.environ.get('HF_HOME', os.path.join(os.path.expanduser('~'), '.cache', 'huggingface')), 'hub')
+    ref_file = os.path.join(hub_cache, f"models--{model_name.replace('/', '--')}", 'refs', 'main')
+    try:
+        with open(ref_file, 'r', encoding='utf-8') as f:
+            return f.read().strip() or UNKNOWN_REVISION
+    except OSError:
+        return UNKNOWN_REVISION
+
+def read_cache_file(path: str):
+    """(meta, keys, vectors) of a cache file"""
+    with np.load(path, allow_pickle=False) as data:
+        return json.loads(str(data['meta'])), [str(key) for key in data['keys']], data['vectors']
+
+class EmbeddingCache:
+    """Embeddings of one model revision, stored as one .npz of vectors and their text hashes"""
+
+    def __init__(self, model_name: str, revision: Optional[str] = None, cache_dir: str = DEFAULT_CACHE_DIR,
+                 backend: str = 'torch'):
+        self.model_name = model_name
+        self.revision = resolve_model_revision(model_name, revision)
+        self.backend = backend
+        self.cache_dir = cache_dir
+        suffix = '' if backend == 'torch' else f"+{backend}"
+        slug = re.sub(r'[^A-Za-z0-9._+-]+', '_', f"{model_name}@{self.revision}{suffix}")
+        self.cache_file = os.path.join(cache_dir, f"{slug}.npz")
+        self.rows = {}
+        self.vectors = None
+        self._load()
+
+    def _read(self):
+        """(keys, vectors) stored on disk for this model, or None"""
+        try:
+            meta, keys, vectors = read_cache_file(self.cache_file)
+        except (OSError, ValueError, KeyError):
+            return None
+        # A file of another model or a damaged one is treated as an empty cache
+        if meta.get('model') != self.model_name or len(keys) != len(vectors):
+            return None
+        return keys, vectors
+
+    def _load(self):
+        stored = self._read()
+        if stored is not None:
+            keys, self.vectors = stored
+            self.rows = {key: row for row, key in enumerate(keys)}
+
+    def _save(self):
+        stored = self._read()
+        if stored is not None:
+            # Keep what other processes added since we loaded
+            keys, vectors = stored
+            extra = [row for row, key in enumerate(keys) if key not in self.rows]
+            if extra and vectors.shape[1] == self.vectors.shape[1]:
+                start = len(self.vectors)
+                self.vectors = np.vstack([self.vectors, vectors[extra]])
+                for i, row in enumerate(extra):
+                    self.rows[keys[row]] = start + i
+        keys = [None] * len(self.vectors)
+        for key, row in self.rows.items():
+            keys[row] = key
+        meta = {'model': self.model_name, 'revision': self.revision, 'backend': self.backend,
+                'dim': int(self.vectors.shape[1])}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = f"{self.cache_file}.tmp{os.getpid()}.npz"
+        np.savez(tmp, vectors=self.vectors, keys=np.array(keys, dtype=str), meta=np.array(json.dumps(meta)))
+        os.replace(tmp, self.cache_file)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def missing(self, texts: List[str]) -> List[str]:
+        """Texts without a cached embedding (deduplicated, in order)"""
+        seen = set()
+        result = []
+        for text in texts:
+            key = text_hash(text)
+            if key not in self.rows and key not in seen:
+                seen.add(key)
+                result.append(text)
+        return result
+
+    def encode(self, texts: List[str], encode_fn: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """float32 embeddings for texts, calling encode_fn only for texts not cached yet"""
+        if not texts:
+            return np.zeros((0, 0 if self.vectors is None else self.vectors.shape[1]), dtype=np.float32)
+        new_texts = self.missing(texts)
+        if new_texts:
+            new_vectors = np.asarray(encode_fn(new_texts), dtype=np.float32)
+            start = 0 if self.vectors is None else len(self.vectors)
+            self.vectors = new_vectors if self.vectors is None else np.vstack([self.vectors, new_vectors])
+            for i, text in enumerate(new_texts):
+                self.rows[text_hash(text)] = start + i
+            self._save()
+        return self.vectors[[self.rows[text_hash(text)] for text in texts]]
+
+def cached_encode(texts: List[str], model_name: str, encode_fn: Callable[[List[str]], np.ndarray],
+                  revision: Optional[str] = None, cache_dir: str = DEFAULT_CACHE_DIR,
+                  backend: str = 'torch') -> np.ndarray:
+    """Encode texts through the on-disk cache (see EmbeddingCache.encode)"""
+    return EmbeddingCache(model_name, revision, cache_dir, backend).encode(texts, encode_fn)
+
+def print_cache_info(cache_dir: str = DEFAULT_CACHE_DIR):
+    """Print the cached model revisions and their sizes"""
+    cache_files = sorted(f for f in os.listdir(cache_dir)
+                         if f.endswith('.npz') and '.tmp' not in f) if os.path.isdir(cache_dir) else []
+    print(f"Embedding cache: {cache_dir}")
+    if not cache_files:
+        print("  (empty)")
+        return
+    for filename in cache_files:
+        meta, keys, _ = read_cache_file(os.path.join(cache_dir, filename))
+        print(f"  {meta['model']} @ {meta['revision']} [{meta.get('backend', 'torch')}]: {len(keys)} embeddings x {meta['dim']} dims")
+
+def clear_cache(cache_dir: str = DEFAULT_CACHE_DIR) -> int:
+    """Delete every cache file, returning how many were removed"""
+    if not os.path.isdir(cache_dir):
+        return 0
+    removed = 0
+    for filename in os.listdir(cache_dir):
+        if filename.endswith(('.npz', '.npy', '.json')) and os.path.isfile(os.path.join(cache_dir, filename)):
+            os.remove(os.path.join(cache_dir, filename))
+            removed += 1
+    return removed
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect or clear the on-disk description embedding cache')
+    parser.add_argument('--cache-dir', type=str, default=DEFAULT_CACHE_DIR, help=f'Cache directory (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--info', action='store_true', help='Show cached model revisions')
+    parser.add_argument('--clear', action='store_true', help='Delete all cached embeddings')
+
+    args = parser.parse_args()
+
+    if args.clear:
+        print(f"✓ Removed {clear_cache(args.cache_dir)} cache files from {args.cache_dir}")
+    elif args.info:
+        print_cache_info(args.cache_dir)
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+L2-normalized embedding matrix for semantic matching
+Holds every use-case/subject embedding as one float32 row, so cosine
+similarity of a query (or a batch of queries) against all entries is a single
+matrix product instead of a per-entry loop.
+"""
+import numpy as np
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Tuple
+
+def l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    """Row-normalize to unit length as float32 (zero rows stay zero)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+class EmbeddingIndex(Mapping):
+    """Read-only name -> embedding mapping backed by a normalized float32 matrix
+
+    Behaves like the {name: embedding} dicts the matchers used before, so code
+    that iterates over use-case embeddings keeps working.
+    """
+
+    def __init__(self, names: Iterable[str], embeddings: np.ndarray):
+        self.names = list(names)
+        self.embeddings = np.asarray(embeddings, dtype=np.float32)
+        self.matrix = l2_normalize(self.embeddings)
+        self.positions = {name: i for i, name in enumerate(self.names)}
+
+    @classmethod
+    def from_dict(cls, embeddings: Dict[str, np.ndarray]) -> 'EmbeddingIndex':
+        if isinstance(embeddings, cls):
+            return embeddings
+        names = list(embeddings.keys())
+        return cls(names, np.stack([np.asarray(embeddings[name]).reshape(-1) for name in names]))
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.embeddings[self.positions[name]]
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def similarities(self, query_embeddings: np.ndarray) -> np.ndarray:
+        """Cosine similarities, shape (n_queries, n_entries) for 2-D input or (n_entries,) for one query"""
+        return l2_normalize(query_embeddings) @ self.matrix.T
+
+    def top_indices(self, similarities: np.ndarray, k: int = None) -> np.ndarray:
+        """Entry indices of one similarity row by descending similarity (ties keep entry order)"""
+        n = len(similarities)
+        if k is None or k >= n:
+            return np.argsort(-similarities, kind='stable')
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64)
+        kth = np.partition(similarities, n - k)[n - k]
+        candidates = np.flatnonzero(similarities >= kth)
+        candidates = candidates[np.lexsort((candidates, -similarities[candidates]))]
+        return candidates[:k]
+
+    def rank(self, query_embedding: np.ndarray, k: int = None) -> List[Tuple[str, float]]:
+        """(name, similarity) for one query, best first"""
+        similarities = self.similarities(np.asarray(query_embedding).reshape(-1))
+        return [(self.names[i], float(similarities[i])) for i in self.top_indices(similarities, k)]
+
+    def rank_batch(self, query_embeddings: np.ndarray, k: int = None) -> List[List[Tuple[str, float]]]:
+        """(name, similarity) lists for a batch of queries, one matrix product for all of them"""
+        similarities = self.similarities(np.asarray(query_embeddings).reshape(len(query_embeddings), -1))
+        return [[(self.names[i], float(row[i])) for i in self.top_indices(row, k)] for row in similarities]
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Multi-process embedding encoder pool
+Shards large description batches across worker processes, each loading the
+model through get_embedding_model() pinned to its own subset of cores with a
+matching intra-op thread count, and reassembles embeddings in input order.
+One interpreter per core group instead of one for the whole batch lets
+encoding scale with the cores of a batch node.
+
+Usage:
+    # Encode one description per line into a .npy matrix
+    python3 encoder_pool.py --input descriptions.txt --output embeddings.npy --workers 16
+
+    # Run extract_use_case_description on raw user text first
+    python3 encoder_pool.py --input requests.txt --extract --output embeddings.npy
+"""
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+import numpy as np
+from typing import Dict, List, Optional
+
+DEFAULT_SHARD_SIZE = 1024
+DEFAULT_ENCODE_BATCH_SIZE = 128
+
+_worker_model = None
+_worker_id = None
+_worker_error = None
+
+def available_cores() -> List[int]:
+    """CPU ids this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def split_cores(cores: List[int], workers: int) -> List[List[int]]:
+    """Split cores into `workers` contiguous groups of near-equal size"""
+    groups = np.array_split(np.array(cores), workers)
+    return [group.tolist() for group in groups if len(group)]
+
+def _init_worker(counter, core_groups: List[List[int]], threads: int, environ: Dict[str, str]):
+    global _worker_model, _worker_id, _worker_error
+    with counter.get_lock():
+        _worker_id = counter.value
+        counter.value += 1
+    cores = core_groups[_worker_id % len(core_groups)]
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cores)
+    # Thread pools size themselves from these before the runtime is imported
+    for var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+        os.environ[var] = str(threads)
+    os.environ.update(environ)
+
+    # A failing initializer makes Pool respawn workers forever; report it from the first task instead
+    try:
+        import get_best_models_semantic as semantic
+        semantic.EMBEDDING_THREADS = threads
+        _worker_model = semantic.get_embedding_model()
+    except (Exception, SystemExit) as e:
+        _worker_error = f"{type(e).__name__}: {e}"
+
+def _encode_shard(task):
+    shard_id, texts, batch_size = task
+    if _worker_error:
+        raise RuntimeError(f"Encoder worker failed to load the embedding model: {_worker_error}")
+    start = time.perf_counter()
+    embeddings = np.asarray(_worker_model.encode(texts, batch_size=batch_size, show_progress_bar=False),
+                            dtype=np.float32)
+    return shard_id, embeddings, _worker_id, time.perf_counter() - start
+
+class EncoderPool:
+    """Pool of encoder processes with a SentenceTransformer-style encode()
+
+    Worker i is pinned to the i-th group of cores and runs `threads` intra-op
+    threads. Counters (texts, shards, wall/encode seconds, per-worker texts)
+    accumulate across encode() calls; see stats().
+    """
+
+    def __init__(self, workers: Optional[int] = None, threads: Optional[int] = None,
+                 shard_size: int = DEFAULT_SHARD_SIZE, batch_size: int = DEFAULT_ENCODE_BATCH_SIZE):
+        cores = available_cores()
+        if workers is None:
+            workers = max(1, len(cores) // (threads or 1))
+        workers = max(1, min(workers, len(cores)))
+        core_groups = split_cores(cores, workers)
+        self.workers = len(core_groups)
+        self.threads = threads or max(1, min(len(group) for group in core_groups))
+        self.shard_size = shard_size
+        self.batch_size = batch_size
+
+        self.texts_encoded = 0
+        self.shards = 0
+        self.wall_seconds = 0.0
+        self.encode_seconds = 0.0
+        self.worker_texts = [0] * self.workers
+
+        # spawn: workers must not inherit a parent's already-initialized torch/ORT thread pools
+        context = multiprocessing.get_context('spawn')
+        counter = context.Value('i', 0)
+        environ = {k: v for k, v in os.environ.items() if k.startswith(('EMBEDDING_', 'HF_'))}
+        self.pool = context.Pool(self.workers, initializer=_init_worker,
+                                 initargs=(counter, core_groups, self.threads, environ))
+
+    def encode(self, sentences, batch_size: Optional[int] = None, show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        """Embeddings for sentences, in input order"""
+        single = isinstance(sentences, str)
+        sentences = [sentences] if single else list(sentences)
+        batch_size = batch_size or self.batch_size
+        start = time.perf_counter()
+
+        tasks = [(shard_id, sentences[offset:offset + self.shard_size], batch_size)
+                 for shard_id, offset in enumerate(range(0, len(sentences), self.shard_size))]
+        embeddings = None
+        for shard_id, shard_embeddings, worker_id, seconds in self.pool.imap_unordered(_encode_shard, tasks):
+            if embeddings is None:
+                embeddings = np.empty((len(sentences), shard_embeddings.shape[1]), dtype=np.float32)
+            offset = shard_id * self.shard_size
+            embeddings[offset:offset + len(shard_embeddings)] = shard_embeddings
+            self.encode_seconds += seconds
+            self.worker_texts[worker_id % self.workers] += len(shard_embeddings)
+            if show_progress_bar:
+                done = sum(self.worker_texts)
+                print(f"\r  Encoded {done:,} texts", end='', flush=True)
+        if show_progress_bar:
+            print()
+
+        self.texts_encoded += len(sentences)
+        self.shards += len(tasks)
+        self.wall_seconds += time.perf_counter() - start
+        if embeddings is None:
+            embeddings = np.zeros((0, 0), dtype=np.float32)
+        return embeddings[0] if single else embeddings
+
+    def stats(self) -> Dict:
+        return {
+            'workers': self.workers,
+            'threads_per_worker': self.threads,
+            'texts': self.texts_encoded,
+            'shards': self.shards,
+            'wall_seconds': self.wall_seconds,
+            'encode_seconds': self.encode_seconds,
+            'texts_per_second': self.texts_encoded / self.wall_seconds if self.wall_seconds else 0.0,
+            'worker_texts': list(self.worker_texts),
+        }
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.pool.terminate()
+        self.pool.join()
+
+def print_pool_stats(stats: Dict):
+    print(f"  Workers: {stats['workers']} x {stats['threads_per_worker']} threads")
+    print(f"  Texts: {stats['texts']:,} in {stats['shards']} shards, {stats['wall_seconds']:.1f}s "
+          f"({stats['texts_per_second']:,.0f} texts/s)")
+    print(f"  Per worker: {stats['worker_texts']}")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Encode many descriptions with a pool of pinned encoder processes',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 encoder_pool.py --input descriptions.txt --output embeddings.npy --workers 16 --threads 4
+  python3 encoder_pool.py --input requests.txt --extract --output embeddings.npy
+        """
+    )
+    parser.add_argument('--input', '-i', type=str, required=True, help='Text file, one description per line')
+    parser.add_argument('--output', '-o', type=str, required=True, help='Output .npy file (float32, input order)')
+    parser.add_argument('--extract', action='store_true', help='Run extract_use_case_description on each line first')
+    parser.add_argument('--workers', '-w', type=int, help='Encoder processes (default: cores / threads)')
+    parser.add_argument('--threads', '-t', type=int, help='Intra-op threads per worker (default: cores per worker)')
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE, help=f'Texts per task (default: {DEFAULT_SHARD_SIZE})')
+
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        texts = [line.strip() for line in f if line.strip()]
+    if args.extract:
+        from extract_usecase_from_text import extract_use_case_description
+        texts = [extract_use_case_description(text) for text in texts]
+    if not texts:
+        print(f"Error: no descriptions in {args.input}")
+        sys.exit(1)
+
+    print("=" * 60)
+    print(f"Encoding {len(texts):,} descriptions")
+    print("=" * 60)
+    with EncoderPool(args.workers, args.threads, args.shard_size) as pool:
+        embeddings = pool.encode(texts, show_progress_bar=True)
+        stats = pool.stats()
+    np.save(args.output, embeddings)
+    print_pool_stats(stats)
+    print(f"✓ Saved {embeddings.shape[0]:,} x {embeddings.shape[1]} embeddings to {args.output}")
+
+if __name__ == "__main__":
+    main()
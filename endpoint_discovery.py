@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Endpoint discovery for the artificialanalysis.ai API clients
+ArtificialAnalysisClient and data_fetcher try several candidate URL patterns
+per method. EndpointResolver probes all candidates of a method at once
+(through the shared fetch engine) and remembers which pattern answered, so
+later calls, e.g. get_model_scores for every model, make a single request.
+Calls that arrive while a method is being probed wait for that probe instead
+of starting their own. If the remembered pattern stops answering, the
+remaining candidates are probed again, again concurrently.
+
+The working pattern per method is kept in a small state file
+(ENDPOINT_STATE_FILE, default .endpoint_state.json) with its discovery time;
+entries older than ENDPOINT_STATE_TTL seconds (default one day) are
+re-discovered.
+
+Usage:
+    # Show the remembered endpoints
+    python3 endpoint_discovery.py --info
+
+    # Forget them (next calls probe again)
+    python3 endpoint_discovery.py --clear
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import argparse
+from typing import Any, Callable, Dict, List, Optional
+
+import fetch_engine
+from fetch_engine import FetchEngine
+
+DEFAULT_STATE_FILE = os.environ.get('ENDPOINT_STATE_FILE', '.endpoint_state.json')
+DEFAULT_STATE_TTL = float(os.environ.get('ENDPOINT_STATE_TTL', 86400))
+
+class EndpointState:
+    """Working URL pattern per API method, persisted with its discovery time"""
+
+    def __init__(self, path: str = DEFAULT_STATE_FILE, ttl: float = DEFAULT_STATE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = self._load()  # method -> {"pattern", "discovered_at"}
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, method: str) -> Optional[str]:
+        """Remembered pattern for method, unless it has expired"""
+        with self._lock:
+            entry = self._entries.get(method)
+        if not entry or time.time() - entry.get('discovered_at', 0) >= self.ttl:
+            return None
+        return entry.get('pattern')
+
+    def remember(self, method: str, pattern: str):
+        with self._lock:
+            self._entries[method] = {'pattern': pattern, 'discovered_at': time.time()}
+            self._save()
+
+    def entries(self) -> Dict[str, Dict]:
+        with self._lock:
+            return dict(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+class EndpointResolver:
+    """First working candidate URL per method, probed concurrently and remembered"""
+
+    def __init__(self, state: Optional[EndpointState] = None, engine: Optional[FetchEngine] = None,
+                 verbose: bool = False):
+        self.state = state or EndpointState()
+        self.engine = engine or fetch_engine.default_engine()
+        self.verbose = verbose
+        self.probes = 0
+        self._discovering = {}  # method -> future done when its in-flight probe finishes
+
+    async def _try(self, url: str, parse: Callable[[Any], Any], headers: Optional[Dict], timeout: float,
+                   verbose: bool) -> Any:
+        """parse(JSON body) of a 200 response, or None"""
+        try:
+            response = await self.engine.get(url, headers=headers, timeout=timeout)
+            if response.status_code == 200:
+                return parse(response.json())
+        except Exception as e:
+            if verbose:
+                print(f"Error with {url}: {e}")
+        return None
+
+    async def _first_in_order(self, patterns: List[str], parse: Callable[[Any], Any], headers: Optional[Dict],
+                              timeout: float, verbose: bool, fields: Dict):
+        """(pattern, result) of the first pattern in list order that answers, or (None, None)
+
+        All candidates are probed at once; the answer is returned as soon as
+        every candidate before the winner has failed, without waiting for the
+        slower ones behind it, which are then cancelled.
+        """
+        tasks = [asyncio.ensure_future(self._try(pattern.format(**fields), parse, headers, timeout, verbose))
+                 for pattern in patterns]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                await completed
+                for pattern, task in zip(patterns, tasks):
+                    if not task.done():
+                        break  # a preferred candidate is still pending
+                    if task.result() is not None:
+                        return pattern, task.result()
+            return None, None
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def fetch(self, method: str, patterns: List[str], parse: Callable[[Any], Any] = lambda data: data,
+                    headers: Optional[Dict] = None, timeout: float = 10, verbose: Optional[bool] = None,
+                    **fields) -> Any:
+        """parse(data) from the first pattern (in list order) whose 200 response parse accepts, or None
+
+        patterns are URL templates filled in with fields (e.g. model_id). The
+        remembered pattern for method is tried alone first. verbose (default:
+        the resolver's) prints request errors. A probe returns as soon as every
+        candidate ahead of the first working one has failed.
+        """
+        verbose = self.verbose if verbose is None else verbose
+        remembered = self.state.get(method)
+        if remembered is None and method in self._discovering:
+            await asyncio.shield(self._discovering[method])
+            remembered = self.state.get(method)
+        if remembered in patterns:
+            result = await self._try(remembered.format(**fields), parse, headers, timeout, verbose)
+            if result is not None:
+                return result
+            patterns = [pattern for pattern in patterns if pattern != remembered]
+
+        discovery = None
+        if remembered is None and method not in self._discovering:
+            discovery = self._discovering[method] = asyncio.get_running_loop().create_future()
+        try:
+            self.probes += 1
+            pattern, result = await self._first_in_order(patterns, parse, headers, timeout, verbose, fields)
+            if pattern is not None:
+                self.state.remember(method, pattern)
+            return result
+        finally:
+            if discovery is not None:
+                del self._discovering[method]
+                discovery.set_result(None)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Inspect or clear the remembered API endpoints',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 endpoint_discovery.py --info
+  python3 endpoint_discovery.py --clear
+  ENDPOINT_STATE_TTL=3600 python3 api_client.py
+        """
+    )
+    parser.add_argument('--info', action='store_true', help='List the remembered endpoint per method')
+    parser.add_argument('--clear', action='store_true', help='Forget every remembered endpoint')
+    parser.add_argument('--state-file', type=str, default=DEFAULT_STATE_FILE, help=f'State file (default: {DEFAULT_STATE_FILE})')
+
+    args = parser.parse_args()
+    state = EndpointState(args.state_file)
+    if args.clear:
+        state.clear()
+        print(f"✓ Cleared {args.state_file}")
+    elif args.info:
+        entries = state.entries()
+        print(f"Endpoint state: {args.state_file} (TTL {state.ttl:g}s)")
+        if not entries:
+            print("  (empty)")
+        for method, entry in sorted(entries.items()):
+            age = time.time() - entry.get('discovered_at', 0)
+            marker = '' if age < state.ttl else '  (expired)'
+            print(f"  {method}: {entry.get('pattern')}  [{age:.0f}s old]{marker}")
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -2,29 +2,28 @@
 """
 Extract use case information from plain text and match to best predefined use case
 Uses semantic matching with sentence-transformers/all-MiniLM-L6-v2
+
+The embedding model, the use case embeddings and the per-description query
+embedding are shared with get_best_models_semantic, so extract_match_and_rank()
+extracts, matches and ranks a request with one model and one encode.
 """
 import json
 import re
 import sys
 import argparse
 from typing import Dict, Optional, Tuple, List
+import numpy as np
 
 # Import extraction functions
 from extract_usecase_from_text import (
     extract_user_count,
     extract_priority,
     extract_hardware,
-    extract_use_case_description
+    extract_use_case_description,
+    extract_usecase_json
 )
-
-try:
-    from sentence_transformers import SentenceTransformer
-    from sklearn.metrics.pairwise import cosine_similarity
-    import numpy as np
-except ImportError:
-    print("Error: Required packages not installed.")
-    print("Please install: pip install sentence-transformers scikit-learn numpy")
-    sys.exit(1)
+from ranking_client import DaemonError, daemon_available, extract_match_and_rank_remote
+import get_best_models_semantic as semantic
 
 # Predefined use cases with full descriptions for embedding
 PREDEFINED_USE_CASES = {
@@ -112,69 +111,37 @@ SUBJECT_CSVS = {
 # Combine all for semantic matching
 ALL_CSVS = {**PREDEFINED_USE_CASES, **SUBJECT_CSVS}
 
-# Embedding model
-EMBEDDING_MODEL_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
-_embedding_model = None
+# Embedding model (the instance itself lives in get_best_models_semantic)
+EMBEDDING_MODEL_NAME = semantic.EMBEDDING_MODEL_NAME
+EMBEDDING_MODEL_REVISION = semantic.EMBEDDING_MODEL_REVISION
 _use_case_embeddings = None
 
 def get_embedding_model():
-    """Get or initialize the embedding model"""
-    global _embedding_model
-    if _embedding_model is None:
-        print(f"Loading embedding model: {EMBEDDING_MODEL_NAME}...")
-        _embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
-        print("✓ Model loaded")
-    return _embedding_model
+    """Get or initialize the embedding model (shared with get_best_models_semantic)"""
+    return semantic.get_embedding_model()
 
 def generate_use_case_embeddings():
-    """Generate embeddings for all use cases and subjects"""
+    """Generate embeddings for all use cases and subjects (through the on-disk cache)"""
     global _use_case_embeddings
-    if _use_case_embeddings is not None:
-        return _use_case_embeddings
-    
-    model = get_embedding_model()
-    
-    # Collect all descriptions
-    all_names = []
-    all_descriptions = []
-    
-    for name, info in ALL_CSVS.items():
-        all_names.append(name)
-        all_descriptions.append(info['description'])
-    
-    # Generate embeddings
-    print(f"Generating embeddings for {len(all_descriptions)} use cases/subjects...")
-    embeddings = model.encode(all_descriptions, show_progress_bar=True)
-    
-    _use_case_embeddings = dict(zip(all_names, embeddings))
-    print("✓ Embeddings generated")
-    
+    if _use_case_embeddings is None:
+        _use_case_embeddings = semantic.generate_use_case_embeddings()
+        print("✓ Embeddings generated")
     return _use_case_embeddings
 
 def calculate_semantic_similarity(user_description: str, use_case_embeddings: Dict[str, np.ndarray]) -> List[Tuple[str, float]]:
-    """Calculate cosine similarity between user description and all use case embeddings"""
-    model = get_embedding_model()
-    
-    # Generate embedding for user description
-    user_embedding = model.encode([user_description], show_progress_bar=False)
-    user_embedding = user_embedding[0].reshape(1, -1)
-    
-    # Calculate cosine similarity with all use cases
-    similarities = []
-    
-    for usecase_name, usecase_embedding in use_case_embeddings.items():
-        usecase_embedding_2d = usecase_embedding.reshape(1, -1)
-        similarity = cosine_similarity(user_embedding, usecase_embedding_2d)[0][0]
-        similarities.append((usecase_name, float(similarity)))
-    
-    # Sort by similarity (descending)
-    similarities.sort(key=lambda x: x[1], reverse=True)
-    
-    return similarities
+    """Calculate cosine similarity between user description and all use case embeddings
+
+    The description is encoded once; ranking the same description reuses the embedding.
+    """
+    return semantic.calculate_semantic_similarity(user_description, use_case_embeddings)
+
+def extract_fields(user_text: str) -> Dict:
+    """use_case plus user_count, priority and hardware when the text mentions them (one scan)"""
+    return extract_usecase_json(user_text)
 
 def extract_and_match_usecase(user_text: str) -> Dict:
     """
-    Extract use case information from plain text and match to best predefined use case
+    Extract use case information from plain text
     
     Args:
         user_text: Plain text description from user
@@ -185,38 +152,55 @@ def extract_and_match_usecase(user_text: str) -> Dict:
         - user_count: Number of users (optional)
         - priority: Priority level (optional)
         - hardware: Hardware requirements (optional)
-        - matched_use_case: Best matching predefined use case name
-        - matched_use_case_description: Description of matched use case
-        - similarity_score: Semantic similarity score (0-1)
-        - top_matches: List of top 3 matches with scores
-    """
-    # Step 1: Extract information from plain text
-    use_case_description = extract_use_case_description(user_text)
-    user_count = extract_user_count(user_text)
-    priority = extract_priority(user_text)
-    hardware = extract_hardware(user_text)
     
-    # Step 2: Generate embeddings and find best match
-    use_case_embeddings = generate_use_case_embeddings()
-    similarities = calculate_semantic_similarity(use_case_description, use_case_embeddings)
+    Matching is left to extract_match_and_rank, which returns the matches and
+    ranked models as well; this function loads no embedding model.
+    """
+    return extract_fields(user_text)
+
+def extract_match_and_rank(user_text: str, top_k: int = None, cascade: bool = False,
+                           margin: Optional[float] = None) -> Dict:
+    """
+    Extract, match and rank in one pass: one model instance, one encode of the description
     
-    # Get top match
-    best_match_name, best_match_score = similarities[0]
-    best_match_info = ALL_CSVS[best_match_name]
+    Args:
+        user_text: Plain text description from user
+        top_k: Only keep the top K models (default: all models)
+        cascade: Answer from the keyword matcher when it is confident (see cascade_matcher.py)
+        margin: Cascade margin (default: CASCADE_MARGIN)
     
-    # Build result - only include use_case
-    result = {
-        "use_case": use_case_description
-    }
+    Returns:
+        extract_and_match_usecase() fields plus:
+        - matched_use_case: Best matching predefined use case/subject name
+        - similarity_score: Its similarity score (0-1, keyword score for the keyword tier)
+        - top_matches: Top 3 matches as [{"name", "score"}]
+        - match_weights: Use case/subject weights the ranking used
+        - models: Ranked models, as get_best_models_for_usecase returns them
+        - tier: Matcher that answered ('keyword' or 'semantic')
+    """
+    result = extract_fields(user_text)
+    description = result["use_case"]
+    usecase_config = {"type": "custom", "name": "custom_use_case", "description": description}
     
-    # Add optional fields only if present
-    if user_count is not None:
-        result["user_count"] = user_count
-    if priority is not None:
-        result["priority"] = priority
-    if hardware is not None:
-        result["hardware"] = hardware
+    if cascade:
+        from cascade_matcher import KEYWORD_TIER, get_best_models_cascade, keyword_matches
+        models, match_info, tier = get_best_models_cascade(usecase_config, None, top_k, margin)
+    else:
+        tier = 'semantic'
+        models, match_info = semantic.get_best_models_for_usecase(usecase_config, generate_use_case_embeddings(), top_k)
+    if cascade and tier == KEYWORD_TIER:
+        similarities = keyword_matches(description)
+    else:
+        # Cached query embedding: no second encode
+        similarities = calculate_semantic_similarity(description, generate_use_case_embeddings())
+    best_match_name, best_match_score = similarities[0]
     
+    result["matched_use_case"] = best_match_name
+    result["similarity_score"] = best_match_score
+    result["top_matches"] = [{"name": name, "score": score} for name, score in similarities[:3]]
+    result["match_weights"] = match_info
+    result["models"] = models
+    result["tier"] = tier
     return result
 
 def main():
@@ -228,6 +212,8 @@ Examples:
   python3 extract_and_match_usecase.py --text "I need a chatbot for 100 users with high priority"
   python3 extract_and_match_usecase.py --text "I need code autocomplete for my IDE, needs GPU"
   python3 extract_and_match_usecase.py --file input.txt --output output.json
+  python3 extract_and_match_usecase.py --text "I need a math solver for 50 users" --rank --top-k 10
+  python3 extract_and_match_usecase.py --text "I need translation for 500 customers" --rank --cascade
 
 Input: Plain text (e.g., "I need a math solver for 50 users, high priority, needs cloud")
 Output: JSON with use_case, user_count, priority, hardware, matched_use_case, similarity_score
@@ -236,6 +222,10 @@ Output: JSON with use_case, user_count, priority, hardware, matched_use_case, si
     parser.add_argument('--text', '-t', type=str, help='Plain text input')
     parser.add_argument('--file', '-f', type=str, help='File with plain text input')
     parser.add_argument('--output', '-o', type=str, help='Output JSON file (optional)')
+    parser.add_argument('--rank', action='store_true', help='Also rank models (match weights and models in the JSON)')
+    parser.add_argument('--top-k', type=int, help='With --rank, only keep the top K models (default: all models)')
+    parser.add_argument('--cascade', action='store_true',
+                        help='With --rank, answer from the keyword matcher when it is confident (see cascade_matcher.py)')
     
     args = parser.parse_args()
     
@@ -255,9 +245,17 @@ Output: JSON with use_case, user_count, priority, hardware, matched_use_case, si
     print("=" * 70)
     print(f"\n📝 Input Text: {user_text}")
     
-    # Extract and match
+    # Extract and match (and rank)
     print("\n🔍 Extracting information and matching to use cases...")
-    result = extract_and_match_usecase(user_text)
+    result = None
+    if args.rank and daemon_available():
+        try:
+            result = extract_match_and_rank_remote(user_text, args.top_k, args.cascade)
+        except (DaemonError, OSError) as e:
+            print(f"⚠ Ranking daemon failed ({e}), ranking in-process")
+    if result is None:
+        # Extraction alone loads no model, so it is not worth a daemon round trip
+        result = extract_match_and_rank(user_text, args.top_k, args.cascade) if args.rank else extract_and_match_usecase(user_text)
     
     # Display results
     print("\n" + "=" * 70)
@@ -2,30 +2,88 @@
 """
 Extract use case information from plain text and return structured JSON
 User types plain text, system extracts: use_case, user_count, priority, hardware
+
+Bulk mode (--stream) reads one request per line (plain text or JSONL) from a
+file or stdin, extracts across a process pool and writes NDJSON in input order.
 """
+import io
+import itertools
 import json
+import multiprocessing
+import os
+import random
 import re
 import sys
+import time
 import argparse
-from typing import Dict, Optional
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_STREAM_CHUNK_SIZE = 1000
+
+# Patterns for user count (first pattern with an in-range count wins)
+USER_COUNT_PATTERNS = [
+    r'(\d+)\s*users?',
+    r'for\s+(\d+)\s*users?',
+    r'(\d+)\s*people',
+    r'(\d+)\s*employees',
+    r'(\d+)\s*team\s*members?',
+    r'serving\s+(\d+)',
+    r'(\d+)\s*end\s*users?',
+    r'(\d+)\s*customers?',
+]
+
+# Priority indicators, highest level first
+PRIORITY_WORDS = {
+    'high': ['critical', 'urgent', 'high priority', 'important', 'asap', 'immediately'],
+    'medium': ['medium', 'normal', 'standard', 'moderate'],
+    'low': ['low priority', 'low', 'nice to have', 'optional'],
+}
+
+# Hardware keywords
+HARDWARE_KEYWORDS = {
+    'gpu': ['gpu', 'graphics card', 'nvidia', 'cuda'],
+    'cpu': ['cpu', 'processor', 'intel', 'amd'],
+    'memory': ['ram', 'memory', 'gb ram', 'mb ram'],
+    'cloud': ['cloud', 'aws', 'azure', 'gcp', 'google cloud'],
+    'edge': ['edge', 'edge device', 'raspberry pi', 'embedded'],
+    'mobile': ['mobile', 'phone', 'smartphone', 'ios', 'android'],
+    'server': ['server', 'datacenter', 'on-premise', 'on premise'],
+}
+
+# Phrases removed from the use case description, in the order they are removed
+USER_COUNT_PHRASES = [
+    r'\s+for\s+\d+\s+users?\b',
+    r'\s+\d+\s+users?\b',
+    r'\s+for\s+\d+\s+employees?\b',
+    r'\s+\d+\s+employees?\b',
+    r'\s+\d+\s+people\b',
+]
+PRIORITY_PHRASES = [
+    r'\s+with\s+high\s+priority\b',
+    r'\s+high\s+priority\b',
+    r'\s+with\s+critical\s+priority\b',
+    r'\s+critical\s+priority\b',
+    r'\s+urgent\b',
+    r'\s+asap\b',
+    r'\s+with\s+low\s+priority\b',
+    r'\s+low\s+priority\b',
+]
+HARDWARE_PHRASES = [
+    r'\s+needs?\s+cloud\s+infrastructure\b',
+    r'\s+needs?\s+cloud\b',
+    r'\s+needs?\s+gpu\b',
+    r'\s+needs?\s+cpu\b',
+    r'\s+needs?\s+server\b',
+    r'\s+with\s+gpu\b',
+    r'\s+with\s+cloud\b',
+]
 
 def extract_user_count(text: str) -> Optional[int]:
     """Extract user count from text"""
     text_lower = text.lower()
     
-    # Patterns for user count
-    patterns = [
-        r'(\d+)\s*users?',
-        r'for\s+(\d+)\s*users?',
-        r'(\d+)\s*people',
-        r'(\d+)\s*employees',
-        r'(\d+)\s*team\s*members?',
-        r'serving\s+(\d+)',
-        r'(\d+)\s*end\s*users?',
-        r'(\d+)\s*customers?',
-    ]
-    
-    for pattern in patterns:
+    for pattern in USER_COUNT_PATTERNS:
         match = re.search(pattern, text_lower)
         if match:
             try:
@@ -47,17 +105,10 @@ def extract_priority(text: str) -> Optional[str]:
     """Extract priority level from text"""
     text_lower = text.lower()
     
-    # High priority indicators
-    if any(word in text_lower for word in ['critical', 'urgent', 'high priority', 'important', 'asap', 'immediately']):
-        return 'high'
-    
-    # Medium priority indicators
-    if any(word in text_lower for word in ['medium', 'normal', 'standard', 'moderate']):
-        return 'medium'
-    
-    # Low priority indicators
-    if any(word in text_lower for word in ['low priority', 'low', 'nice to have', 'optional']):
-        return 'low'
+    # High, then medium, then low priority indicators
+    for level, words in PRIORITY_WORDS.items():
+        if any(word in text_lower for word in words):
+            return level
     
     return None
 
@@ -65,19 +116,8 @@ def extract_hardware(text: str) -> Optional[str]:
     """Extract hardware requirements from text"""
     text_lower = text.lower()
     
-    # Hardware keywords
-    hardware_keywords = {
-        'gpu': ['gpu', 'graphics card', 'nvidia', 'cuda'],
-        'cpu': ['cpu', 'processor', 'intel', 'amd'],
-        'memory': ['ram', 'memory', 'gb ram', 'mb ram'],
-        'cloud': ['cloud', 'aws', 'azure', 'gcp', 'google cloud'],
-        'edge': ['edge', 'edge device', 'raspberry pi', 'embedded'],
-        'mobile': ['mobile', 'phone', 'smartphone', 'ios', 'android'],
-        'server': ['server', 'datacenter', 'on-premise', 'on premise'],
-    }
-    
     found_hardware = []
-    for hw_type, keywords in hardware_keywords.items():
+    for hw_type, keywords in HARDWARE_KEYWORDS.items():
         if any(keyword in text_lower for keyword in keywords):
             found_hardware.append(hw_type)
     
@@ -91,38 +131,9 @@ def extract_use_case_description(text: str) -> str:
     # Start with original text
     cleaned = text
     
-    # Remove user count patterns (more carefully)
-    cleaned = re.sub(r'\s+for\s+\d+\s+users?\b', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\s+\d+\s+users?\b', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\s+for\s+\d+\s+employees?\b', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\s+\d+\s+employees?\b', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\s+\d+\s+people\b', '', cleaned, flags=re.IGNORECASE)
-    
-    # Remove priority phrases (keep the sentence structure)
-    priority_phrases = [
-        r'\s+with\s+high\s+priority\b',
-        r'\s+high\s+priority\b',
-        r'\s+with\s+critical\s+priority\b',
-        r'\s+critical\s+priority\b',
-        r'\s+urgent\b',
-        r'\s+asap\b',
-        r'\s+with\s+low\s+priority\b',
-        r'\s+low\s+priority\b',
-    ]
-    for phrase in priority_phrases:
-        cleaned = re.sub(phrase, '', cleaned, flags=re.IGNORECASE)
-    
-    # Remove hardware phrases
-    hardware_phrases = [
-        r'\s+needs?\s+cloud\s+infrastructure\b',
-        r'\s+needs?\s+cloud\b',
-        r'\s+needs?\s+gpu\b',
-        r'\s+needs?\s+cpu\b',
-        r'\s+needs?\s+server\b',
-        r'\s+with\s+gpu\b',
-        r'\s+with\s+cloud\b',
-    ]
-    for phrase in hardware_phrases:
+    # Remove user count patterns (more carefully), then priority phrases (keep the
+    # sentence structure), then hardware phrases
+    for phrase in USER_COUNT_PHRASES + PRIORITY_PHRASES + HARDWARE_PHRASES:
         cleaned = re.sub(phrase, '', cleaned, flags=re.IGNORECASE)
     
     # Clean up extra spaces and punctuation
@@ -136,6 +147,116 @@ def extract_use_case_description(text: str) -> str:
     
     return cleaned.strip()
 
+# Single-pass extraction: every field and the description removals come from one
+# scan of the lowercased text with a zero-width alternation, so overlapping
+# matches (a count inside a removed phrase, "ram" inside "gb ram") are all seen.
+# Each position reports the first alternative that matches there; removals start
+# at whitespace, counts at digits, and no phrase of one category is a prefix of a
+# phrase of another, so alternatives never hide one another.
+def _literal_trie(words: List[str]) -> str:
+    """Regex alternation of words factored by common prefixes (one branch per first character)"""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+    def emit(node: Dict) -> str:
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' not in node:
+            return body
+        return f'(?:{body})?' if len(branches) == 1 else body + '?'
+    return emit(trie)
+
+_PHRASE_CATEGORY = {word: ('priority', level) for level, words in PRIORITY_WORDS.items() for word in words}
+_PHRASE_CATEGORY.update({keyword: ('hardware', hw_type) for hw_type, keywords in HARDWARE_KEYWORDS.items()
+                         for keyword in keywords})
+# USER_COUNT_PATTERNS in order: group that must match -> group holding the count
+_USER_COUNT_RULES = {
+    'users': 'count',
+    'for_users': 'for_count',
+    'people': 'count',
+    'employees': 'count',
+    'team_members': 'count',
+    'serving_count': 'serving_count',
+    'end_users': 'count',
+    'customers': 'count',
+}
+# Every removal phrase starts with \s+; it is matched once for all of them
+_REMOVALS = [phrase[len(r'\s+'):] for phrase in USER_COUNT_PHRASES + PRIORITY_PHRASES + HARDWARE_PHRASES]
+# Each branch starts with a character test so positions are rejected without
+# entering a group; empty groups mark where removals, counts and phrases end
+_SCAN = re.compile(
+    r'(?=\s(?<!\s\s)\s*(?:' + '|'.join(_REMOVALS) + r')(?P<remove>)'
+    r'|\d(?<!\d\d)\d*(?P<count>)(?:\s*(?:(?P<users>users?)|(?P<people>people)|(?P<employees>employees)'
+    r'|(?P<team_members>team\s*members?)|(?P<end_users>end\s*users?)|(?P<customers>customers?)))?'
+    r'|for\s+(?P<for_count>\d+)(?P<for_users>\s*users?)?'
+    r'|serving\s+(?P<serving_count>\d+)'
+    r'|(?:' + _literal_trie(list(_PHRASE_CATEGORY)) + r')(?P<phrase>))'
+)
+# Words a removal can join with the rest of a later phrase ("needs urgent gpu"), besides numbers
+_REMOVAL_JOIN_WORDS = {'for', 'with', 'high', 'critical', 'low', 'need', 'needs', 'cloud'}
+# Characters whose IGNORECASE matching differs from str.lower() (or that change length when lowered)
+_CASEFOLD_SPECIAL = re.compile('[İıſK]')
+_DOUBLE_COMMA = re.compile(r'\s*,\s*,')
+
+def _scan_text(text: str) -> Tuple[Optional[int], Optional[str], Optional[str], Optional[str]]:
+    """(user_count, priority, hardware, description) from one scan
+
+    The description is None when removals join into a new phrase; only the
+    sequential passes of extract_use_case_description reproduce that.
+    """
+    first = {}  # rule group -> count of its first match
+    found = set()
+    removals = []  # accepted (start, end), leftmost first and non-overlapping
+    text_lower = text.lower()
+    for match in _SCAN.finditer(text_lower):
+        group = match.lastgroup
+        if group == 'remove':
+            if not removals or match.start() >= removals[-1][1]:
+                removals.append((match.start(), match.end(group)))
+        elif group == 'phrase':
+            found.add(_PHRASE_CATEGORY[text_lower[match.start():match.end(group)]])
+        elif group in _USER_COUNT_RULES and group not in first:
+            count_group = _USER_COUNT_RULES[group]
+            first[group] = (text_lower[match.start():match.end(count_group)] if count_group == 'count'
+                            else match.group(count_group))
+
+    user_count = None
+    for group in _USER_COUNT_RULES:
+        if group in first:
+            try:
+                count = int(first[group])
+            except ValueError:
+                continue
+            if 1 <= count <= 1000000:
+                user_count = count
+                break
+    priority = next((level for level in PRIORITY_WORDS if ('priority', level) in found), None)
+    hardware = ', '.join(hw_type for hw_type in HARDWARE_KEYWORDS if ('hardware', hw_type) in found) or None
+
+    pieces = []
+    position = 0
+    for start, end in removals:
+        if start != position:
+            pieces.append(text[position:start])
+            last_word = pieces[-1].rsplit(None, 1)[-1].lower()
+            if last_word in _REMOVAL_JOIN_WORDS or last_word.isdecimal():
+                return user_count, priority, hardware, None
+        position = end
+    pieces.append(text[position:])
+    # Same as collapsing \s+ to one space, as leading/trailing spaces are stripped below
+    cleaned = ' '.join(''.join(pieces).split())
+    if ',,' in cleaned or ', ,' in cleaned:
+        cleaned = _DOUBLE_COMMA.sub(',', cleaned)
+    cleaned = cleaned.strip(' ,')
+    if len(cleaned) < 10:
+        cleaned = text
+    return user_count, priority, hardware, cleaned.strip()
+
 def extract_usecase_json(user_text: str) -> Dict:
     """
     Extract structured JSON from plain text user input
@@ -145,12 +266,21 @@ def extract_usecase_json(user_text: str) -> Dict:
     
     Returns:
         Dictionary with use_case, user_count, priority, hardware
+    
+    Fields come from one compiled scan of the text; the results equal the
+    per-field extract_* functions, which are used directly for the rare
+    texts the scan cannot answer on its own.
     """
+    if _CASEFOLD_SPECIAL.search(user_text):
+        user_count, priority, hardware, use_case = (
+            extract_user_count(user_text), extract_priority(user_text), extract_hardware(user_text), None)
+    else:
+        user_count, priority, hardware, use_case = _scan_text(user_text)
     result = {
-        "use_case": extract_use_case_description(user_text),
-        "user_count": extract_user_count(user_text),
-        "priority": extract_priority(user_text),
-        "hardware": extract_hardware(user_text)
+        "use_case": use_case if use_case is not None else extract_use_case_description(user_text),
+        "user_count": user_count,
+        "priority": priority,
+        "hardware": hardware
     }
     
     # Remove None values (optional fields)
@@ -158,6 +288,168 @@ def extract_usecase_json(user_text: str) -> Dict:
     
     return result
 
+def _extract_lines(task: Tuple[List[Tuple[int, str]], str, str, str]) -> List[str]:
+    """NDJSON records for (line number, line) pairs: plain text, or JSON objects holding text_field"""
+    lines, input_format, text_field, id_field = task
+    records = []
+    for line_number, line in lines:
+        record = {'line': line_number}
+        text = line
+        if input_format == 'jsonl' or (input_format == 'auto' and line.startswith('{')):
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                request = None
+                record['error'] = f"Invalid JSON: {e}"
+            if isinstance(request, dict):
+                if id_field in request:
+                    record['id'] = request[id_field]
+                text = request.get(text_field)
+                if not isinstance(text, str):
+                    record['error'] = f"Missing '{text_field}' field"
+            elif 'error' not in record:
+                record['error'] = "Expected a JSON object"
+        if 'error' not in record:
+            record.update(extract_usecase_json(text))
+        records.append(json.dumps(record, ensure_ascii=False))
+    return records
+
+def _request_lines(stream: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """(line number, stripped line) for every non-blank line"""
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if line:
+            yield line_number, line
+
+def stream_extract(stream: Iterable[str], workers: int = 1, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+                   input_format: str = 'auto', text_field: str = 'text', id_field: str = 'id') -> Iterator[str]:
+    """NDJSON result lines for a stream of requests, in input order
+
+    Chunks of chunk_size lines are extracted by `workers` processes; at most
+    two chunks per worker are in flight, so memory stays bounded however long
+    the stream is. Each record carries the input line number (and the id of
+    JSONL requests); unparseable requests get an 'error' instead of fields.
+    """
+    lines = _request_lines(stream)
+    chunks = iter(lambda: list(itertools.islice(lines, chunk_size)), [])
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _extract_lines((chunk, input_format, text_field, id_field))
+        return
+
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.apply_async(_extract_lines, ((chunk, input_format, text_field, id_field),)))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+def synthetic_tickets(count: int, seed: int = 0) -> List[str]:
+    """Support-ticket style texts mixing use cases, counts, priorities, hardware and noise"""
+    rng = random.Random(seed)
+    use_cases = ['a chatbot', 'code autocomplete for my IDE', 'document summarization', 'a math problem solver',
+                 'translation service', 'a QA medical expert', 'content generation', 'a financial analysis tool',
+                 'RAG over our wiki', 'a customer support assistant', 'legal research help']
+    numbers = ['0', '1', '5', '10', '50', '200', '500', '1000', '1000000', '1000001', '25000000']
+    counts = ['for {n} users', '{n} users', '{n}users', 'for {n} employees', '{n} employees', '{n} people',
+              '{n} team members', 'serving {n}', '{n} end users', '{n} customers', 'for {n} customer']
+    priorities = [word for words in PRIORITY_WORDS.values() for word in words]
+    priorities += ['with high priority', 'with critical priority', 'critical priority', 'with low priority']
+    hardware = [keyword for keywords in HARDWARE_KEYWORDS.values() for keyword in keywords]
+    hardware += ['needs cloud infrastructure', 'need cloud', 'needs GPU', 'needs cpu', 'needs server',
+                 'with gpu', 'with cloud']
+    filler = ['I need', 'we want', 'please', 'our team', 'the', 'and', 'for', 'with', 'needs', 'high', 'low',
+              'cloud', 'slow', 'allow', 'follow up', 'thanks', 'ASAP!', ',', '.', ', ,', 'workflow', 'ramp up']
+    separators = [' ', ' ', ' ', ' ', '  ', ', ', '\n', '\t']
+    tickets = []
+    for _ in range(count):
+        parts = ['I need', rng.choice(use_cases)]
+        for _ in range(rng.randint(0, 6)):
+            kind = rng.random()
+            if kind < 0.3:
+                parts.append(rng.choice(counts).format(n=rng.choice(numbers)))
+            elif kind < 0.5:
+                parts.append(rng.choice(priorities))
+            elif kind < 0.7:
+                parts.append(rng.choice(hardware))
+            else:
+                parts.append(rng.choice(filler))
+        rng.shuffle(parts[2:])
+        text = parts[0]
+        for part in parts[1:]:
+            text += rng.choice(separators) + part
+        tickets.append(text.upper() if rng.random() < 0.05 else text)
+    return tickets
+
+def reference_usecase_json(user_text: str) -> Dict:
+    """extract_usecase_json from the separate per-field extract_* passes"""
+    result = {
+        "use_case": extract_use_case_description(user_text),
+        "user_count": extract_user_count(user_text),
+        "priority": extract_priority(user_text),
+        "hardware": extract_hardware(user_text)
+    }
+    return {k: v for k, v in result.items() if v is not None}
+
+def run_benchmark(tickets: List[str]) -> int:
+    """Throughput of the single-pass extractor vs the per-field passes; returns the number of mismatches"""
+    start = time.perf_counter()
+    expected = [reference_usecase_json(ticket) for ticket in tickets]
+    reference_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [extract_usecase_json(ticket) for ticket in tickets]
+    single_pass_s = time.perf_counter() - start
+
+    sequential = sum(_CASEFOLD_SPECIAL.search(ticket) is not None or _scan_text(ticket)[3] is None for ticket in tickets)
+    mismatches = sum(a != e for a, e in zip(actual, expected))
+    print(f"\n  {'extractor':<12s} {'tickets/s':>11s} {'per ticket':>12s}")
+    print(f"  {'per-field':<12s} {len(tickets) / reference_s:11,.0f} {1e6 * reference_s / len(tickets):9.1f} µs")
+    print(f"  {'single-pass':<12s} {len(tickets) / single_pass_s:11,.0f} {1e6 * single_pass_s / len(tickets):9.1f} µs")
+    print(f"\n  Speedup: {reference_s / single_pass_s:.1f}x  "
+          f"({sequential / len(tickets):.1%} of descriptions needed the sequential passes)")
+    print(f"  Identical output: {len(tickets) - mismatches} / {len(tickets)}")
+    return mismatches
+
+def run_stream(input_file: Optional[str], output_file: Optional[str], workers: int, chunk_size: int,
+               input_format: str, text_field: str, id_field: str):
+    """--stream: NDJSON for every request line of input_file (or stdin) to output_file (or stdout)"""
+    start = time.time()
+    count = errors = 0
+    if input_file and input_file != '-':
+        source = open(input_file, 'r', encoding='utf-8', errors='replace')
+    else:
+        source = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', errors='replace')
+    to_file = bool(output_file and output_file != '-')
+    if to_file:
+        sink = open(output_file, 'w', encoding='utf-8')
+    else:
+        sys.stdout.reconfigure(encoding='utf-8')
+        sink = sys.stdout
+    try:
+        with source:
+            for record in stream_extract(source, workers, chunk_size, input_format, text_field, id_field):
+                sink.write(record + '\n')
+                count += 1
+                errors += '"error": ' in record  # quotes inside values are escaped, so only the key matches
+            sink.flush()
+    except BrokenPipeError:
+        # Reader went away (e.g. piped into head): silence the final flush and stop
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    finally:
+        if to_file:
+            sink.close()
+    elapsed = time.time() - start
+    destination = f" → {output_file}" if to_file else ""
+    print(f"✓ Extracted {count} request(s) in {elapsed:.1f}s ({count / max(elapsed, 1e-9):,.0f}/s), "
+          f"{errors} error(s){destination}", file=sys.stderr)
+    if errors:
+        sys.exit(1)
+
 def main():
     parser = argparse.ArgumentParser(
         description='Extract use case JSON from plain text input',
@@ -167,17 +459,44 @@ Examples:
   python3 extract_usecase_from_text.py --text "I need a chatbot for 100 users with high priority"
   python3 extract_usecase_from_text.py --text "I need code autocomplete for my IDE, needs GPU"
   python3 extract_usecase_from_text.py --file input.txt --output output.json
+  python3 extract_usecase_from_text.py --stream --file intake.txt --output results.ndjson --workers 16
+  cat intake.jsonl | python3 extract_usecase_from_text.py --stream --text-field message > results.ndjson
+  python3 extract_usecase_from_text.py --benchmark --count 100000
 
 Input: Plain text (e.g., "I need a math solver for 50 users, high priority, needs cloud")
 Output: JSON with use_case, user_count, priority, hardware
         """
     )
     parser.add_argument('--text', '-t', type=str, help='Plain text input')
-    parser.add_argument('--file', '-f', type=str, help='File with plain text input')
-    parser.add_argument('--output', '-o', type=str, help='Output JSON file (optional)')
+    parser.add_argument('--file', '-f', type=str, help='File with plain text input (--stream: one request per line, - for stdin)')
+    parser.add_argument('--output', '-o', type=str, help='Output JSON file (optional; --stream: NDJSON, default stdout)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Extract one request per line of --file or stdin and write one NDJSON record per request')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Extraction processes for --stream (default: all cores)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_STREAM_CHUNK_SIZE,
+                        help=f'Lines per worker task for --stream (default: {DEFAULT_STREAM_CHUNK_SIZE})')
+    parser.add_argument('--format', choices=['auto', 'text', 'jsonl'], default='auto',
+                        help='--stream input lines: plain text, JSON objects, or auto (lines starting with { are JSON)')
+    parser.add_argument('--text-field', type=str, default='text', help='Request text field of JSONL input (default: text)')
+    parser.add_argument('--id-field', type=str, default='id', help='Field of JSONL input copied to the output (default: id)')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Throughput of the single-pass extractor vs the per-field passes on synthetic tickets')
+    parser.add_argument('--count', type=int, default=100000, help='Synthetic tickets for --benchmark (default: 100000)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for --benchmark tickets')
     
     args = parser.parse_args()
     
+    if args.benchmark:
+        print("=" * 70)
+        print(f"  Extraction throughput on {args.count} synthetic tickets")
+        print("=" * 70)
+        sys.exit(1 if run_benchmark(synthetic_tickets(args.count, args.seed)) else 0)
+    
+    if args.stream:
+        run_stream(args.file, args.output, args.workers, args.chunk_size, args.format, args.text_field, args.id_field)
+        return
+    
     if not args.text and not args.file:
         parser.print_help()
         sys.exit(1)
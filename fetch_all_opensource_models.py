@@ -3,11 +3,11 @@
 Fetch ALL open-source models with ALL datasets from artificialanalysis.ai API
 Filters out closed models like Grok 2, 3
 """
-import requests
 import json
 import csv
 import time
 from typing import Dict, List, Optional, Set
+import fetch_engine
 
 API_KEY = "aa_YLuwDNXOuuOLlROWDUAppHESYUYNQAwP"
 BASE_URL = "https://artificialanalysis.ai/api/v2"
@@ -113,7 +113,7 @@ def fetch_all_models() -> Optional[List[Dict]]:
     
     try:
         print(f"Fetching open-source models from {endpoint}...")
-        response = requests.get(endpoint, headers=headers, timeout=60)
+        response = fetch_engine.get(endpoint, headers=headers, timeout=60)
         
         if response.status_code == 200:
             data = response.json()
@@ -312,5 +312,8 @@ def main():
     print(f"JSON file: opensource_all_benchmarks_data.json")
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        fetch_engine.close_default_engine()
 
@@ -3,12 +3,12 @@
 Fetch all models and their benchmark scores from artificialanalysis.ai API
 and export to CSV format
 """
-import requests
 import json
 import csv
-import time
 from typing import Dict, List, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import fetch_engine
+from fetch_engine import FetchEngine
 
 API_KEY = "aa_OXmwOTJvjVHpPnJQsOgimbFMwsPoVgOT"
 BASE_URL = "https://api.artificialanalysis.ai"
@@ -51,7 +51,7 @@ def fetch_all_models() -> Optional[List[Dict]]:
     for endpoint in endpoints:
         try:
             print(f"Trying endpoint: {endpoint}")
-            response = requests.get(endpoint, headers=headers, timeout=30)
+            response = fetch_engine.get(endpoint, headers=headers, timeout=30)
             print(f"Status: {response.status_code}")
             
             if response.status_code == 200:
@@ -75,6 +75,10 @@ def fetch_all_models() -> Optional[List[Dict]]:
 
 def fetch_model_evaluations(model_id: str) -> Optional[Dict]:
     """Fetch evaluations/benchmarks for a specific model"""
+    return fetch_engine.run(fetch_model_evaluations_async(fetch_engine.default_engine(), model_id))
+
+async def fetch_model_evaluations_async(engine: FetchEngine, model_id: str) -> Optional[Dict]:
+    """fetch_model_evaluations on the shared fetch engine"""
     headers = get_headers()
     
     endpoints = [
@@ -87,7 +91,7 @@ def fetch_model_evaluations(model_id: str) -> Optional[Dict]:
     
     for endpoint in endpoints:
         try:
-            response = requests.get(endpoint, headers=headers, timeout=10)
+            response = await engine.get(endpoint, headers=headers, timeout=10)
             if response.status_code == 200:
                 return response.json()
         except:
@@ -174,7 +178,7 @@ def fetch_all_benchmarks_batch() -> Optional[Dict]:
     for endpoint in endpoints:
         try:
             print(f"Trying batch endpoint: {endpoint}")
-            response = requests.get(endpoint, headers=headers, timeout=30)
+            response = fetch_engine.get(endpoint, headers=headers, timeout=30)
             print(f"Status: {response.status_code}")
             
             if response.status_code == 200:
@@ -185,8 +189,17 @@ def fetch_all_benchmarks_batch() -> Optional[Dict]:
     
     return None
 
-def process_models_with_scores(models: List[Dict], max_workers: int = 5) -> List[Dict]:
-    """Fetch scores for all models"""
+def model_api_id(model: Dict) -> str:
+    """API id of a model entry"""
+    return model.get("id") or model.get("model_id") or model.get("name", "").lower().replace(" ", "-")
+
+def process_models_with_scores(models: List[Dict], max_workers: Optional[int] = None) -> List[Dict]:
+    """Fetch scores for all models
+
+    Requests go through the shared fetch engine, so the API rate limit sets how
+    long the refresh takes and the engine adapts its concurrency to the API's
+    responses; max_workers optionally caps the models fetched at once.
+    """
     print(f"\nFetching benchmark scores for {len(models)} models...")
     print("This may take several minutes...\n")
     
@@ -200,39 +213,31 @@ def process_models_with_scores(models: List[Dict], max_workers: int = 5) -> List
     
     print("Batch fetch not available. Fetching individual model scores...")
     
-    results = []
     successful = 0
     failed = 0
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_model = {
-            executor.submit(fetch_model_evaluations, model.get("id") or model.get("model_id") or model.get("name", "").lower().replace(" ", "-")): model
-            for model in models
-        }
-        
-        for future in as_completed(future_to_model):
-            model = future_to_model[future]
-            try:
-                eval_data = future.result()
-                scores = extract_benchmark_scores(eval_data)
-                
-                if scores:
-                    model["scores"] = scores
-                    successful += 1
-                    if successful % 10 == 0:
-                        print(f"  ✓ Fetched {successful} models...")
-                else:
-                    failed += 1
-            except Exception as e:
-                failed += 1
-            
-            results.append(model)
-            time.sleep(0.2)  # Rate limiting
+    def on_result(model, eval_data):
+        nonlocal successful, failed
+        try:
+            scores = extract_benchmark_scores(eval_data) if not isinstance(eval_data, Exception) else {}
+        except Exception:
+            scores = {}
+        if scores:
+            model["scores"] = scores
+            successful += 1
+            if successful % 10 == 0:
+                print(f"  ✓ Fetched {successful} models...")
+        else:
+            failed += 1
+    
+    fetch_engine.run_all(lambda engine, model: fetch_model_evaluations_async(engine, model_api_id(model)),
+                         models, limit=max_workers, on_result=on_result)
     
     print(f"\n✓ Successfully fetched scores for {successful} models")
     print(f"⚠ Could not fetch scores for {failed} models")
+    print(f"  Fetch engine: {fetch_engine.default_engine().stats()}")
     
-    return results
+    return models
 
 def process_batch_data(models: List[Dict], batch_data: Dict) -> List[Dict]:
     """Process batch response"""
@@ -356,7 +361,10 @@ def main():
     print(f"✓ JSON file: evaluations_data.json")
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        fetch_engine.close_default_engine()
 
 
 
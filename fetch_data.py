@@ -2,9 +2,9 @@
 """
 Script to fetch intelligence evaluation data from artificialanalysis.ai API
 """
-import requests
 import json
 from typing import Dict, List, Any
+import fetch_engine
 
 API_KEY = "aa_OXmwOTJvjVHpPnJQsOgimbFMwsPoVgOT"
 BASE_URL = "https://api.artificialanalysis.ai"
@@ -17,7 +17,7 @@ def fetch_models():
     }
     
     try:
-        response = requests.get(f"{BASE_URL}/v1/models", headers=headers)
+        response = fetch_engine.get(f"{BASE_URL}/v1/models", headers=headers)
         response.raise_for_status()
         return response.json()
     except Exception as e:
@@ -32,7 +32,7 @@ def fetch_model_evaluations(model_id: str):
     }
     
     try:
-        response = requests.get(f"{BASE_URL}/v1/models/{model_id}/evaluations", headers=headers)
+        response = fetch_engine.get(f"{BASE_URL}/v1/models/{model_id}/evaluations", headers=headers)
         response.raise_for_status()
         return response.json()
     except Exception as e:
@@ -57,7 +57,7 @@ def fetch_all_evaluations():
         
         for endpoint in endpoints:
             try:
-                response = requests.get(f"{BASE_URL}{endpoint}", headers=headers)
+                response = fetch_engine.get(f"{BASE_URL}{endpoint}", headers=headers)
                 if response.status_code == 200:
                     return response.json()
             except:
@@ -99,7 +99,10 @@ def main():
                 json.dump(models, f, indent=2)
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        fetch_engine.close_default_engine()
 
 
 
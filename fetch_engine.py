@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+"""
+Shared asyncio fetch engine for the artificialanalysis.ai fetch_* scripts
+Every API request goes through one FetchEngine per process:
+
+- a token bucket paces requests to the API rate limit (FETCH_RATE_LIMIT
+  requests per second, bursts of up to FETCH_RATE_BURST), so a full-catalog
+  refresh takes as long as the rate limit requires and no longer;
+- an AIMD controller sets how many requests are in flight: starting at
+  FETCH_INITIAL_CONCURRENCY it grows by one per window of healthy responses
+  up to FETCH_CONCURRENCY, and halves on 429/5xx, timeouts or latency rising
+  to twice its baseline, so throughput settles at what the API allows;
+- every request has a deadline (FETCH_TIMEOUT seconds unless the caller
+  passes its own), raised as requests.exceptions.Timeout;
+- 429/5xx responses, timeouts and connection errors are retried (GETs are
+  idempotent) up to FETCH_RETRIES times with full-jitter exponential
+  backoff; a Retry-After header holds back every request of the engine for
+  that long (longer than FETCH_MAX_RETRY_AFTER: no retry, the response is
+  returned);
+- the process-wide engine answers from the on-disk HTTP cache (http_cache.py)
+  when it can: fresh entries need no request at all, stale ones are
+  revalidated with a conditional GET.
+
+Requests are made with requests (no extra dependency) on the engine's own
+thread pool; scheduling, pacing and deadlines are asyncio. Scripts with one
+request call get(); per-model fan-outs write an async fetcher taking the
+engine and hand it to run_all(). Scripts call close_default_engine() when
+they are done fetching.
+
+engine.stats() exposes the counters: requests, retries, timeouts, errors,
+responses per status, limit increases/decreases, the current concurrency
+limit, latency and time spent waiting for tokens and Retry-After.
+
+Usage:
+    # Engine vs the old thread pool + sleep loop against a local test server
+    python3 fetch_engine.py --benchmark
+    python3 fetch_engine.py --benchmark --count 200 --latency 0.3 --rate 20
+
+    # ... against a server that answers 429 above 3 concurrent requests
+    python3 fetch_engine.py --benchmark --rate 50 --capacity 3
+"""
+import asyncio
+import email.utils
+import functools
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import weakref
+import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import requests
+
+from http_cache import HTTPCache, cache_enabled
+
+RATE_LIMIT = float(os.environ.get('FETCH_RATE_LIMIT', 5))  # requests per second
+RATE_BURST = float(os.environ.get('FETCH_RATE_BURST', 5))
+CONCURRENCY = int(os.environ.get('FETCH_CONCURRENCY', 8))  # most requests in flight
+INITIAL_CONCURRENCY = int(os.environ.get('FETCH_INITIAL_CONCURRENCY', 2))
+TIMEOUT = float(os.environ.get('FETCH_TIMEOUT', 30))  # seconds per request
+RETRIES = int(os.environ.get('FETCH_RETRIES', 3))
+MAX_RETRY_AFTER = float(os.environ.get('FETCH_MAX_RETRY_AFTER', 120))  # seconds
+BACKOFF_BASE = 0.5  # seconds; attempt n waits up to BACKOFF_BASE * 2**n (full jitter)
+BACKOFF_CAP = 30.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Threads per concurrency slot: a timed-out request's thread keeps running until
+# requests gives up on its own, so the pool keeps spares for new requests
+EXECUTOR_THREADS_PER_SLOT = 3
+
+_default_engine = None
+_default_engine_lock = threading.Lock()
+
+class TokenBucket:
+    """rate tokens per second, at most capacity banked for bursts"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = max(1.0, capacity if capacity is not None else rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens now, going into debt if the bucket is short; seconds to wait before using them
+
+        Reservations are served in call order, so waiters never starve each other.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited += delay
+            return delay
+
+    async def acquire(self, tokens: float = 1.0):
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+class AIMDController:
+    """Concurrency limit with additive increase and multiplicative decrease
+
+    Each healthy response adds 1/limit while the limit is in use (one step per
+    window of responses); an overload signal multiplies it by decrease_factor,
+    at most once per latency period so one burst of 429s counts once.
+    Latency above latency_tolerance x its baseline (and at least
+    MIN_LATENCY_RISE above it) is an overload signal too.
+    """
+
+    LATENCY_ALPHA = 0.3  # weight of the newest latency in the moving average
+    BASELINE_DRIFT = 0.01  # per response, so the baseline follows lasting latency changes
+    MIN_LATENCY_RISE = 0.05  # seconds; jitter on fast responses is not congestion
+
+    def __init__(self, max_limit: int, min_limit: int = 1, initial: Optional[int] = None,
+                 decrease_factor: float = 0.5, latency_tolerance: float = 2.0, clock: Callable[[], float] = time.monotonic):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = float(min(self.max_limit, max(self.min_limit, initial or INITIAL_CONCURRENCY)))
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self._clock = clock
+        self.in_flight = 0
+        self.latency = None  # moving average, seconds
+        self.baseline = None
+        self.increases = 0
+        self.decreases = 0
+        self._last_decrease = -math.inf
+        self._conditions = weakref.WeakKeyDictionary()  # event loop -> condition (asyncio primitives are per loop)
+
+    @property
+    def current(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    def _condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        condition = self._conditions.get(loop)
+        if condition is None:
+            condition = self._conditions[loop] = asyncio.Condition()
+        return condition
+
+    async def acquire(self):
+        condition = self._condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < self.current)
+            self.in_flight += 1
+
+    async def release(self):
+        condition = self._condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+    def on_success(self, latency: float):
+        """A healthy response took latency seconds"""
+        self.latency = latency if self.latency is None else (
+            self.LATENCY_ALPHA * latency + (1 - self.LATENCY_ALPHA) * self.latency)
+        self.baseline = self.latency if self.baseline is None else min(
+            self.baseline * (1 + self.BASELINE_DRIFT), self.latency)
+        if self.latency > max(self.latency_tolerance * self.baseline, self.baseline + self.MIN_LATENCY_RISE):
+            self.on_overload()
+        elif self.in_flight >= self.current and self.limit < self.max_limit:
+            before = self.current
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.increases += self.current > before
+
+    def on_overload(self):
+        """429/5xx, a timeout or rising latency"""
+        now = self._clock()
+        if now - self._last_decrease < (self.latency or 0.0):
+            return
+        self._last_decrease = now
+        if self.limit > self.min_limit:
+            self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+            self.decreases += 1
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class FetchEngine:
+    """Rate-limited GETs under an adaptive concurrency limit, with deadlines and retries"""
+
+    def __init__(self, rate_limit: float = RATE_LIMIT, burst: float = RATE_BURST,
+                 concurrency: int = CONCURRENCY, timeout: float = TIMEOUT,
+                 session: Optional[requests.Session] = None, cache: Optional[HTTPCache] = None,
+                 initial_concurrency: Optional[int] = None, retries: int = RETRIES,
+                 max_retry_after: float = MAX_RETRY_AFTER):
+        self.bucket = TokenBucket(rate_limit, burst)
+        self.controller = AIMDController(concurrency, initial=initial_concurrency)
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.max_retry_after = max_retry_after
+        self._owns_session = session is None
+        self.session = session or requests.Session()
+        self.cache = cache
+        # Never more than concurrency requests are sent at once; the extra threads are for
+        # abandoned ones, so a deadline is not spent queueing behind earlier timeouts
+        self._executor = ThreadPoolExecutor(max_workers=concurrency * EXECUTOR_THREADS_PER_SLOT,
+                                            thread_name_prefix='fetch')
+        self._paused_until = 0.0  # monotonic time before which no request starts (Retry-After)
+        self._random = random.Random()
+        self._counts = Counter()
+
+    async def get(self, url: str, headers: Optional[Dict] = None, timeout: Optional[float] = None,
+                  cache: bool = True, **kwargs) -> requests.Response:
+        """GET url once a slot and a rate token are free; raises requests exceptions like requests.get
+
+        With an HTTP cache (and cache=True), fresh entries are returned without a
+        request and stale ones are sent as conditional requests.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        cache = self.cache if cache else None
+        entry = None
+        if cache is not None:
+            url = requests.Request('GET', url, params=kwargs.pop('params', None)).prepare().url
+            entry = cache.lookup(url)
+            if entry is not None:
+                if cache.is_fresh(entry):
+                    response = cache.response(entry)
+                    if response is not None:
+                        self._counts['cache_hits'] += 1
+                        return response
+                    entry = None
+                else:
+                    headers = {**(headers or {}), **cache.validators(entry)}
+
+        response = await self._get_with_retries(url, headers, timeout, kwargs)
+        if cache is not None:
+            if response.status_code == 304 and entry is not None:
+                cached = cache.response(entry)
+                if cached is not None:
+                    cache.refresh(entry, response)
+                    self._counts['cache_revalidated'] += 1
+                    return cached
+                # Body lost since the lookup: fetch it again unconditionally
+                headers = {k: v for k, v in headers.items() if k not in ('If-None-Match', 'If-Modified-Since')}
+                response = await self.get(url, headers=headers, timeout=timeout, cache=False, **kwargs)
+            if cache.store(url, response):
+                self._counts['cache_stores'] += 1
+        return response
+
+    async def _get_with_retries(self, url: str, headers: Optional[Dict], timeout: float, kwargs: Dict) -> requests.Response:
+        """_send, retrying 429/5xx, timeouts and connection errors with jittered backoff and Retry-After"""
+        for attempt in range(self.retries + 1):
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            try:
+                response = await self._send(url, headers, timeout, kwargs)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+                if attempt == self.retries:
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+                delay = self._backoff(attempt)
+                retry_after = retry_after_seconds(response.headers.get('Retry-After'))
+                if retry_after is not None:
+                    if retry_after > self.max_retry_after:
+                        return response
+                    # The server asked every client request to hold off, not just this one
+                    self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+                    self._counts['retry_after_s'] += retry_after
+                    delay = max(delay, retry_after)
+            self._counts['retries'] += 1
+            await asyncio.sleep(delay)
+
+    def _backoff(self, attempt: int) -> float:
+        return self._random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+    async def _send(self, url: str, headers: Optional[Dict], timeout: float, kwargs: Dict) -> requests.Response:
+        """One GET under the concurrency limit and the rate limit; its outcome feeds the AIMD controller"""
+        await self.controller.acquire()
+        try:
+            await self.bucket.acquire()
+            call = functools.partial(self.session.get, url, headers=headers, timeout=timeout, **kwargs)
+            self._counts['requests'] += 1
+            start = time.monotonic()
+            try:
+                # requests' timeout bounds each socket wait; wait_for bounds the whole response
+                response = await asyncio.wait_for(asyncio.get_running_loop().run_in_executor(self._executor, call), timeout)
+            except asyncio.TimeoutError:
+                self._counts['timeouts'] += 1
+                self.controller.on_overload()
+                raise requests.exceptions.Timeout(f"No complete response from {url} within {timeout:g}s")
+            except requests.exceptions.Timeout:
+                self._counts['timeouts'] += 1
+                self.controller.on_overload()
+                raise
+            except Exception:
+                self._counts['errors'] += 1
+                raise
+            self._counts[f'status_{response.status_code}'] += 1
+            if response.status_code in RETRY_STATUSES:
+                self.controller.on_overload()
+            else:
+                self.controller.on_success(time.monotonic() - start)
+            return response
+        finally:
+            await self.controller.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Request, retry, timeout, error, per-status, cache and concurrency counters of this engine"""
+        controller = self.controller
+        stats = dict(self._counts, rate_wait_s=round(self.bucket.waited, 3),
+                     concurrency_limit=controller.current, limit_increases=controller.increases,
+                     limit_decreases=controller.decreases)
+        if 'retry_after_s' in stats:
+            stats['retry_after_s'] = round(stats['retry_after_s'], 3)
+        if controller.latency is not None:
+            stats['latency_ms'] = round(1000 * controller.latency, 1)
+        return stats
+
+    def close(self):
+        """Release the thread pool (and the session unless the caller passed it in)
+
+        Requests still running after a timeout finish in the background; the
+        engine cannot send requests afterwards.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def default_engine() -> FetchEngine:
+    """The process-wide engine, so every script in a process shares one rate limit"""
+    global _default_engine
+    with _default_engine_lock:
+        if _default_engine is None:
+            _default_engine = FetchEngine(cache=HTTPCache() if cache_enabled() else None)
+        return _default_engine
+
+def close_default_engine():
+    """Close the process-wide engine, if one was made; the next default_engine() makes a new one"""
+    global _default_engine
+    with _default_engine_lock:
+        engine, _default_engine = _default_engine, None
+    if engine is not None:
+        engine.close()
+
+def get(url: str, headers: Optional[Dict] = None, timeout: Optional[float] = None,
+        engine: Optional[FetchEngine] = None, **kwargs) -> requests.Response:
+    """Blocking GET through the engine (drop-in for requests.get in the fetch scripts)"""
+    engine = engine or default_engine()
+    return asyncio.run(engine.get(url, headers=headers, timeout=timeout, **kwargs))
+
+def run(coro: Awaitable) -> Any:
+    """Run one async fetcher to completion from synchronous code"""
+    return asyncio.run(coro)
+
+def run_all(func: Callable[[FetchEngine, Any], Awaitable], items: Iterable, engine: Optional[FetchEngine] = None,
+            limit: Optional[int] = None, on_result: Optional[Callable[[Any, Any], None]] = None) -> List:
+    """func(engine, item) for every item on one event loop, in item order
+
+    An item whose fetcher raises gets the exception as its result. limit caps
+    how many items are in progress at once (below the engine's concurrency);
+    on_result(item, result) is called as each item finishes, for progress output.
+    """
+    engine = engine or default_engine()
+    items = list(items)
+
+    async def run_items():
+        semaphore = asyncio.Semaphore(limit) if limit else None
+
+        async def run_item(item):
+            try:
+                if semaphore is None:
+                    result = await func(engine, item)
+                else:
+                    async with semaphore:
+                        result = await func(engine, item)
+            except Exception as e:
+                result = e
+            if on_result is not None:
+                on_result(item, result)
+            return result
+
+        return await asyncio.gather(*(run_item(item) for item in items))
+
+    return asyncio.run(run_items())
+
+def _start_test_server(latency: float, etag: Optional[str] = None, missing: Optional[Callable[[str], bool]] = None,
+                       capacity: Optional[int] = None, retry_after: Optional[str] = None):
+    """Local JSON server answering every GET after latency seconds; returns (server, base url)
+
+    With etag, responses carry it and a matching If-None-Match gets a 304;
+    paths for which missing(path) is true get a 404. With capacity, requests
+    beyond that many in flight get a 429 (with retry_after as Retry-After).
+    server.requests lists the (path, If-None-Match) of every request and
+    server.max_in_flight the most requests it served at once.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    lock = threading.Lock()
+    in_flight = [0]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                server.requests.append((self.path, self.headers.get('If-None-Match')))
+                in_flight[0] += 1
+                throttled = capacity is not None and in_flight[0] > capacity
+                if not throttled:
+                    server.max_in_flight = max(server.max_in_flight, in_flight[0])
+            try:
+                self._respond(throttled)
+            finally:
+                with lock:
+                    in_flight[0] -= 1
+
+        def _respond(self, throttled: bool):
+            if throttled:
+                self.send_response(429)
+                if retry_after is not None:
+                    self.send_header('Retry-After', retry_after)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            time.sleep(latency)
+            if missing is not None and missing(self.path):
+                self.send_error(404)
+                return
+            if etag is not None and self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            body = json.dumps({'path': self.path}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            if etag is not None:
+                self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the client gave up (deadline tests)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.requests = []
+    server.max_in_flight = 0
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def run_benchmark(count: int, latency: float, rate: float, concurrency: int = CONCURRENCY,
+                  capacity: Optional[int] = None) -> Dict[str, Any]:
+    """Seconds to fetch count URLs with the old pool + sleep loop and with the engine at rate requests/s
+
+    With capacity, the test server answers 429 above that many concurrent requests.
+    """
+    server, base_url = _start_test_server(latency, capacity=capacity)
+    urls = [f"{base_url}/v1/models/model-{i}/evaluations" for i in range(count)]
+    try:
+        # fetch_and_export_csv before the engine: 5 workers, sleep(0.2) per completed model
+        start = time.perf_counter()
+        with requests.Session() as session, ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [executor.submit(session.get, url, timeout=TIMEOUT) for url in urls]
+            sleep_loop_ok = 0
+            for future in as_completed(futures):
+                sleep_loop_ok += future.result().status_code == 200
+                time.sleep(0.2)
+        sleep_loop_s = time.perf_counter() - start
+
+        async def fetch(engine, url):
+            return (await engine.get(url)).status_code
+
+        with FetchEngine(rate_limit=rate, burst=1, concurrency=concurrency) as engine:
+            start = time.perf_counter()
+            statuses = run_all(fetch, urls, engine=engine)
+            engine_s = time.perf_counter() - start
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    return {'sleep_loop_s': sleep_loop_s, 'sleep_loop_ok': sleep_loop_ok, 'engine_s': engine_s,
+            'rate_bound_s': (count - 1) / rate, 'ok': sum(status == 200 for status in statuses),
+            'stats': engine.stats(), 'server_max_in_flight': server.max_in_flight}
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the shared fetch engine against the fixed-sleep fetch loop',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 fetch_engine.py --benchmark
+  python3 fetch_engine.py --benchmark --count 200 --latency 0.3 --rate 20
+  python3 fetch_engine.py --benchmark --rate 50 --capacity 3
+  FETCH_RATE_LIMIT=2 FETCH_CONCURRENCY=4 python3 fetch_real_scores.py
+        """
+    )
+    parser.add_argument('--benchmark', action='store_true', help='Time both loops on a local test server')
+    parser.add_argument('--count', type=int, default=100, help='Requests (models) to fetch (default: 100)')
+    parser.add_argument('--latency', type=float, default=0.2, help='Server latency per request in seconds (default: 0.2)')
+    parser.add_argument('--rate', type=float, default=RATE_LIMIT, help=f'Engine rate limit, requests/s (default: {RATE_LIMIT:g})')
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY, help=f'Engine maximum requests in flight (default: {CONCURRENCY})')
+    parser.add_argument('--capacity', type=int, help='Server answers 429 above this many concurrent requests (default: unlimited)')
+
+    args = parser.parse_args()
+    if not args.benchmark:
+        parser.print_help()
+        sys.exit(1)
+
+    print("=" * 60)
+    capacity = f", 429 above {args.capacity} in flight" if args.capacity else ''
+    print(f"Fetching {args.count} URLs ({1000 * args.latency:.0f} ms latency, limit {args.rate:g} req/s{capacity})")
+    print("=" * 60)
+    result = run_benchmark(args.count, args.latency, args.rate, args.concurrency, args.capacity)
+    print(f"\n  {'':<26s} {'time':>9s} {'OK':>9s}")
+    print(f"  {'pool + sleep(0.2) loop':<26s} {result['sleep_loop_s']:8.2f}s {result['sleep_loop_ok']:>9d}")
+    print(f"  {'fetch engine':<26s} {result['engine_s']:8.2f}s {result['ok']:>9d}")
+    print(f"  {'rate limit lower bound':<26s} {result['rate_bound_s']:8.2f}s")
+    print(f"\n  Engine counters: {result['stats']}")
+    print(f"  Server max in flight: {result['server_max_in_flight']}")
+    sys.exit(0 if result['ok'] == args.count else 1)
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,11 @@
 """
 Fetch latency and performance metrics (TTFT, ITL, E2E, Throughput) from artificialanalysis.ai API
 """
-import requests
 import json
 import csv
 import time
 from typing import Dict, List, Optional
+import fetch_engine
 
 API_KEY = "aa_HrMuMHsMjZnPBAmrQfNiaeiyHPyYjwaH"
 BASE_URL = "https://artificialanalysis.ai/api/v2"
@@ -27,7 +27,7 @@ def fetch_all_models() -> Optional[List[Dict]]:
     print(f"Fetching models from {endpoint}...")
     
     try:
-        response = requests.get(endpoint, headers=headers, timeout=30)
+        response = fetch_engine.get(endpoint, headers=headers, timeout=30)
         if response.status_code == 200:
             data = response.json()
             
@@ -275,5 +275,8 @@ def main():
         print("   This may require checking the API documentation for the correct field names")
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        fetch_engine.close_default_engine()
 
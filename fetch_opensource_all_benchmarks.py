@@ -3,11 +3,13 @@
 Fetch ALL open-source models with ALL datasets from artificialanalysis.ai API
 Creates opensource_all_benchmarks.csv with all models vs all datasets
 """
-import requests
 import json
 import csv
+import os
 import time
 from typing import Dict, List, Optional, Set
+from benchmark_snapshot import write_snapshot_from_csv
+import fetch_engine
 
 API_KEY = "aa_eSQbIHGJXFMwbTklKCIrIJvMcGdEBrpB"
 BASE_URL = "https://artificialanalysis.ai/api/v2"
@@ -133,7 +135,7 @@ def fetch_all_models() -> Optional[List[Dict]]:
     
     try:
         print(f"Fetching open-source models from {endpoint}...")
-        response = requests.get(endpoint, headers=headers, timeout=60)
+        response = fetch_engine.get(endpoint, headers=headers, timeout=60)
         
         if response.status_code == 200:
             data = response.json()
@@ -297,6 +299,12 @@ def export_to_csv(models: List[Dict], filename: str = "opensource_all_benchmarks
     print(f"✓ Exported {len(models)} open-source models to {filename}")
     print(f"✓ Included {len(benchmark_columns)} benchmarks")
     
+    # Binary snapshot alongside the CSV (memory-mapped by the ranking scripts).
+    # Built from the CSV just written so both hold the same rounded percentages.
+    snapshot_file = os.path.splitext(filename)[0] + ".snapshot"
+    write_snapshot_from_csv(filename, snapshot_file)
+    print(f"✓ Wrote binary snapshot {snapshot_file}")
+    
     return benchmark_columns
 
 def main():
@@ -348,5 +356,8 @@ def main():
     print("=" * 70)
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        fetch_engine.close_default_engine()
 
@@ -4,10 +4,10 @@ Fetch ONLY open-source models with the 10 specific benchmarks:
 MMLU-Pro, GPQA Diamond, Humanity's Last Exam, LiveCodeBench, SciCode, 
 AIME 2025, IFBench, AA-LCR, Terminal-Bench Hard, τ²-Bench Telecom
 """
-import requests
 import json
 import csv
 from typing import Dict, List, Optional
+import fetch_engine
 
 API_KEY = "aa_OXmwOTJvjVHpPnJQsOgimbFMwsPoVgOT"
 BASE_URL = "https://artificialanalysis.ai/api/v2"
@@ -65,7 +65,7 @@ def fetch_all_models() -> Optional[List[Dict]]:
     
     try:
         print(f"Fetching models from {endpoint}...")
-        response = requests.get(endpoint, headers=headers, timeout=30)
+        response = fetch_engine.get(endpoint, headers=headers, timeout=30)
         
         if response.status_code == 200:
             data = response.json()
@@ -235,7 +235,10 @@ def main():
     print(f"JSON file: opensource_evaluations_data.json")
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        fetch_engine.close_default_engine()
 
 
 
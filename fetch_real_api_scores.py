@@ -3,12 +3,13 @@
 Fetch REAL benchmark scores from artificialanalysis.ai API
 Based on the actual website data showing MMLU-Pro and AA-LCR scores
 """
-import requests
 import json
 import csv
-import time
 from typing import Dict, List, Optional
 
+import fetch_engine
+from fetch_engine import FetchEngine
+
 API_KEY = "aa_OXmwOTJvjVHpPnJQsOgimbFMwsPoVgOT"
 BASE_URL = "https://api.artificialanalysis.ai"
 
@@ -40,6 +41,10 @@ def get_headers():
 
 def fetch_model_details(model_name: str) -> Optional[Dict]:
     """Fetch detailed model information including all benchmark scores"""
+    return fetch_engine.run(fetch_model_details_async(fetch_engine.default_engine(), model_name))
+
+async def fetch_model_details_async(engine: FetchEngine, model_name: str) -> Optional[Dict]:
+    """fetch_model_details on the shared fetch engine"""
     headers = get_headers()
     
     # Try different endpoint patterns
@@ -56,7 +61,7 @@ def fetch_model_details(model_name: str) -> Optional[Dict]:
     
     for endpoint in endpoints:
         try:
-            response = requests.get(endpoint, headers=headers, timeout=10)
+            response = await engine.get(endpoint, headers=headers, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 return extract_all_scores(data)
@@ -238,7 +243,11 @@ def update_models_with_real_scores(models: List[Dict]) -> List[Dict]:
     
     updated_count = 0
     
-    for model in models:
+    # API fetches for all models run concurrently, paced by the shared fetch engine
+    all_api_scores = fetch_engine.run_all(lambda engine, model: fetch_model_details_async(engine, model.get("name", "")),
+                                          models)
+    
+    for model, api_scores in zip(models, all_api_scores):
         model_name = model.get("name", "")
         
         # Check if we have real scores for this model
@@ -249,17 +258,14 @@ def update_models_with_real_scores(models: List[Dict]) -> List[Dict]:
             updated_count += 1
             print(f"  ✓ Updated {model_name}")
         
-        # Also try API fetch
-        api_scores = fetch_model_details(model_name)
-        if api_scores:
+        # Also use the API fetch
+        if api_scores and not isinstance(api_scores, Exception):
             if not model.get("scores"):
                 model["scores"] = {}
             model["scores"].update(api_scores)
             if model_name not in REAL_SCORES_FROM_WEBSITE:
                 updated_count += 1
                 print(f"  ✓ Fetched from API: {model_name}")
-        
-        time.sleep(0.1)  # Rate limiting
     
     print(f"\n✓ Updated {updated_count} models with real scores")
     return models
@@ -338,5 +344,8 @@ def main():
                 print(f"  AA-LCR: {scores['aa-lcr']*100:.1f}%")
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        fetch_engine.close_default_engine()
 
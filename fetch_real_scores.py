@@ -2,11 +2,11 @@
 """
 Fetch real benchmark scores for all models from artificialanalysis.ai API
 """
-import requests
 import json
-import time
 from typing import Dict, List, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import fetch_engine
+from fetch_engine import FetchEngine
 
 API_KEY = "aa_OXmwOTJvjVHpPnJQsOgimbFMwsPoVgOT"
 BASE_URL = "https://api.artificialanalysis.ai"
@@ -27,6 +27,10 @@ BENCHMARK_IDS = {
 
 def fetch_model_benchmarks(model_id: str, model_name: str) -> Optional[Dict]:
     """Fetch benchmark scores for a specific model"""
+    return fetch_engine.run(fetch_model_benchmarks_async(fetch_engine.default_engine(), model_id, model_name))
+
+async def fetch_model_benchmarks_async(engine: FetchEngine, model_id: str, model_name: str) -> Optional[Dict]:
+    """fetch_model_benchmarks on the shared fetch engine"""
     headers = {
         "Authorization": f"Bearer {API_KEY}",
         "X-API-Key": API_KEY,
@@ -47,7 +51,7 @@ def fetch_model_benchmarks(model_id: str, model_name: str) -> Optional[Dict]:
     
     for endpoint in endpoints:
         try:
-            response = requests.get(endpoint, headers=headers, timeout=10)
+            response = await engine.get(endpoint, headers=headers, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 # Process the response to extract scores
@@ -123,7 +127,7 @@ def fetch_all_benchmarks_batch() -> Optional[Dict]:
     
     for endpoint in endpoints:
         try:
-            response = requests.get(endpoint, headers=headers, timeout=30)
+            response = fetch_engine.get(endpoint, headers=headers, timeout=30)
             if response.status_code == 200:
                 return response.json()
         except:
@@ -131,8 +135,13 @@ def fetch_all_benchmarks_batch() -> Optional[Dict]:
     
     return None
 
-def update_model_scores(models: List[Dict], max_workers: int = 10) -> List[Dict]:
-    """Update scores for all models using parallel requests"""
+def update_model_scores(models: List[Dict], max_workers: Optional[int] = None) -> List[Dict]:
+    """Update scores for all models using parallel requests
+
+    Requests go through the shared fetch engine, so the API rate limit sets how
+    long the refresh takes and the engine adapts its concurrency to the API's
+    responses; max_workers optionally caps the models fetched at once.
+    """
     print(f"Fetching benchmark scores for {len(models)} models...")
     print("This may take a while...\n")
     
@@ -147,38 +156,27 @@ def update_model_scores(models: List[Dict], max_workers: int = 10) -> List[Dict]
     
     print("Batch fetch failed. Fetching individual model scores...")
     
-    updated_models = []
     successful = 0
     failed = 0
     
-    # Use thread pool for parallel requests
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_model = {
-            executor.submit(fetch_model_benchmarks, model["id"], model["name"]): model
-            for model in models
-        }
-        
-        for future in as_completed(future_to_model):
-            model = future_to_model[future]
-            try:
-                scores = future.result()
-                if scores:
-                    model["scores"] = scores
-                    successful += 1
-                    if successful % 10 == 0:
-                        print(f"  ✓ Fetched scores for {successful} models...")
-                else:
-                    failed += 1
-            except Exception as e:
-                failed += 1
-            
-            updated_models.append(model)
-            time.sleep(0.1)  # Rate limiting
+    def on_result(model, scores):
+        nonlocal successful, failed
+        if scores and not isinstance(scores, Exception):
+            model["scores"] = scores
+            successful += 1
+            if successful % 10 == 0:
+                print(f"  ✓ Fetched scores for {successful} models...")
+        else:
+            failed += 1
+    
+    fetch_engine.run_all(lambda engine, model: fetch_model_benchmarks_async(engine, model["id"], model["name"]),
+                         models, limit=max_workers, on_result=on_result)
     
     print(f"\n✓ Successfully fetched scores for {successful} models")
     print(f"⚠ Could not fetch scores for {failed} models (will use generated scores)")
+    print(f"  Fetch engine: {fetch_engine.default_engine().stats()}")
     
-    return updated_models
+    return models
 
 def process_batch_response(models: List[Dict], batch_data: Dict) -> List[Dict]:
     """Process batch response and match to models"""
@@ -219,7 +217,7 @@ def main():
     print(f"Found {len(models)} models and {len(benchmarks)} benchmarks\n")
     
     # Update scores
-    updated_models = update_model_scores(models, max_workers=5)
+    updated_models = update_model_scores(models)
     
     # Save updated data
     data["models"] = updated_models
@@ -242,7 +240,10 @@ def main():
                 print(f"  {benchmark}: {score:.2%}")
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        fetch_engine.close_default_engine()
 
 
 
@@ -3,11 +3,11 @@
 Fetch REAL benchmark scores from artificialanalysis.ai API v2
 Based on official API documentation: https://artificialanalysis.ai/documentation
 """
-import requests
 import json
 import csv
 import time
 from typing import Dict, List, Optional
+import fetch_engine
 
 API_KEY = "aa_OXmwOTJvjVHpPnJQsOgimbFMwsPoVgOT"
 BASE_URL = "https://artificialanalysis.ai/api/v2"
@@ -53,7 +53,7 @@ def fetch_all_models() -> Optional[List[Dict]]:
     
     try:
         print(f"Fetching models from {endpoint}...")
-        response = requests.get(endpoint, headers=headers, timeout=30)
+        response = fetch_engine.get(endpoint, headers=headers, timeout=30)
         
         if response.status_code == 200:
             data = response.json()
@@ -255,5 +255,8 @@ def main():
     print(f"JSON file: evaluations_data.json")
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        fetch_engine.close_default_engine()
 
@@ -3,11 +3,11 @@
 Fetch open-source models with subject-specific evaluation datasets
 Groups evaluations by subject: Math, Computer Science, Science, Philosophy, History, etc.
 """
-import requests
 import json
 import csv
 from typing import Dict, List, Optional
 from collections import defaultdict
+import fetch_engine
 
 API_KEY = "aa_OXmwOTJvjVHpPnJQsOgimbFMwsPoVgOT"
 BASE_URL = "https://artificialanalysis.ai/api/v2"
@@ -72,7 +72,7 @@ def fetch_all_models() -> Optional[List[Dict]]:
     
     try:
         print(f"Fetching models from {endpoint}...")
-        response = requests.get(endpoint, headers=headers, timeout=30)
+        response = fetch_engine.get(endpoint, headers=headers, timeout=30)
         
         if response.status_code == 200:
             data = response.json()
@@ -287,7 +287,10 @@ def main():
     print(f"JSON file: opensource_subject_specific_data.json")
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        fetch_engine.close_default_engine()
 
 
 
@@ -10,6 +10,8 @@ import argparse
 from typing import List, Dict, Tuple
 from collections import Counter
 
+from keyword_automaton import KeywordIndex
+
 # Predefined use cases with keywords for matching
 PREDEFINED_USE_CASES = {
     'chatbot_conversational': {
@@ -59,8 +61,14 @@ PREDEFINED_USE_CASES = {
     }
 }
 
+_keyword_index = None  # keyword_automaton.KeywordIndex over PREDEFINED_USE_CASES, built on first match
+
 def calculate_similarity(text: str, keywords: List[str]) -> float:
-    """Calculate similarity score between text and keywords"""
+    """Calculate similarity score between text and keywords
+
+    Reference scan for one use case; find_best_matching_usecases scores all
+    use cases at once with keyword_automaton.KeywordIndex.
+    """
     text_lower = text.lower()
     
     # Count keyword matches (partial matches count too)
@@ -90,20 +98,15 @@ def calculate_similarity(text: str, keywords: List[str]) -> float:
     return similarity
 
 def find_best_matching_usecases(description: str, top_n: int = 3) -> List[Tuple[str, float]]:
-    """Find the most similar predefined use cases based on description"""
-    similarities = []
-    
-    for usecase_name, usecase_info in PREDEFINED_USE_CASES.items():
-        # Check description similarity
-        desc_similarity = calculate_similarity(description, usecase_info['keywords'])
-        
-        # Also check if use case name appears in description
-        name_similarity = 1.0 if usecase_name.replace('_', ' ') in description.lower() else 0.0
-        
-        # Combined score (weight name match higher)
-        combined_score = (name_similarity * 0.7) + (desc_similarity * 0.3)
-        
-        similarities.append((usecase_name, combined_score))
+    """Find the most similar predefined use cases based on description
+
+    Scores equal calculate_similarity plus the name match per use case, but
+    come from one pass over the description with the compiled keyword index.
+    """
+    global _keyword_index
+    if _keyword_index is None:
+        _keyword_index = KeywordIndex(PREDEFINED_USE_CASES)
+    similarities = _keyword_index.scores(description)
     
     # Sort by similarity (descending)
     similarities.sort(key=lambda x: x[1], reverse=True)
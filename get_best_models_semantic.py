@@ -3,21 +3,27 @@
 Get best models for a use case using semantic similarity (vector embeddings)
 Uses sentence-transformers for semantic matching instead of keyword-based search
 """
+import contextlib
 import csv
+import io
+import itertools
 import json
 import sys
+import time
 import argparse
+import heapq
+import hashlib
+import os
+import re
 import numpy as np
 from typing import List, Dict, Tuple
 from collections import Counter
-
-try:
-    from sentence_transformers import SentenceTransformer
-    from sklearn.metrics.pairwise import cosine_similarity
-except ImportError:
-    print("Error: Required packages not installed.")
-    print("Please install: pip install sentence-transformers scikit-learn")
-    sys.exit(1)
+from embedding_index import EmbeddingIndex
+from embedding_cache import EmbeddingCache
+from embedding_backends import get_embedding_backend, load_embedding_model
+from ranking_client import DaemonError, daemon_available, default_socket_path, rank_usecases
+from ttl_cache import TTLCache
+from usecase_registry import DEFAULT_REGISTRY_DIR, UseCaseRegistry, registry_version, validate_usecase
 
 # Predefined use cases with full descriptions for embedding
 PREDEFINED_USE_CASES = {
@@ -107,23 +113,45 @@ ALL_CSVS = {**PREDEFINED_USE_CASES, **SUBJECT_CSVS}
 
 # Embedding model configuration
 EMBEDDING_MODEL_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
+EMBEDDING_MODEL_REVISION = os.environ.get('EMBEDDING_MODEL_REVISION')  # None = latest
+EMBEDDING_THREADS = int(os.environ.get('EMBEDDING_THREADS', 0)) or None  # None = runtime default
 EMBEDDING_MODEL = None
 
+# Batch mode: configs per encode/score pass and sentences per encode micro-batch
+BATCH_CHUNK_SIZE = 4096
+BATCH_ENCODE_SIZE = 256
+BATCH_OUTPUT_FILE = 'best_models_batch.ndjson'
+
+# Bounded caches for descriptions the front-end sends over and over
+QUERY_CACHE_SIZE = 1024
+RANKING_CACHE_SIZE = 256
+CACHE_TTL_SECONDS = 300
+_query_embedding_cache = TTLCache(QUERY_CACHE_SIZE, CACHE_TTL_SECONDS)
+_ranking_cache = TTLCache(RANKING_CACHE_SIZE, CACHE_TTL_SECONDS)
+
+# Registered use cases (see usecase_registry.py): approximate top-k per custom query
+USECASE_REGISTRY_DIR = DEFAULT_REGISTRY_DIR
+REGISTRY_TOP_K = 10
+_usecase_registry = None
+_usecase_registry_version = None
+
 def get_embedding_model():
     """Get or initialize the embedding model"""
     global EMBEDDING_MODEL
     if EMBEDDING_MODEL is None:
-        print(f"\nLoading embedding model: {EMBEDDING_MODEL_NAME}")
+        print(f"\nLoading embedding model: {EMBEDDING_MODEL_NAME} ({get_embedding_backend()} backend)")
         print("  Model: all-MiniLM-L6-v2 (80MB, optimized for semantic similarity)")
         print("  First load may take a moment...")
-        EMBEDDING_MODEL = SentenceTransformer(EMBEDDING_MODEL_NAME)
+        EMBEDDING_MODEL = load_embedding_model(EMBEDDING_MODEL_NAME, EMBEDDING_MODEL_REVISION, threads=EMBEDDING_THREADS)
         print("  ✓ Model loaded successfully")
     return EMBEDDING_MODEL
 
 def generate_use_case_embeddings():
-    """Generate embeddings for all predefined use cases and subjects"""
-    model = get_embedding_model()
-    
+    """Generate embeddings for all predefined use cases and subjects
+
+    Embeddings come from the on-disk cache; only new or edited descriptions are
+    encoded, and the model is not loaded when every description is cached.
+    """
     all_texts = []
     all_names = []
     
@@ -137,33 +165,83 @@ def generate_use_case_embeddings():
         all_texts.append(info['description'])
         all_names.append(name)
     
+    cache = EmbeddingCache(EMBEDDING_MODEL_NAME, EMBEDDING_MODEL_REVISION, backend=get_embedding_backend())
+    new_texts = cache.missing(all_texts)
     print(f"\nGenerating embeddings for {len(all_texts)} use cases and subjects...")
     print(f"  - {len(PREDEFINED_USE_CASES)} use cases")
     print(f"  - {len(SUBJECT_CSVS)} subjects")
-    embeddings = model.encode(all_texts, show_progress_bar=True)
+    print(f"  - {len(all_texts) - len(new_texts)} cached, {len(new_texts)} to encode")
+    embeddings = cache.encode(all_texts, lambda texts: get_embedding_model().encode(texts, show_progress_bar=True))
     
-    return dict(zip(all_names, embeddings))
+    return EmbeddingIndex(all_names, embeddings)
+
+def normalize_description(description: str) -> str:
+    """Cache key for a description: whitespace collapsed, lower-cased"""
+    return ' '.join(description.split()).lower()
+
+def get_query_embedding(user_description: str) -> np.ndarray:
+    """Embedding of a user description (cached per normalized description)"""
+    key = normalize_description(user_description)
+    user_embedding = _query_embedding_cache.get(key)
+    if user_embedding is None:
+        model = get_embedding_model()
+        user_embedding = model.encode([user_description], show_progress_bar=False)[0]
+        _query_embedding_cache.put(key, user_embedding)
+    return user_embedding
 
 def calculate_semantic_similarity(user_description: str, use_case_embeddings: Dict[str, np.ndarray]) -> List[Tuple[str, float]]:
     """Calculate cosine similarity between user description and all use case embeddings"""
-    model = get_embedding_model()
-    
-    # Generate embedding for user description
-    user_embedding = model.encode([user_description], show_progress_bar=False)
-    user_embedding = user_embedding[0].reshape(1, -1)
+    user_embedding = get_query_embedding(user_description).reshape(1, -1)
     
-    # Calculate cosine similarity with all use cases
-    similarities = []
-    
-    for usecase_name, usecase_embedding in use_case_embeddings.items():
-        usecase_embedding_2d = usecase_embedding.reshape(1, -1)
-        similarity = cosine_similarity(user_embedding, usecase_embedding_2d)[0][0]
-        similarities.append((usecase_name, float(similarity)))
-    
-    # Sort by similarity (descending)
-    similarities.sort(key=lambda x: x[1], reverse=True)
-    
-    return similarities
+    # Cosine similarity with all use cases: one product with the normalized matrix
+    return EmbeddingIndex.from_dict(use_case_embeddings).rank(user_embedding)
+
+def embedding_tag() -> str:
+    """Embedding model tag stored with registered use cases (backends are interchangeable)"""
+    if EMBEDDING_MODEL_REVISION:
+        return f"{EMBEDDING_MODEL_NAME}@{EMBEDDING_MODEL_REVISION}"
+    return EMBEDDING_MODEL_NAME
+
+def get_usecase_registry(create: bool = False):
+    """Registered use cases, reopened when the registry changes on disk
+
+    Returns None when nothing is registered (unless create) or when the
+    registry was embedded with a different model.
+    """
+    global _usecase_registry, _usecase_registry_version
+    version = registry_version(USECASE_REGISTRY_DIR)
+    if version is None and not create:
+        return None
+    if _usecase_registry is None or version != _usecase_registry_version:
+        _usecase_registry = UseCaseRegistry(USECASE_REGISTRY_DIR, embedding_tag())
+        _usecase_registry_version = version
+    if not _usecase_registry.compatible:
+        print(f"Warning: {USECASE_REGISTRY_DIR} was embedded with {_usecase_registry.index.tag}, "
+              f"not {embedding_tag()}; ignoring registered use cases.")
+        return None
+    return _usecase_registry
+
+def register_usecases(usecases: List[Dict], registry: UseCaseRegistry = None) -> int:
+    """Validate, embed and register (or replace) named use cases; returns how many"""
+    for usecase in usecases:
+        validate_usecase(usecase, ALL_CSVS)
+    if registry is None:
+        registry = get_usecase_registry(create=True)
+        if registry is None:
+            raise ValueError(f"Use case registry {USECASE_REGISTRY_DIR} was embedded with a different model")
+    for start in range(0, len(usecases), BATCH_CHUNK_SIZE):
+        chunk = usecases[start:start + BATCH_CHUNK_SIZE]
+        embeddings = get_embedding_model().encode([usecase['description'] for usecase in chunk],
+                                                  batch_size=BATCH_ENCODE_SIZE, show_progress_bar=False)
+        registry.register(chunk, embeddings)
+    return len(usecases)
+
+def match_registered_usecases(user_description: str, k: int = REGISTRY_TOP_K) -> List[Tuple[str, float]]:
+    """(name, similarity) of the top-k registered use cases for a description (ANN search)"""
+    registry = get_usecase_registry()
+    if registry is None or not len(registry):
+        return []
+    return registry.search(get_query_embedding(user_description), k)
 
 def load_models_from_csv(csv_file: str) -> List[Dict]:
     """Load models from a use case CSV file"""
@@ -197,6 +275,13 @@ def calculate_subject_score(model_row: Dict, benchmark_columns: List[str]) -> fl
         return sum(scores) / len(scores)
     return 0.0
 
+def _file_version(filename: str):
+    try:
+        stat = os.stat(filename)
+        return (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        return None
+
 def load_models_from_subject_csv(csv_file: str, benchmark_columns: List[str]) -> List[Dict]:
     """Load models from subject CSV and calculate scores"""
     try:
@@ -222,8 +307,36 @@ def load_models_from_subject_csv(csv_file: str, benchmark_columns: List[str]) ->
         print(f"Warning: {csv_file} not found.")
         return []
 
-def combine_model_scores_weighted(models_list: List[List[Dict]], weights: List[float]) -> List[Dict]:
-    """Combine scores from multiple use case CSVs with weighted averaging"""
+_source_models = {}
+
+def load_source_models(name: str) -> List[Dict]:
+    """Models of one use case/subject source, shared until its files change on disk
+
+    Every ranking that touches the same source reuses one parsed copy; callers
+    must not modify the returned list.
+    """
+    csv_info = ALL_CSVS[name]
+    csv_file = csv_info['csv_file']
+    version = (_file_version(csv_file),)
+    cached = _source_models.get(name)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    # Handle subject CSVs differently (they have benchmark columns)
+    if csv_info.get('type') == 'subject':
+        models = load_models_from_subject_csv(csv_file, csv_info.get('benchmark_columns', []))
+    else:
+        # Use case CSV (already has Use Case Score column)
+        models = load_models_from_csv(csv_file)
+    if models:
+        _source_models[name] = (version, models)
+    return models
+
+def combine_model_scores_weighted(models_list: List[List[Dict]], weights: List[float], top_k: int = None) -> List[Dict]:
+    """Combine scores from multiple use case CSVs with weighted averaging
+
+    With top_k, only the k best models are returned (partial sort instead of a full sort).
+    """
     # Normalize weights to sum to 1.0
     total_weight = sum(weights)
     if total_weight == 0:
@@ -272,6 +385,8 @@ def combine_model_scores_weighted(models_list: List[List[Dict]], weights: List[f
         combined_models.append(model_data)
     
     # Sort by score (descending)
+    if top_k is not None:
+        return heapq.nlargest(top_k, combined_models, key=lambda x: parse_score(x['Use Case Score']))
     combined_models.sort(
         key=lambda x: parse_score(x['Use Case Score']), 
         reverse=True
@@ -279,8 +394,56 @@ def combine_model_scores_weighted(models_list: List[List[Dict]], weights: List[f
     
     return combined_models
 
-def get_best_models_for_usecase(usecase_config: Dict, use_case_embeddings: Dict[str, np.ndarray]) -> Tuple[List[Dict], Dict]:
-    """Get best models for a use case configuration using semantic similarity"""
+def source_data_version() -> Tuple:
+    """(mtime, size) of every CSV a ranking can read"""
+    return tuple(_file_version(info['csv_file']) for info in ALL_CSVS.values())
+
+def _embeddings_fingerprint(use_case_embeddings: Dict[str, np.ndarray]) -> str:
+    digest = hashlib.sha1()
+    for name, embedding in use_case_embeddings.items():
+        digest.update(name.encode('utf-8'))
+        digest.update(np.ascontiguousarray(embedding).tobytes())
+    return digest.hexdigest()
+
+def get_best_models_for_usecase(usecase_config: Dict, use_case_embeddings: Dict[str, np.ndarray], top_k: int = None) -> Tuple[List[Dict], Dict]:
+    """Get best models for a use case configuration using semantic similarity
+
+    With top_k, only the k best models are returned. Rankings are cached per
+    normalized description (or predefined name) and are invalidated when any
+    source CSV changes on disk.
+    """
+    usecase_type = usecase_config.get('type', 'predefined')
+    if usecase_type == 'custom':
+        key = ('custom', normalize_description(usecase_config.get('description', '')), top_k)
+    else:
+        key = (usecase_type, usecase_config.get('name', ''), top_k)
+    version = (source_data_version(), _embeddings_fingerprint(use_case_embeddings),
+               registry_version(USECASE_REGISTRY_DIR))
+    
+    cached = _ranking_cache.get(key, version)
+    if cached is not None:
+        models, match_info = cached
+        if usecase_type == 'custom':
+            print(f"\nUsing cached ranking for: {usecase_config.get('description', '')}")
+        return list(models), dict(match_info)
+    
+    models, match_info = rank_usecase(usecase_config, use_case_embeddings, top_k)
+    _ranking_cache.put(key, (models, match_info), version)
+    return list(models), dict(match_info)
+
+def cache_stats() -> Dict[str, Dict]:
+    """Hit/miss/eviction counters of the query embedding and ranking caches"""
+    return {'query_embeddings': _query_embedding_cache.stats(), 'rankings': _ranking_cache.stats()}
+
+def rank_usecase(usecase_config: Dict, use_case_embeddings: Dict[str, np.ndarray], top_k: int = None,
+                 similarities: List[Tuple[str, float]] = None,
+                 registered: List[Tuple[str, float]] = None) -> Tuple[List[Dict], Dict]:
+    """Rank models for a use case configuration (uncached, see get_best_models_for_usecase)
+
+    Custom use cases can pass precomputed similarities and registered use case
+    matches (e.g. from a batched encode). A matching registered use case adds
+    its similarity, split by its weights, to the use cases/subjects it covers.
+    """
     usecase_type = usecase_config.get('type', 'predefined')
     usecase_name = usecase_config.get('name', '')
     description = usecase_config.get('description', '')
@@ -291,20 +454,11 @@ def get_best_models_for_usecase(usecase_config: Dict, use_case_embeddings: Dict[
             available = list(PREDEFINED_USE_CASES.keys()) + list(SUBJECT_CSVS.keys())
             raise ValueError(f"Unknown predefined use case/subject: {usecase_name}. Available: {available}")
         
-        csv_info = ALL_CSVS[usecase_name]
-        csv_file = csv_info['csv_file']
-        
-        # Handle subject CSVs differently
-        if csv_info.get('type') == 'subject':
-            benchmark_columns = csv_info.get('benchmark_columns', [])
-            models = load_models_from_subject_csv(csv_file, benchmark_columns)
-        else:
-            models = load_models_from_csv(csv_file)
-        
+        models = load_source_models(usecase_name)
         if not models:
-            raise FileNotFoundError(f"CSV file {csv_file} not found.")
+            raise FileNotFoundError(f"CSV file {ALL_CSVS[usecase_name]['csv_file']} not found.")
         
-        return models, {usecase_name: 1.0}
+        return list(models[:top_k] if top_k is not None else models), {usecase_name: 1.0}
     
     elif usecase_type == 'custom':
         # Use semantic similarity to find best matches
@@ -315,7 +469,10 @@ def get_best_models_for_usecase(usecase_config: Dict, use_case_embeddings: Dict[
         print(f"  Description: {description}")
         
         # Calculate semantic similarities
-        similarities = calculate_semantic_similarity(description, use_case_embeddings)
+        if similarities is None:
+            similarities = calculate_semantic_similarity(description, use_case_embeddings)
+        if registered is None:
+            registered = match_registered_usecases(description)
         
         print(f"\n  Semantic similarity scores:")
         for i, (match_name, score) in enumerate(similarities, 1):
@@ -326,32 +483,36 @@ def get_best_models_for_usecase(usecase_config: Dict, use_case_embeddings: Dict[
         threshold = 0.3  # Minimum similarity to include
         
         relevant_matches = [(name, score) for name, score in similarities if score >= threshold]
+        registered_matches = [(name, score) for name, score in registered if score >= threshold]
+        
+        if registered_matches:
+            print(f"\n  Registered use case matches:")
+            for i, (match_name, score) in enumerate(registered_matches, 1):
+                print(f"    {i}. {match_name}: {score:.3f} ({score*100:.1f}%)")
         
-        if not relevant_matches:
+        if not relevant_matches and not registered_matches:
             # If no matches above threshold, use top 3 anyway
             print(f"  → No matches above {threshold} threshold, using top 3 matches")
             relevant_matches = similarities[:3]
         else:
-            print(f"  → Using {len(relevant_matches)} matches above {threshold} threshold")
+            print(f"  → Using {len(relevant_matches) + len(registered_matches)} matches above {threshold} threshold")
+        
+        # Registered use cases contribute their similarity through their source weights
+        source_weights = dict(relevant_matches)
+        if registered_matches:
+            registry = get_usecase_registry()
+            for match_name, similarity_score in registered_matches:
+                for source, share in registry.source_weights(match_name).items():
+                    source_weights[source] = source_weights.get(source, 0.0) + similarity_score * share
         
         # Load models from relevant use cases and subjects
         models_list = []
         weights = []
         match_info = {}
         
-        for match_name, similarity_score in relevant_matches:
+        for match_name, similarity_score in source_weights.items():
             if match_name in ALL_CSVS:
-                csv_info = ALL_CSVS[match_name]
-                csv_file = csv_info['csv_file']
-                
-                # Handle subject CSVs differently (they have benchmark columns)
-                if csv_info.get('type') == 'subject':
-                    benchmark_columns = csv_info.get('benchmark_columns', [])
-                    models = load_models_from_subject_csv(csv_file, benchmark_columns)
-                else:
-                    # Use case CSV (already has Use Case Score column)
-                    models = load_models_from_csv(csv_file)
-                
+                models = load_source_models(match_name)
                 if models:
                     models_list.append(models)
                     weights.append(similarity_score)
@@ -361,13 +522,175 @@ def get_best_models_for_usecase(usecase_config: Dict, use_case_embeddings: Dict[
             raise ValueError("No matching use cases found. Please provide a more descriptive use case.")
         
         # Combine with weighted scores
-        combined_models = combine_model_scores_weighted(models_list, weights)
+        combined_models = combine_model_scores_weighted(models_list, weights, top_k=top_k)
         
         return combined_models, match_info
     
     else:
         raise ValueError(f"Unknown use case type: {usecase_type}. Must be 'predefined' or 'custom'")
 
+def get_pareto_models_for_usecase(usecase_config: Dict, use_case_embeddings: Dict[str, np.ndarray],
+                                  latency_file: str = 'model_latency_performance.csv',
+                                  objectives: List[str] = None, epsilon: float = None) -> Tuple[List[Dict], Dict]:
+    """Get the Pareto frontier of use-case quality vs latency/throughput
+
+    Ranks models like get_best_models_for_usecase, joins them with latency rows
+    (one candidate per model/provider row) and keeps the non-dominated ones.
+    """
+    from pareto_frontier import build_candidates, load_latency_data, pareto_frontier
+
+    models, match_info = get_best_models_for_usecase(usecase_config, use_case_embeddings)
+    scored = [{**m, 'score': parse_score(m['Use Case Score'])} for m in models if m.get('Use Case Score', 'N/A') != 'N/A']
+    candidates = build_candidates(scored, load_latency_data(latency_file))
+    return pareto_frontier(candidates, objectives, epsilon), match_info
+
+def iter_batch_usecases(batch_file: str):
+    """Yield (line number, use case config) pairs from a JSONL file
+
+    Each line is a bare use case object, {"use_case": {...}} or
+    {"use_cases": [...]}. Blank lines are skipped. A line that is not valid
+    JSON or holds no use case objects yields a ValueError instead of a config.
+    """
+    with open(batch_file, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                config_data = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, ValueError(f"Invalid JSON: {e}")
+                continue
+            if not isinstance(config_data, dict):
+                yield line_number, ValueError("Expected a JSON object")
+                continue
+            if 'use_case' not in config_data and 'use_cases' not in config_data:
+                config_data = {'use_case': config_data}
+            usecase_configs = usecase_configs_from_data(config_data)
+            if not isinstance(usecase_configs, list):
+                yield line_number, ValueError("'use_cases' must be a list")
+                continue
+            for usecase_config in usecase_configs:
+                if not isinstance(usecase_config, dict):
+                    usecase_config = ValueError("Expected a use case object")
+                yield line_number, usecase_config
+
+def rank_usecase_batch(usecase_configs, use_case_embeddings: Dict[str, np.ndarray], top_k: int = None,
+                       chunk_size: int = BATCH_CHUNK_SIZE, encoder=None):
+    """Rank many use case configs and yield (usecase_config, models, match_info, error) in input order
+
+    Configs are processed chunk by chunk: the chunk's distinct custom
+    descriptions are encoded in one batched encode call and scored with one
+    matrix product, source CSVs are parsed once, and identical configs within
+    a chunk share one ranking. encoder replaces the in-process model, e.g. an
+    encoder_pool.EncoderPool for multi-process encoding.
+
+    A config that cannot be ranked (unknown use case, missing description,
+    missing CSV) yields models and match_info None and the exception as
+    error, and the batch goes on. An exception in place of a config (see
+    iter_batch_usecases) is passed through as the error.
+    """
+    index = EmbeddingIndex.from_dict(use_case_embeddings)
+    configs = iter(usecase_configs)
+    while True:
+        chunk = list(itertools.islice(configs, chunk_size))
+        if not chunk:
+            return
+        
+        # One encode + one matmul for every distinct custom description in the chunk
+        descriptions = {}
+        for usecase_config in chunk:
+            if isinstance(usecase_config, Exception):
+                continue
+            description = usecase_config.get('description', '')
+            if usecase_config.get('type', 'predefined') == 'custom' and isinstance(description, str) and description:
+                descriptions.setdefault(normalize_description(description), description)
+        similarities = {}
+        registered = {}
+        if descriptions:
+            model = encoder or get_embedding_model()
+            embeddings = model.encode(list(descriptions.values()), batch_size=BATCH_ENCODE_SIZE, show_progress_bar=False)
+            similarities = dict(zip(descriptions.keys(), index.rank_batch(embeddings)))
+            registry = get_usecase_registry()
+            if registry is not None:
+                registered = {key: registry.search(embedding, REGISTRY_TOP_K)
+                              for key, embedding in zip(descriptions.keys(), embeddings)}
+        
+        rankings = {}
+        for usecase_config in chunk:
+            if isinstance(usecase_config, Exception):
+                yield usecase_config, None, None, usecase_config
+                continue
+            usecase_type = usecase_config.get('type', 'predefined')
+            description = usecase_config.get('description', '')
+            if usecase_type == 'custom':
+                key = ('custom', normalize_description(description) if isinstance(description, str) else '')
+            else:
+                key = (usecase_type, str(usecase_config.get('name', '')))
+            if key not in rankings:
+                try:
+                    # rank_usecase prints progress for single queries; keep batch output quiet
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        rankings[key] = rank_usecase(usecase_config, index, top_k, similarities.get(key[1]),
+                                                     registered.get(key[1], [])) + (None,)
+                except Exception as e:
+                    rankings[key] = (None, None, e)
+            yield (usecase_config, *rankings[key])
+
+def safe_filename(name: str) -> str:
+    """name reduced to a single path component (no separators, no leading dots)"""
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', str(name)).lstrip('.') or 'unknown'
+
+def write_models_csv(models: List[Dict], output_file: str):
+    """Write a ranking in the best_models CSV format"""
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['Model Name', 'Provider', 'Dataset', 'Use Case Score'])
+        writer.writeheader()
+        writer.writerows(models)
+
+def write_batch_results(batch_items, use_case_embeddings: Dict[str, np.ndarray], output: str,
+                        output_format: str = 'ndjson', top_k: int = None, encoder=None) -> Tuple[int, int]:
+    """Stream batch rankings to one NDJSON file or to one CSV per config in a directory
+
+    batch_items are (line number, config) pairs as iter_batch_usecases yields
+    them. A config that fails becomes an {"line", "error"} NDJSON record (a
+    warning in CSV mode) and the rest of the batch is still ranked. Returns
+    (configs processed, configs that failed).
+    """
+    count = errors = 0
+    lines, configs = itertools.tee(batch_items)
+    results = rank_usecase_batch((config for _, config in configs), use_case_embeddings, top_k, encoder=encoder)
+    ranked = zip((line_number for line_number, _ in lines), results)
+    if output_format == 'csv':
+        os.makedirs(output, exist_ok=True)
+        for count, (line_number, (usecase_config, models, match_info, error)) in enumerate(ranked, 1):
+            if error is not None:
+                errors += 1
+                print(f"⚠ Line {line_number}: {error}")
+                continue
+            usecase_name = safe_filename(usecase_config.get('name', 'unknown'))
+            write_models_csv(models, os.path.join(output, f"best_models_{count:06d}_{usecase_name}.csv"))
+        return count, errors
+    
+    with open(output, 'w', encoding='utf-8') as f:
+        for count, (line_number, (usecase_config, models, match_info, error)) in enumerate(ranked, 1):
+            if error is not None:
+                errors += 1
+                record = {'line': line_number, 'error': str(error)}
+                if isinstance(usecase_config, dict) and 'name' in usecase_config:
+                    record['name'] = usecase_config['name']
+            else:
+                record = {
+                    'line': line_number,
+                    'name': usecase_config.get('name', 'unknown'),
+                    'type': usecase_config.get('type', 'predefined'),
+                    'description': usecase_config.get('description', ''),
+                    'match_info': match_info,
+                    'models': models
+                }
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    return count, errors
+
 def save_results(models: List[Dict], output_file: str, match_info: Dict = None):
     """Save results to CSV"""
     with open(output_file, 'w', newline='', encoding='utf-8') as f:
@@ -404,7 +727,11 @@ def process_json_config(config_file=None, json_string=None):
             config_data = json.load(f)
     else:
         raise ValueError("Must provide either config_file or json_string")
-    
+
+    return usecase_configs_from_data(config_data)
+
+def usecase_configs_from_data(config_data: Dict) -> List[Dict]:
+    """Use case configs from already-parsed JSON config data"""
     # Handle single or multiple use cases
     if 'use_case' in config_data:
         return [config_data['use_case']]
@@ -445,6 +772,15 @@ Examples:
   # Custom use case (semantic matching)
   python3 get_best_models_semantic.py --json '{"use_case": {"type": "custom", "name": "my_task", "description": "I need a model for code autocomplete"}}'
 
+  # Keyword matcher first, embedding model only for ambiguous descriptions
+  python3 get_best_models_semantic.py --cascade --json '{"use_case": {"type": "custom", "name": "t", "description": "I need translation"}}'
+
+  # Bulk mode: one use case per line, results streamed to NDJSON (or --batch-format csv)
+  python3 get_best_models_semantic.py --batch requests.jsonl --top-k 10 --output rankings.ndjson
+
+  # Bulk mode with descriptions encoded by 8 pinned worker processes
+  python3 get_best_models_semantic.py --batch requests.jsonl --workers 8 --output rankings.ndjson
+
 JSON Format:
   {
     "use_case": {
@@ -459,6 +795,16 @@ JSON Format:
     parser.add_argument('--json', '-j', type=str, help='JSON configuration as string')
     parser.add_argument('--output', '-o', type=str, help='Output CSV file (default: best_models_{usecase_name}.csv)')
     parser.add_argument('--model-info', action='store_true', help='Show information about the embedding model')
+    parser.add_argument('--top-k', type=int, help='Only keep the top K models (default: all models)')
+    parser.add_argument('--batch', '-b', type=str, help='JSONL file with one use case per line (bulk mode)')
+    parser.add_argument('--batch-format', choices=['ndjson', 'csv'], default='ndjson',
+                        help=f'Bulk output: one NDJSON file (--output, default {BATCH_OUTPUT_FILE}) or one CSV per config (--output directory)')
+    parser.add_argument('--cascade', action='store_true',
+                        help='Answer custom use cases from the keyword matcher when it is confident (see cascade_matcher.py)')
+    parser.add_argument('--cascade-margin', type=float,
+                        help='Keyword score margin over the runner-up for --cascade (default: CASCADE_MARGIN or 0.15)')
+    parser.add_argument('--workers', '-w', type=int,
+                        help='Bulk mode: encode descriptions in this many pinned worker processes (see encoder_pool.py)')
     
     args = parser.parse_args()
     
@@ -466,6 +812,25 @@ JSON Format:
         print_model_info()
         return
     
+    if args.batch:
+        output = args.output or (BATCH_OUTPUT_FILE if args.batch_format == 'ndjson' else 'best_models_batch')
+        start = time.time()
+        use_case_embeddings = generate_use_case_embeddings()
+        if args.workers:
+            from encoder_pool import EncoderPool, print_pool_stats
+            with EncoderPool(args.workers, EMBEDDING_THREADS) as pool:
+                count, errors = write_batch_results(iter_batch_usecases(args.batch), use_case_embeddings, output,
+                                                    args.batch_format, top_k=args.top_k, encoder=pool)
+                print_pool_stats(pool.stats())
+        else:
+            count, errors = write_batch_results(iter_batch_usecases(args.batch), use_case_embeddings, output,
+                                                args.batch_format, top_k=args.top_k)
+        print(f"\n✓ Ranked {count - errors} use case(s) from {args.batch} in {time.time() - start:.1f}s")
+        if errors:
+            print(f"⚠ {errors} use case(s) could not be ranked")
+        print(f"✓ Results written to {output}")
+        return
+    
     if not args.config and not args.json:
         parser.print_help()
         sys.exit(1)
@@ -474,13 +839,25 @@ JSON Format:
     print("Getting Best Models Using Semantic Similarity")
     print("=" * 60)
     
-    # Generate embeddings for all predefined use cases (cached after first call)
-    use_case_embeddings = generate_use_case_embeddings()
-    
     # Process configuration
     usecase_configs = process_json_config(config_file=args.config, json_string=args.json)
     
-    for usecase_config in usecase_configs:
+    # A running ranking daemon already holds the model and embeddings. --cascade
+    # ranks in-process: its keyword tier needs no model, and the daemon would
+    # always answer semantically.
+    daemon_results = None
+    use_case_embeddings = None
+    if not args.cascade and daemon_available():
+        print(f"\nUsing ranking daemon ({default_socket_path()})")
+        try:
+            daemon_results = rank_usecases(usecase_configs, top_k=args.top_k)
+        except (DaemonError, OSError) as e:
+            print(f"⚠ Ranking daemon failed ({e}), ranking in-process")
+    if daemon_results is None and not args.cascade:
+        # Generate embeddings for all predefined use cases (cached after first call)
+        use_case_embeddings = generate_use_case_embeddings()
+    
+    for i, usecase_config in enumerate(usecase_configs):
         usecase_name = usecase_config.get('name', 'unknown')
         usecase_type = usecase_config.get('type', 'predefined')
         
@@ -489,13 +866,20 @@ JSON Format:
         print(f"{'='*60}")
         
         # Get best models
-        models, match_info = get_best_models_for_usecase(usecase_config, use_case_embeddings)
+        if daemon_results is not None:
+            models, match_info = daemon_results[i]
+        elif args.cascade:
+            from cascade_matcher import get_best_models_cascade
+            models, match_info, tier = get_best_models_cascade(usecase_config, None, args.top_k, args.cascade_margin)
+            print(f"  → Answered by {tier} tier")
+        else:
+            models, match_info = get_best_models_for_usecase(usecase_config, use_case_embeddings, top_k=args.top_k)
         
         # Determine output file
         if args.output:
             output_file = args.output
         else:
-            output_file = f"best_models_{usecase_name}.csv"
+            output_file = f"best_models_{safe_filename(usecase_name)}.csv"
         
         # Save results
         save_results(models, output_file, match_info)
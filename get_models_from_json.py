@@ -12,6 +12,7 @@ from get_best_models_semantic import (
     get_best_models_for_usecase,
     save_results
 )
+from ranking_client import DaemonError, daemon_available, rank_usecases
 
 def process_usecase_json(json_data):
     """
@@ -112,14 +113,25 @@ def get_models_from_json(json_input, output_file=None):
     print(f"\nUse Case: {usecase_config['name']}")
     print(f"Description: {usecase_config['description']}")
     
-    # Initialize semantic matching
-    print("\n🔧 Initializing semantic matching system...")
-    model = get_embedding_model()
-    use_case_embeddings = generate_use_case_embeddings()
-    
-    # Get best models
-    print("🔍 Finding best models...\n")
-    models, match_info = get_best_models_for_usecase(usecase_config, use_case_embeddings)
+    ranked = None
+    if daemon_available():
+        # A running ranking daemon already holds the model and embeddings
+        print("\n🔍 Finding best models (ranking daemon)...\n")
+        try:
+            ranked = rank_usecases([usecase_config])[0]
+        except (DaemonError, OSError) as e:
+            print(f"⚠ Ranking daemon failed ({e}), ranking in-process")
+    if ranked is not None:
+        models, match_info = ranked
+    else:
+        # Initialize semantic matching
+        print("\n🔧 Initializing semantic matching system...")
+        model = get_embedding_model()
+        use_case_embeddings = generate_use_case_embeddings()
+        
+        # Get best models
+        print("🔍 Finding best models...\n")
+        models, match_info = get_best_models_for_usecase(usecase_config, use_case_embeddings)
     
     # Save if output file specified
     if output_file:
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+On-disk HTTP cache for the artificialanalysis.ai API, shared by all fetch scripts
+The default fetch engine (fetch_engine.default_engine) looks every GET up here:
+
+- an entry younger than the TTL (HTTP_CACHE_TTL seconds, default 3600) is
+  served from disk without any network call or rate-limit token;
+- an older entry is revalidated with If-None-Match / If-Modified-Since from
+  its ETag / Last-Modified, and a 304 serves the stored body again;
+- every other 200 response replaces the entry (unless it says no-store).
+
+Entries are keyed by URL only, so scripts with different API keys share the
+/api/v2 catalog payloads. Each URL gets two files in the cache directory:
+    <sha256(url)>.body.gz   gzip-compressed response body
+    <sha256(url)>.json      {"url", "status", "headers", "encoding", "stored_at", "size"}
+
+HTTP_CACHE=off disables the cache; HTTP_CACHE_TTL=0 revalidates every request.
+
+Usage:
+    # Show what is cached
+    python3 http_cache.py --info
+
+    # Drop every cached response
+    python3 http_cache.py --clear
+"""
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+import argparse
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_CACHE_DIR = os.environ.get('HTTP_CACHE_DIR', '.http_cache')
+DEFAULT_TTL = float(os.environ.get('HTTP_CACHE_TTL', 3600))
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Date')
+
+def cache_enabled() -> bool:
+    return os.environ.get('HTTP_CACHE', '').lower() not in ('off', '0', 'false', 'no')
+
+class HTTPCache:
+    """Compressed response bodies with their validators, one pair of files per URL"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_TTL):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json"), os.path.join(self.cache_dir, f"{key}.body.gz")
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Stored metadata for url, or None"""
+        meta_file, _ = self._paths(url)
+        try:
+            with open(meta_file, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('url') == url else None
+
+    def is_fresh(self, entry: Dict) -> bool:
+        return time.time() - entry['stored_at'] < self.ttl
+
+    def validators(self, entry: Dict) -> Dict[str, str]:
+        """Conditional request headers for a stored entry"""
+        headers = {}
+        stored = CaseInsensitiveDict(entry['headers'])
+        if stored.get('ETag'):
+            headers['If-None-Match'] = stored['ETag']
+        if stored.get('Last-Modified'):
+            headers['If-Modified-Since'] = stored['Last-Modified']
+        return headers
+
+    def response(self, entry: Dict) -> Optional[requests.Response]:
+        """The stored response, or None if its body is missing or damaged"""
+        _, body_file = self._paths(entry['url'])
+        try:
+            with gzip.open(body_file, 'rb') as f:
+                body = f.read()
+        except (OSError, EOFError):
+            return None
+        if len(body) != entry['size']:
+            return None
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.url = entry['url']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = entry.get('encoding')
+        response._content = body
+        return response
+
+    def store(self, url: str, response: requests.Response) -> bool:
+        """Store a 200 response; False if it is not cacheable"""
+        if response.status_code != 200 or 'no-store' in response.headers.get('Cache-Control', '').lower():
+            return False
+        os.makedirs(self.cache_dir, exist_ok=True)
+        meta_file, body_file = self._paths(url)
+        body = response.content
+        # Body first: a reader that sees the new metadata always finds the matching body
+        tmp_body = f"{body_file}.tmp{os.getpid()}"
+        with gzip.open(tmp_body, 'wb', compresslevel=6) as f:
+            f.write(body)
+        os.replace(tmp_body, body_file)
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        self._write_meta(meta_file, {'url': url, 'status': response.status_code, 'headers': headers,
+                                     'encoding': response.encoding, 'stored_at': time.time(), 'size': len(body)})
+        return True
+
+    def refresh(self, entry: Dict, not_modified: requests.Response):
+        """Restart the TTL of an entry the server confirmed with a 304, taking any updated validators"""
+        for name in STORED_HEADERS:
+            if name in not_modified.headers and name != 'Content-Type':
+                entry['headers'][name] = not_modified.headers[name]
+        entry['stored_at'] = time.time()
+        self._write_meta(self._paths(entry['url'])[0], entry)
+
+    def _write_meta(self, meta_file: str, entry: Dict):
+        tmp_meta = f"{meta_file}.tmp{os.getpid()}"
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_meta, meta_file)
+
+    def clear(self) -> int:
+        """Delete every cached response; returns the number of files removed"""
+        removed = 0
+        if os.path.isdir(self.cache_dir):
+            for filename in os.listdir(self.cache_dir):
+                if filename.endswith(('.json', '.body.gz')) or '.tmp' in filename:
+                    os.remove(os.path.join(self.cache_dir, filename))
+                    removed += 1
+        return removed
+
+def print_cache_info(cache_dir: str = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_TTL):
+    """Print the cached URLs with their age, size on disk and validators"""
+    cache = HTTPCache(cache_dir, ttl)
+    meta_files = sorted(f for f in os.listdir(cache_dir) if f.endswith('.json')) if os.path.isdir(cache_dir) else []
+    print(f"HTTP cache: {cache_dir} (TTL {ttl:g}s)")
+    if not meta_files:
+        print("  (empty)")
+        return
+    total_size = total_compressed = 0
+    for filename in meta_files:
+        with open(os.path.join(cache_dir, filename), 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        compressed = os.path.getsize(cache._paths(entry['url'])[1])
+        total_size += entry['size']
+        total_compressed += compressed
+        stored = CaseInsensitiveDict(entry['headers'])
+        validators = ', '.join(name for name in ('ETag', 'Last-Modified') if name in stored) or 'no validators'
+        state = 'fresh' if cache.is_fresh(entry) else 'stale'
+        print(f"  {entry['url']}")
+        print(f"    {state}, {time.time() - entry['stored_at']:.0f}s old, {entry['size'] / 1024:.1f} KB "
+              f"({compressed / 1024:.1f} KB compressed), {validators}")
+    print(f"\n  {len(meta_files)} response(s), {total_size / 1024:.1f} KB ({total_compressed / 1024:.1f} KB on disk)")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Inspect or clear the on-disk HTTP cache of the fetch scripts',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 http_cache.py --info
+  python3 http_cache.py --clear
+  HTTP_CACHE_TTL=0 python3 fetch_opensource_all_benchmarks.py   # always revalidate
+  HTTP_CACHE=off python3 fetch_latency_performance.py           # bypass the cache
+        """
+    )
+    parser.add_argument('--info', action='store_true', help='List cached responses')
+    parser.add_argument('--clear', action='store_true', help='Delete every cached response')
+    parser.add_argument('--cache-dir', type=str, default=DEFAULT_CACHE_DIR, help=f'Cache directory (default: {DEFAULT_CACHE_DIR})')
+
+    args = parser.parse_args()
+    if args.clear:
+        print(f"✓ Removed {HTTPCache(args.cache_dir).clear()} file(s) from {args.cache_dir}")
+    elif args.info:
+        print_cache_info(args.cache_dir)
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Compiled keyword matcher for the predefined use cases
+get_best_models.calculate_similarity scans every keyword (and keyword part)
+against the text and every text word against every keyword, once per use
+case. KeywordIndex compiles the keywords of all use cases once:
+
+- an Aho-Corasick automaton over the full keywords, their parts (>3 chars)
+  and the use case names, so one pass over the text finds every substring
+  match for every use case at the same time;
+- an inverted index from keyword substrings to use cases, plus the automaton
+  run over the word itself, so the word-in-keyword / keyword-in-word check
+  is a dict lookup per distinct text word (memoized across descriptions).
+
+Scores are identical to find_best_matching_usecases/calculate_similarity,
+including float rounding.
+
+Usage:
+    # Compiled vs reference matcher on 100k synthetic descriptions
+    python3 keyword_automaton.py --benchmark
+    python3 keyword_automaton.py --benchmark --count 20000 --seed 7
+"""
+import random
+import sys
+import time
+import argparse
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+MIN_WORD_LENGTH = 4  # calculate_similarity only considers words/keyword parts longer than 3 characters
+WORD_CACHE_SIZE = 65536
+
+class AhoCorasick:
+    """Multi-pattern substring automaton: the ids of all patterns occurring in a text"""
+
+    def __init__(self, patterns: List[str]):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+        for pattern_id, pattern in enumerate(patterns):
+            state = 0
+            for ch in pattern:
+                if ch not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                    self.goto[state][ch] = len(self.goto) - 1
+                state = self.goto[state][ch]
+            self.output[state] += (pattern_id,)
+
+        # Breadth-first failure links; outputs are merged along them and every state
+        # gets the full transition table of its failure state (a DFA: no fallback loop when scanning)
+        self.delta = [dict(self.goto[0])] + [None] * (len(self.goto) - 1)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            self.delta[state] = {**self.delta[self.fail[state]], **self.goto[state]}
+            for ch, child in self.goto[state].items():
+                queue.append(child)
+                self.fail[child] = self.delta[self.fail[state]].get(ch, 0)
+                self.output[child] += self.output[self.fail[child]]
+
+    def find(self, text: str) -> Set[int]:
+        """Ids of the patterns that occur in text (one pass)"""
+        delta, output = self.delta, self.output
+        found = set()
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+class KeywordIndex:
+    """Keyword and name matches of a description against all use cases in one pass"""
+
+    def __init__(self, use_cases: Dict[str, Dict]):
+        self.names = list(use_cases)
+        self.keyword_counts = [len(info['keywords']) for info in use_cases.values()]
+
+        patterns = {}  # pattern -> id
+        def pattern_id(pattern: str) -> int:
+            return patterns.setdefault(pattern, len(patterns))
+
+        # Keyword slots are (use case, position) so duplicate keywords count like in calculate_similarity
+        self.slot_usecase = []
+        exact_slots = {}    # pattern id -> slots whose whole keyword is the pattern
+        partial_slots = {}  # pattern id -> slots of multi-word keywords with the pattern as a part
+        keyword_usecases = {}  # pattern id of a whole keyword -> use cases
+        self.substring_usecases = {}  # keyword substring (>3 chars) -> use cases
+        self.name_patterns = []
+        for usecase_index, (usecase_name, info) in enumerate(use_cases.items()):
+            for keyword in info['keywords']:
+                keyword_lower = keyword.lower()
+                slot = len(self.slot_usecase)
+                self.slot_usecase.append(usecase_index)
+                keyword_id = pattern_id(keyword_lower)
+                exact_slots.setdefault(keyword_id, []).append(slot)
+                keyword_usecases.setdefault(keyword_id, set()).add(usecase_index)
+                keyword_parts = keyword_lower.split()
+                if len(keyword_parts) > 1:
+                    for part in keyword_parts:
+                        if len(part) >= MIN_WORD_LENGTH:
+                            partial_slots.setdefault(pattern_id(part), []).append(slot)
+                for start in range(len(keyword_lower)):
+                    for end in range(start + MIN_WORD_LENGTH, len(keyword_lower) + 1):
+                        self.substring_usecases.setdefault(keyword_lower[start:end], set()).add(usecase_index)
+            self.name_patterns.append(pattern_id(usecase_name.replace('_', ' ')))
+
+        self.exact_slots = {pid: tuple(slots) for pid, slots in exact_slots.items()}
+        self.partial_slots = {pid: tuple(slots) for pid, slots in partial_slots.items()}
+        self.keyword_usecases = {pid: frozenset(usecases) for pid, usecases in keyword_usecases.items()}
+        self.substring_usecases = {sub: frozenset(usecases) for sub, usecases in self.substring_usecases.items()}
+        self.automaton = AhoCorasick(list(patterns))
+        self._word_cache = {}
+
+    def word_usecases(self, word: str) -> frozenset:
+        """Use cases with a keyword containing word or contained in it"""
+        usecases = self._word_cache.get(word)
+        if usecases is None:
+            usecases = set(self.substring_usecases.get(word, ()))
+            for pid in self.automaton.find(word):
+                usecases.update(self.keyword_usecases.get(pid, ()))
+            usecases = frozenset(usecases)
+            if len(self._word_cache) >= WORD_CACHE_SIZE:
+                self._word_cache.clear()
+            self._word_cache[word] = usecases
+        return usecases
+
+    def keyword_similarities(self, text: str) -> List[float]:
+        """calculate_similarity(text, keywords) for every use case, in use case order"""
+        return self._similarities(text.lower(), self.automaton.find(text.lower()))
+
+    def _similarities(self, text_lower: str, found: Set[int]) -> List[float]:
+        exact, partial = set(), set()
+        for pid in found:
+            exact.update(self.exact_slots.get(pid, ()))
+            partial.update(self.partial_slots.get(pid, ()))
+        matches = [0.0] * len(self.names)
+        for slot in exact:
+            matches[self.slot_usecase[slot]] += 1
+        for slot in partial - exact:
+            matches[self.slot_usecase[slot]] += 0.5
+
+        for word in text_lower.split():
+            if len(word) >= MIN_WORD_LENGTH:
+                for usecase_index in self.word_usecases(word):
+                    # Added one word at a time so the float sum matches calculate_similarity exactly
+                    matches[usecase_index] += 0.3
+
+        return [min(match / count, 1.0) if count else 0.0 for match, count in zip(matches, self.keyword_counts)]
+
+    def scores(self, description: str) -> List[Tuple[str, float]]:
+        """(use case, combined name/keyword score) in use case order, as in find_best_matching_usecases"""
+        text_lower = description.lower()
+        found = self.automaton.find(text_lower)
+        similarities = self._similarities(text_lower, found)
+        return [(name, (1.0 if name_pid in found else 0.0) * 0.7 + similarity * 0.3)
+                for name, name_pid, similarity in zip(self.names, self.name_patterns, similarities)]
+
+def synthetic_descriptions(count: int, use_cases: Dict[str, Dict], seed: int = 0) -> List[str]:
+    """Free-text descriptions mixing keyword phrases, keyword parts, use case names and filler"""
+    rng = random.Random(seed)
+    phrases = [keyword for info in use_cases.values() for keyword in info['keywords']]
+    phrases += [name.replace('_', ' ') for name in use_cases]
+    words = sorted({word for phrase in phrases for word in phrase.split()})
+    filler = ('i need a for the with users and fast cheap model that can help our team build service '
+              'customers support internal tool documents emails answers 100 500 1000 per day low latency '
+              'accurate reliable application platform handle multiple languages questions reports').split()
+    descriptions = []
+    for _ in range(count):
+        tokens = [rng.choice(filler) for _ in range(rng.randint(4, 20))]
+        for _ in range(rng.randint(0, 3)):
+            tokens.insert(rng.randrange(len(tokens) + 1), rng.choice(phrases if rng.random() < 0.5 else words))
+        description = ' '.join(tokens)
+        descriptions.append(description.capitalize() if rng.random() < 0.5 else description)
+    return descriptions
+
+def reference_scores(description: str, use_cases: Dict[str, Dict]) -> List[Tuple[str, float]]:
+    """Scores from the per-use-case scans of get_best_models.calculate_similarity, in use case order"""
+    from get_best_models import calculate_similarity
+    return [(usecase_name, (1.0 if usecase_name.replace('_', ' ') in description.lower() else 0.0) * 0.7
+             + calculate_similarity(description, usecase_info['keywords']) * 0.3)
+            for usecase_name, usecase_info in use_cases.items()]
+
+def run_benchmark(descriptions: Iterable[str]) -> int:
+    """Time the reference and compiled matchers on the same descriptions; returns the number of disagreements"""
+    from get_best_models import PREDEFINED_USE_CASES
+
+    descriptions = list(descriptions)
+    start = time.perf_counter()
+    index = KeywordIndex(PREDEFINED_USE_CASES)
+    build_ms = 1000 * (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    expected = [reference_scores(description, PREDEFINED_USE_CASES) for description in descriptions]
+    reference_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [index.scores(description) for description in descriptions]
+    compiled_s = time.perf_counter() - start
+
+    mismatches = sum(a != e for a, e in zip(actual, expected))
+    print(f"\n  {'matcher':<12s} {'total':>9s} {'per description':>16s}")
+    print(f"  {'reference':<12s} {reference_s:8.2f}s {1e6 * reference_s / len(descriptions):13.1f} µs")
+    print(f"  {'compiled':<12s} {compiled_s:8.2f}s {1e6 * compiled_s / len(descriptions):13.1f} µs")
+    print(f"\n  Speedup: {reference_s / compiled_s:.1f}x  (index build {build_ms:.1f} ms, "
+          f"{len(index.automaton.goto)} automaton states)")
+    print(f"  Identical scores: {len(descriptions) - mismatches} / {len(descriptions)}")
+    return mismatches
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the compiled keyword matcher against calculate_similarity',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 keyword_automaton.py --benchmark
+  python3 keyword_automaton.py --benchmark --count 20000 --seed 7
+        """
+    )
+    parser.add_argument('--benchmark', action='store_true', help='Time reference vs compiled matcher and check they agree')
+    parser.add_argument('--count', type=int, default=100000, help='Synthetic descriptions (default: 100000)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the descriptions')
+
+    args = parser.parse_args()
+    if not args.benchmark:
+        parser.print_help()
+        sys.exit(1)
+
+    from get_best_models import PREDEFINED_USE_CASES
+    print("=" * 60)
+    print(f"Keyword matcher on {args.count} synthetic descriptions")
+    print("=" * 60)
+    mismatches = run_benchmark(synthetic_descriptions(args.count, PREDEFINED_USE_CASES, args.seed))
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == "__main__":
+    main()
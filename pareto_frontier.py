@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Pareto frontier of use-case quality vs latency/throughput
+Joins use-case scores (create_usecase_scores weights) with latency rows from
+fetch_latency_performance.py or scrape_latency_table.py and returns the
+non-dominated models per use case, plus epsilon-dominance buckets.
+
+Every latency row is a candidate, so a model with per-provider latency rows
+contributes one candidate per provider. The skyline uses an O(n log n)
+sort-and-sweep for 2 or 3 objectives.
+
+Usage:
+    # Quality vs TTFT vs throughput for one use case
+    python3 pareto_frontier.py --usecase code_completion --latency model_latency_performance.csv
+
+    # Quality vs ITL for every predefined use case, with 5% epsilon buckets
+    python3 pareto_frontier.py --objectives score,itl --epsilon 0.05
+"""
+import csv
+import sys
+import argparse
+import numpy as np
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+
+# Objective name -> (candidate field, direction)
+OBJECTIVES = {
+    'score': ('score', 'max'),
+    'ttft': ('ttft_ms', 'min'),
+    'itl': ('itl_ms_per_token', 'min'),
+    'e2e': ('e2e_ms', 'min'),
+    'throughput': ('throughput_tokens_per_sec', 'max'),
+}
+DEFAULT_OBJECTIVES = ['score', 'ttft', 'throughput']
+DEFAULT_LATENCY_FILE = 'model_latency_performance.csv'
+
+# Column names used by fetch_latency_performance.py and scrape_latency_table.py
+LATENCY_COLUMNS = {
+    'model_name': ['Model Name', 'model_name'],
+    'provider': ['Provider', 'provider'],
+    'ttft_ms': ['TTFT (ms)', 'ttft_ms'],
+    'itl_ms_per_token': ['ITL (ms/token)', 'itl_ms_per_token'],
+    'e2e_ms': ['E2E (ms)', 'e2e_ms'],
+    'throughput_tokens_per_sec': ['Throughput (tokens/sec)', 'throughput_tokens_per_sec'],
+}
+
+def _parse_float(value) -> Optional[float]:
+    if value is None or value == '' or value == 'N/A':
+        return None
+    try:
+        return float(str(value).replace(',', ''))
+    except ValueError:
+        return None
+
+def load_latency_data(csv_file: str = DEFAULT_LATENCY_FILE) -> List[Dict]:
+    """Load latency rows from either latency CSV format (one row per model/provider)"""
+    rows = []
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        for raw in csv.DictReader(f):
+            row = {}
+            for field, names in LATENCY_COLUMNS.items():
+                value = next((raw[name] for name in names if name in raw), None)
+                row[field] = value if field in ('model_name', 'provider') else _parse_float(value)
+            if row['model_name']:
+                rows.append(row)
+    return rows
+
+def _minimization_matrix(candidates: List[Dict], objectives: List[str]) -> np.ndarray:
+    """Objective values as a minimization problem (maximized objectives negated)"""
+    points = np.empty((len(candidates), len(objectives)), dtype=np.float64)
+    for k, objective in enumerate(objectives):
+        field, direction = OBJECTIVES[objective]
+        values = np.array([c[field] for c in candidates], dtype=np.float64)
+        points[:, k] = -values if direction == 'max' else values
+    return points
+
+def skyline(points: np.ndarray) -> np.ndarray:
+    """Boolean mask of the non-dominated rows of a minimization problem
+
+    A row is dominated if another row is <= in every objective and differs in
+    at least one; identical rows never dominate each other. 2 and 3 objectives
+    use an O(n log n) sort-and-sweep; more objectives fall back to pairwise checks.
+    """
+    n, d = points.shape
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+
+    # Lexicographic order puts every dominator of a point before it and makes
+    # identical points adjacent; identical points share a fate, so sweep
+    # over the first point of each group only
+    order = np.lexsort(points.T[::-1])
+    ordered = points[order]
+    starts = np.ones(n, dtype=bool)
+    starts[1:] = (ordered[1:] != ordered[:-1]).any(axis=1)
+    unique = ordered[starts]
+    group = np.cumsum(starts) - 1
+    keep = np.zeros(len(unique), dtype=bool)
+
+    if d == 1:
+        keep[0] = True
+    elif d == 2:
+        best_before = np.empty(len(unique))
+        best_before[0] = np.inf
+        best_before[1:] = np.minimum.accumulate(unique[:-1, 1])
+        keep = unique[:, 1] < best_before
+    elif d == 3:
+        # Staircase of earlier points in (y, z): y ascending, z strictly descending
+        stair_y, stair_z = [], []
+        for i, (y, z) in enumerate(unique[:, 1:].tolist()):
+            position = bisect_right(stair_y, y) - 1
+            if position >= 0 and stair_z[position] <= z:
+                continue
+            keep[i] = True
+            insert_at = bisect_left(stair_y, y)
+            end = insert_at
+            while end < len(stair_y) and stair_z[end] >= z:
+                end += 1
+            stair_y[insert_at:end] = [y]
+            stair_z[insert_at:end] = [z]
+    else:
+        for i in range(len(unique)):
+            dominated = (unique[:i] <= unique[i]).all(axis=1)
+            keep[i] = not dominated.any()
+
+    mask = np.empty(n, dtype=bool)
+    mask[order] = keep[group]
+    return mask
+
+def epsilon_buckets(points: np.ndarray, epsilon: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Epsilon-dominance boxes for a minimization problem
+
+    Each objective is cut into boxes of width epsilon x (objective range).
+    Returns (box_ids, on_frontier): the box index vector of each row as an
+    integer id, and whether the row's box is non-dominated among all boxes.
+    """
+    spans = points.max(axis=0) - points.min(axis=0)
+    widths = np.where(spans > 0, spans * epsilon, 1.0)
+    boxes = np.floor((points - points.min(axis=0)) / widths).astype(np.int64)
+    box_ids = np.ravel_multi_index(boxes.T, boxes.max(axis=0) + 1)
+    return box_ids, skyline(boxes.astype(np.float64))
+
+def build_candidates(model_scores: List[Dict], latency_rows: List[Dict]) -> List[Dict]:
+    """Join use-case scores with latency rows on model name (case-insensitive)
+
+    model_scores entries need 'Model Name', 'Provider', 'Dataset' and a 0-1 'score'.
+    """
+    by_name = {}
+    for model in model_scores:
+        by_name.setdefault(model['Model Name'].strip().lower(), model)
+
+    candidates = []
+    for row in latency_rows:
+        model = by_name.get(row['model_name'].strip().lower())
+        if model is None or model.get('score') is None:
+            continue
+        candidate = dict(row)
+        candidate.update({
+            'Model Name': model['Model Name'],
+            'Provider': model['Provider'],
+            'Dataset': model['Dataset'],
+            'score': model['score'],
+            'latency_provider': row.get('provider') or '',
+        })
+        candidates.append(candidate)
+    return candidates
+
+def pareto_frontier(candidates: List[Dict], objectives: List[str] = None,
+                    epsilon: Optional[float] = None) -> List[Dict]:
+    """Non-dominated candidates for the given objectives, best score first
+
+    Candidates missing any objective value are skipped. With epsilon, each
+    returned candidate also carries its 'epsilon_bucket' id and whether that
+    bucket is on the epsilon-frontier.
+    """
+    objectives = objectives or DEFAULT_OBJECTIVES
+    for objective in objectives:
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective: {objective}. Available: {list(OBJECTIVES.keys())}")
+    fields = [OBJECTIVES[o][0] for o in objectives]
+    complete = [c for c in candidates if all(c.get(f) is not None for f in fields)]
+    if not complete:
+        return []
+
+    points = _minimization_matrix(complete, objectives)
+    on_frontier = skyline(points)
+    if epsilon is not None:
+        box_ids, box_on_frontier = epsilon_buckets(points, epsilon)
+
+    frontier = []
+    for i in np.flatnonzero(on_frontier):
+        candidate = dict(complete[i])
+        if epsilon is not None:
+            candidate['epsilon_bucket'] = int(box_ids[i])
+            candidate['epsilon_frontier'] = bool(box_on_frontier[i])
+        frontier.append(candidate)
+    frontier.sort(key=lambda c: c['score'], reverse=True)
+    return frontier
+
+def usecase_model_scores(matrix, weights: Dict[str, float]) -> List[Dict]:
+    """Use-case scores for every model in a ScoreMatrix, as pareto_frontier input"""
+    scores = matrix.score_weights(weights)
+    models = []
+    for i, model in enumerate(matrix.models):
+        if not np.isnan(scores[i]):
+            models.append({**model, 'score': float(scores[i])})
+    return models
+
+def save_frontier(frontier: List[Dict], objectives: List[str], output_file: str, epsilon: Optional[float] = None):
+    """Save a frontier to CSV"""
+    metric_columns = [OBJECTIVES[o][0] for o in objectives if o != 'score']
+    fieldnames = ['Model Name', 'Provider', 'Dataset', 'Latency Provider', 'Use Case Score'] + metric_columns
+    if epsilon is not None:
+        fieldnames += ['Epsilon Bucket', 'Epsilon Frontier']
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for c in frontier:
+            row = {
+                'Model Name': c['Model Name'],
+                'Provider': c['Provider'],
+                'Dataset': c['Dataset'],
+                'Latency Provider': c.get('latency_provider', ''),
+                'Use Case Score': f"{c['score'] * 100:.2f}%",
+            }
+            for column in metric_columns:
+                row[column] = c.get(column)
+            if epsilon is not None:
+                row['Epsilon Bucket'] = c['epsilon_bucket']
+                row['Epsilon Frontier'] = c['epsilon_frontier']
+            writer.writerow(row)
+
+def main():
+    from benchmark_snapshot import load_score_matrix
+    from create_usecase_scores import MASTER_CSV, USE_CASE_WEIGHTS
+
+    parser = argparse.ArgumentParser(
+        description='Pareto frontier of use-case quality vs latency/throughput',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""
+Examples:
+  python3 pareto_frontier.py --usecase code_completion
+  python3 pareto_frontier.py --usecase chatbot_conversational --objectives score,ttft
+  python3 pareto_frontier.py --latency scraped_latency_data.csv --objectives score,itl,throughput --epsilon 0.05
+
+Objectives: {', '.join(OBJECTIVES.keys())} (score and throughput are maximized, latencies minimized)
+        """
+    )
+    parser.add_argument('--usecase', '-u', type=str, help='Predefined use case (default: all)')
+    parser.add_argument('--latency', '-l', type=str, default=DEFAULT_LATENCY_FILE, help=f'Latency CSV (default: {DEFAULT_LATENCY_FILE})')
+    parser.add_argument('--objectives', type=str, default=','.join(DEFAULT_OBJECTIVES), help='Comma-separated objectives')
+    parser.add_argument('--epsilon', type=float, help='Epsilon-dominance bucket width as a fraction of each objective range')
+    parser.add_argument('--output-dir', type=str, default='.', help='Directory for pareto_<usecase>.csv files')
+
+    args = parser.parse_args()
+    objectives = [o.strip() for o in args.objectives.split(',') if o.strip()]
+
+    if args.usecase and args.usecase not in USE_CASE_WEIGHTS:
+        print(f"Error: Unknown use case {args.usecase}. Available: {list(USE_CASE_WEIGHTS.keys())}")
+        sys.exit(1)
+    try:
+        latency_rows = load_latency_data(args.latency)
+    except FileNotFoundError:
+        print(f"Error: {args.latency} not found. Run fetch_latency_performance.py or scrape_latency_table.py first.")
+        sys.exit(1)
+
+    matrix = load_score_matrix(MASTER_CSV)
+    usecases = [args.usecase] if args.usecase else list(USE_CASE_WEIGHTS.keys())
+
+    print("=" * 70)
+    print(f"  Pareto Frontier: {' vs '.join(objectives)}")
+    print("=" * 70)
+    print(f"Latency rows: {len(latency_rows)} from {args.latency}")
+
+    for usecase_name in usecases:
+        models = usecase_model_scores(matrix, USE_CASE_WEIGHTS[usecase_name]['weights'])
+        candidates = build_candidates(models, latency_rows)
+        frontier = pareto_frontier(candidates, objectives, args.epsilon)
+        output_file = f"{args.output_dir}/pareto_{usecase_name}.csv"
+        save_frontier(frontier, objectives, output_file, args.epsilon)
+
+        print(f"\n{usecase_name}: {len(frontier)} non-dominated of {len(candidates)} candidates → {output_file}")
+        for c in frontier[:10]:
+            metrics = ', '.join(f"{o}={c[OBJECTIVES[o][0]]:.2f}" for o in objectives if o != 'score')
+            print(f"    {c['Model Name']} [{c.get('latency_provider') or '-'}]: {c['score'] * 100:.2f}% ({metrics})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Thin client for ranking_daemon.py
+Only uses the standard library, so asking a running daemon for rankings never
+loads torch, the embedding model or the benchmark CSVs in the calling process.
+
+The CLIs (get_best_models_semantic.py, get_models_from_json.py,
+extract_and_match_usecase.py) call daemon_available() and use the daemon
+automatically, falling back to in-process ranking when a request fails. Set
+RANKING_DAEMON=off to always compute rankings in-process.
+
+The daemon reads the benchmark CSVs relative to its own working directory.
+Requests carry the caller's absolute working directory, and a daemon started
+in another directory counts as unavailable.
+"""
+import json
+import os
+import socket
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_HTTP_HOST = '127.0.0.1'
+DEFAULT_HTTP_PORT = 8765
+CONNECT_TIMEOUT = 0.2
+REQUEST_TIMEOUT = 120
+
+class DaemonError(RuntimeError):
+    """The daemon answered with an error"""
+
+def default_socket_path() -> str:
+    """Per-user Unix socket path (override with RANKING_DAEMON_SOCKET)"""
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    return os.environ.get('RANKING_DAEMON_SOCKET',
+                          os.path.join(tempfile.gettempdir(), f'aa_ranking_daemon_{uid}.sock'))
+
+def default_http_port() -> int:
+    return int(os.environ.get('RANKING_DAEMON_PORT', DEFAULT_HTTP_PORT))
+
+def _unix_request(payload: Dict, socket_path: str) -> Dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(socket_path)
+        sock.settimeout(REQUEST_TIMEOUT)
+        sock.sendall(json.dumps(payload).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError(f"Ranking daemon closed {socket_path} without answering")
+    return json.loads(line)
+
+def _http_request(payload: Dict, port: int) -> Dict:
+    import urllib.request  # only needed without a Unix socket; keeps imports cheap
+    request = urllib.request.Request(
+        f"http://{DEFAULT_HTTP_HOST}:{port}/{payload['op']}",
+        data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+    )
+    with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+        return json.loads(response.read())
+
+def request(payload: Dict, socket_path: Optional[str] = None, port: Optional[int] = None) -> Dict:
+    """Send one request to the daemon (Unix socket when possible, loopback HTTP otherwise)"""
+    payload = {**payload, 'data_dir': os.getcwd()}
+    socket_path = socket_path or default_socket_path()
+    if hasattr(socket, 'AF_UNIX') and os.path.exists(socket_path):
+        response = _unix_request(payload, socket_path)
+    else:
+        response = _http_request(payload, port or default_http_port())
+    if not response.get('ok'):
+        raise DaemonError(response.get('error', 'unknown daemon error'))
+    return response
+
+def ping_daemon(socket_path: Optional[str] = None, port: Optional[int] = None) -> Optional[Dict]:
+    """The ping response of a running ranking daemon, or None"""
+    socket_path = socket_path or default_socket_path()
+    try:
+        if hasattr(socket, 'AF_UNIX') and os.path.exists(socket_path):
+            response = _unix_request({'op': 'ping'}, socket_path)
+        else:
+            import urllib.request
+            url = f"http://{DEFAULT_HTTP_HOST}:{port or default_http_port()}/health"
+            with urllib.request.urlopen(url, timeout=CONNECT_TIMEOUT) as reply:
+                response = json.loads(reply.read())
+    except (OSError, ValueError):
+        return None
+    return response if response.get('ok') else None
+
+def daemon_available(socket_path: Optional[str] = None, port: Optional[int] = None) -> bool:
+    """True if a ranking daemon serving this working directory answers a ping (and RANKING_DAEMON is not 'off')"""
+    if os.environ.get('RANKING_DAEMON', '').lower() in ('off', '0', 'false', 'no'):
+        return False
+    response = ping_daemon(socket_path, port)
+    return response is not None and response.get('data_dir') == os.path.realpath(os.getcwd())
+
+def rank_usecases(usecase_configs: List[Dict], top_k: Optional[int] = None) -> List[Tuple[List[Dict], Dict]]:
+    """(models, match_info) per use case config, as get_best_models_for_usecase returns"""
+    response = request({'op': 'rank', 'use_cases': usecase_configs, 'top_k': top_k})
+    return [(result['models'], result['match_info']) for result in response['results']]
+
+def extract_and_match(user_text: str) -> Dict:
+    """Same result as extract_and_match_usecase.extract_and_match_usecase"""
+    return request({'op': 'extract', 'text': user_text})['result']
+
+def extract_match_and_rank_remote(user_text: str, top_k: Optional[int] = None, cascade: bool = False) -> Dict:
+    """Same result as extract_and_match_usecase.extract_match_and_rank"""
+    return request({'op': 'pipeline', 'text': user_text, 'top_k': top_k, 'cascade': cascade})['result']
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Long-lived ranking daemon
+Keeps the embedding model, the use-case embeddings and the parsed benchmark
+CSVs in memory and answers ranking requests over a Unix socket and a
+loopback-only HTTP port, so a request costs milliseconds instead of a torch
+import plus a full encode pass.
+
+Unix socket protocol: one JSON request per line, one JSON response per line.
+HTTP: POST the same JSON to /rank, /extract, /pipeline or /reload, GET /health.
+
+The benchmark CSVs are read relative to the directory the daemon was started
+in. Requests may carry "data_dir" (ranking_client sends the caller's working
+directory); a daemon started elsewhere answers them with an error, so the
+caller ranks in-process instead of getting another directory's data. Any
+failure while handling a request is logged and answered with {"ok": false}.
+
+Requests:
+    {"op": "ping"}
+    {"op": "rank", "use_case": {...}, "top_k": 10}      (or "use_cases": [...],
+                                                          same configs as process_json_config)
+    {"op": "extract", "text": "I need a chatbot for 100 users"}
+    {"op": "pipeline", "text": "I need a chatbot for 100 users", "top_k": 10, "cascade": false}
+                                                         (extract + match + rank in one request)
+    {"op": "reload"}                                     (drop cached benchmark data)
+
+Usage:
+    python3 ranking_daemon.py
+    python3 ranking_daemon.py --port 9000 --socket /tmp/ranking.sock
+"""
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+import get_best_models_semantic as semantic
+import extract_and_match_usecase
+from ranking_client import DEFAULT_HTTP_HOST, default_http_port, default_socket_path, ping_daemon
+
+class RankingService:
+    """Warm ranking state shared by the Unix socket and HTTP front ends"""
+
+    def __init__(self, verbose: bool = False):
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.started = time.time()
+        self.data_dir = os.path.realpath(os.getcwd())
+        # extract_and_match_usecase shares the model and these embeddings
+        self.use_case_embeddings = extract_and_match_usecase.generate_use_case_embeddings()
+        semantic.get_embedding_model()
+
+    def reload(self):
+        """Drop cached benchmark data and rankings so the next request re-reads them
+
+        Changed CSVs are picked up automatically; this is for forcing it.
+        """
+        semantic._usecase_registry = None
+        semantic._ranking_cache.clear()
+
+    def handle(self, payload: Dict) -> Dict:
+        op = payload.get('op', 'rank')
+        with self.lock:
+            self.requests += 1
+
+            # The ranking functions print progress for the CLIs; keep the daemon log clean
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output if not self.verbose else sys.stdout):
+                if op == 'ping':
+                    return {'ok': True, 'requests': self.requests, 'uptime': time.time() - self.started,
+                            'data_dir': self.data_dir, 'cache': semantic.cache_stats()}
+                data_dir = payload.get('data_dir')
+                if data_dir is not None and os.path.realpath(data_dir) != self.data_dir:
+                    return {'ok': False, 'error': f"Daemon serves data in {self.data_dir}, not {data_dir}"}
+                if op == 'reload':
+                    self.reload()
+                    return {'ok': True}
+                if op == 'extract':
+                    text = payload.get('text', '')
+                    return {'ok': True, 'result': extract_and_match_usecase.extract_and_match_usecase(text)}
+                if op == 'pipeline':
+                    text = payload.get('text', '')
+                    return {'ok': True, 'result': extract_and_match_usecase.extract_match_and_rank(
+                        text, top_k=payload.get('top_k'), cascade=bool(payload.get('cascade')))}
+                if op == 'rank':
+                    results = []
+                    for usecase_config in semantic.usecase_configs_from_data(payload):
+                        models, match_info = semantic.get_best_models_for_usecase(
+                            usecase_config, self.use_case_embeddings, top_k=payload.get('top_k'))
+                        results.append({'name': usecase_config.get('name', 'unknown'),
+                                        'models': models, 'match_info': match_info})
+                    return {'ok': True, 'results': results}
+        return {'ok': False, 'error': f"Unknown op: {op}"}
+
+    def safe_handle(self, payload: Dict) -> Dict:
+        """handle(), with any exception logged and turned into an error response"""
+        try:
+            return self.handle(payload)
+        except Exception as e:
+            print(f"✗ {payload.get('op', 'rank')} request failed:", file=sys.stderr)
+            traceback.print_exc()
+            return {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+
+class UnixRequestHandler(socketserver.StreamRequestHandler):
+    """Newline-delimited JSON requests on the Unix socket"""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = self.server.service.safe_handle(json.loads(line))
+            except json.JSONDecodeError as e:
+                response = {'ok': False, 'error': f"Invalid JSON: {e}"}
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+class HTTPRequestHandler(BaseHTTPRequestHandler):
+    """JSON over loopback HTTP: POST /rank, /extract, /pipeline, /reload and GET /health"""
+
+    def _send(self, status: int, response: Dict):
+        body = json.dumps(response).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/health':
+            self._send(200, self.server.service.safe_handle({'op': 'ping'}))
+        else:
+            self._send(404, {'ok': False, 'error': f"Not found: {self.path}"})
+
+    def do_POST(self):
+        op = self.path.strip('/')
+        if op not in ('rank', 'extract', 'pipeline', 'reload'):
+            self._send(404, {'ok': False, 'error': f"Not found: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send(400, {'ok': False, 'error': f"Invalid JSON: {e}"})
+            return
+        payload['op'] = op
+        response = self.server.service.safe_handle(payload)
+        self._send(200 if response.get('ok') else 400, response)
+
+    def log_message(self, format, *args):
+        if self.server.service.verbose:
+            super().log_message(format, *args)
+
+class UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def serve(socket_path: str, port: int, use_unix: bool = True, use_http: bool = True, verbose: bool = False):
+    """Warm up and serve until interrupted"""
+    if ping_daemon(socket_path, port) is not None:
+        print(f"Error: a ranking daemon is already running ({socket_path if use_unix else f'port {port}'})")
+        sys.exit(1)
+
+    print("=" * 60)
+    print("Ranking Daemon")
+    print("=" * 60)
+    start = time.time()
+    service = RankingService(verbose=verbose)
+    print(f"\n✓ Warm in {time.time() - start:.1f}s")
+
+    servers = []
+    if use_unix and hasattr(socket, 'AF_UNIX'):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)  # stale socket from a daemon that did not shut down cleanly
+        unix_server = UnixServer(socket_path, UnixRequestHandler)
+        os.chmod(socket_path, 0o600)
+        unix_server.service = service
+        servers.append(unix_server)
+        print(f"  Unix socket: {socket_path}")
+    if use_http:
+        http_server = ThreadingHTTPServer((DEFAULT_HTTP_HOST, port), HTTPRequestHandler)
+        http_server.daemon_threads = True
+        http_server.service = service
+        servers.append(http_server)
+        print(f"  HTTP: http://{DEFAULT_HTTP_HOST}:{port}")
+    if not servers:
+        print("Error: nothing to serve (enable the Unix socket or HTTP)")
+        sys.exit(1)
+
+    # Clean up the socket on `kill` as well as Ctrl-C
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    threads = [threading.Thread(target=server.serve_forever, daemon=True) for server in servers]
+    for thread in threads:
+        thread.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+        if use_unix and os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Serve use-case model rankings from a warm, long-lived process',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 ranking_daemon.py
+  curl -s localhost:8765/rank -d '{"use_case": {"type": "custom", "name": "ide", "description": "code autocomplete"}, "top_k": 5}'
+
+Once running, get_best_models_semantic.py, get_models_from_json.py and
+extract_and_match_usecase.py use it automatically (RANKING_DAEMON=off disables).
+        """
+    )
+    parser.add_argument('--socket', type=str, default=default_socket_path(), help='Unix socket path')
+    parser.add_argument('--port', type=int, default=default_http_port(), help='Loopback HTTP port')
+    parser.add_argument('--no-unix', action='store_true', help='Do not listen on the Unix socket')
+    parser.add_argument('--no-http', action='store_true', help='Do not listen on HTTP')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Log requests and ranking output')
+
+    args = parser.parse_args()
+    serve(args.socket, args.port, use_unix=not args.no_unix, use_http=not args.no_http, verbose=args.verbose)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Columnar score matrix for use-case scoring
+Loads opensource_all_benchmarks.csv once into a model x benchmark matrix with
+a missing-value mask and scores all models against any number of weight
+vectors at once. weighted_sums adds up the masked, weighted columns one
+benchmark at a time, in each weight dict's own key order, exactly like
+calculate_usecase_score, so the CSVs round identically. The matrix is
+float64, not float32: float32 sums change the rounded percentages of some
+models. Sampled weight vectors (weight sensitivity) need no particular
+order and use a plain matrix product.
+"""
+import csv
+import hashlib
+import numpy as np
+from typing import Dict, List, Optional
+
+# Benchmark columns in opensource_all_benchmarks.csv (same order as the fetch export)
+BENCHMARK_COLUMNS = [
+    'aime',
+    'aime_25',
+    'artificial_analysis_coding_index',
+    'artificial_analysis_intelligence_index',
+    'artificial_analysis_math_index',
+    'gpqa',
+    'hle',
+    'ifbench',
+    'lcr',
+    'livecodebench',
+    'math_500',
+    'mmlu_pro',
+    'scicode',
+    'tau2',
+    'terminalbench_hard',
+]
+
+# Benchmark names that take part in use-case scoring, mapped to CSV column names.
+# Benchmarks not listed here (aime, aime_25, math_500) are ignored when scoring.
+BENCHMARK_COLUMN_MAP = {
+    'mmlu_pro': 'mmlu_pro',
+    'hle': 'hle',
+    'ifbench': 'ifbench',
+    'lcr': 'lcr',
+    'gpqa': 'gpqa',
+    'livecodebench': 'livecodebench',
+    'scicode': 'scicode',
+    'terminalbench_hard': 'terminalbench_hard',
+    'tau2': 'tau2',
+    'artificial_analysis_intelligence_index': 'artificial_analysis_intelligence_index',
+    'artificial_analysis_coding_index': 'artificial_analysis_coding_index',
+    'artificial_analysis_math_index': 'artificial_analysis_math_index',
+}
+
+MODEL_FIELDS = ['Model Name', 'Provider', 'Dataset']
+
+def parse_percentage(value):
+    """Parse percentage string to float (0-1)"""
+    if value == 'N/A' or not value:
+        return None
+    try:
+        # Remove % and convert
+        clean = str(value).replace('%', '').strip()
+        num = float(clean)
+        # If > 1, assume it's already a percentage, convert to decimal
+        if num > 1:
+            return num / 100.0
+        return num
+    except (ValueError, TypeError):
+        return None
+
+class ScoreMatrix:
+    """Model x benchmark score matrix with a missing-value mask
+
+    scores[i, j] holds the 0-1 score of model i on benchmark j (0.0 where
+    missing) and mask[i, j] is True where the score is present.
+    """
+
+    def __init__(self, models: List[Dict], benchmarks: List[str], scores: np.ndarray, mask: np.ndarray):
+        self.models = models
+        self.benchmarks = list(benchmarks)
+        self.scores = scores
+        self.mask = mask
+        self.benchmark_index = {name: j for j, name in enumerate(self.benchmarks)}
+
+    def __len__(self):
+        return len(self.models)
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict], benchmarks: List[str] = None) -> 'ScoreMatrix':
+        """Build a matrix from csv.DictReader rows"""
+        benchmarks = benchmarks or BENCHMARK_COLUMNS
+        scores = np.zeros((len(rows), len(benchmarks)), dtype=np.float64)
+        mask = np.zeros((len(rows), len(benchmarks)), dtype=bool)
+        models = []
+
+        for i, row in enumerate(rows):
+            models.append({field: row.get(field, '') for field in MODEL_FIELDS})
+            for j, benchmark in enumerate(benchmarks):
+                score = parse_percentage(row.get(benchmark, 'N/A'))
+                if score is not None:
+                    scores[i, j] = score
+                    mask[i, j] = True
+
+        return cls(models, benchmarks, scores, mask)
+
+    @classmethod
+    def from_csv(cls, csv_file: str = 'opensource_all_benchmarks.csv') -> 'ScoreMatrix':
+        """Load the master benchmark CSV, parsing every cell exactly once"""
+        with open(csv_file, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+        benchmarks = [b for b in BENCHMARK_COLUMNS if b in (reader.fieldnames or [])]
+        return cls.from_rows(rows, benchmarks)
+
+    def weight_vector(self, weights: Dict[str, float]) -> np.ndarray:
+        """Map a {benchmark: weight} dict onto the matrix columns"""
+        vector = np.zeros(len(self.benchmarks), dtype=np.float64)
+        for benchmark, weight in weights.items():
+            column_name = BENCHMARK_COLUMN_MAP.get(benchmark)
+            if column_name is None or column_name not in self.benchmark_index:
+                continue
+            vector[self.benchmark_index[column_name]] += weight
+        return vector
+
+    def weight_matrix(self, weights_list: List[Dict[str, float]]) -> np.ndarray:
+        """Stack K weight dicts into a K x B weight matrix"""
+        if not weights_list:
+            return np.zeros((0, len(self.benchmarks)), dtype=np.float64)
+        return np.vstack([self.weight_vector(w) for w in weights_list])
+
+    def weight_order(self, weights: Dict[str, float]) -> np.ndarray:
+        """Column indices in the order calculate_usecase_score visits them
+
+        The dict's own benchmarks come first, in key order, followed by the
+        remaining (zero-weight) columns.
+        """
+        order = []
+        for benchmark in weights:
+            j = self.benchmark_index.get(BENCHMARK_COLUMN_MAP.get(benchmark))
+            if j is not None and j not in order:
+                order.append(j)
+        order.extend(j for j in range(len(self.benchmarks)) if j not in order)
+        return np.array(order, dtype=np.int64)
+
+    def score(self, weight_matrix: np.ndarray, orders: Optional[np.ndarray] = None) -> np.ndarray:
+        """Score every model against K weight vectors
+
+        Returns an N x K float64 array. Each model's weights are renormalized
+        over the benchmarks it actually has; models with none of the weighted
+        benchmarks get NaN. With orders (K x B column indices, see weight_order)
+        weighted_sums accumulates the columns one at a time in that order,
+        which reproduces calculate_usecase_score to the last bit; without,
+        the sums are one matrix product.
+        """
+        numerator, denominator = weighted_sums(self.scores, self.mask, weight_matrix, orders)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = numerator / denominator
+        result[denominator <= 0] = np.nan
+        return result
+
+    def score_configs(self, weights_list: List[Dict[str, float]]) -> np.ndarray:
+        """Score every model against K {benchmark: weight} dicts (N x K, same values as calculate_usecase_score)"""
+        if not weights_list:
+            return np.zeros((len(self), 0), dtype=np.float64)
+        orders = np.vstack([self.weight_order(w) for w in weights_list])
+        return self.score(self.weight_matrix(weights_list), orders)
+
+    def score_weights(self, weights: Dict[str, float]) -> np.ndarray:
+        """Score every model against a single {benchmark: weight} dict"""
+        return self.score_configs([weights])[:, 0]
+
+    def sorted_index(self) -> 'SortedBenchmarkIndex':
+        """Per-benchmark descending sorted indexes (built once, then cached)"""
+        if getattr(self, '_sorted_index', None) is None:
+            self._sorted_index = SortedBenchmarkIndex(self)
+        return self._sorted_index
+
+    def top_k(self, weights: Dict[str, float], k: int):
+        """Top-k models for a {benchmark: weight} dict; see SortedBenchmarkIndex.top_k"""
+        return self.sorted_index().top_k(self.weight_vector(weights), k, order=self.weight_order(weights))
+
+    def column_hashes(self) -> Dict[str, str]:
+        """Content hash of every benchmark column (scores and missing-value mask)"""
+        hashes = {}
+        for j, benchmark in enumerate(self.benchmarks):
+            digest = hashlib.sha256()
+            digest.update(np.ascontiguousarray(self.scores[:, j], dtype='<f8').tobytes())
+            digest.update(np.packbits(self.mask[:, j]).tobytes())
+            hashes[benchmark] = digest.hexdigest()
+        return hashes
+
+    def models_hash(self) -> str:
+        """Content hash of the model rows (name, provider, dataset, in order)"""
+        digest = hashlib.sha256()
+        for model in self.models:
+            digest.update('\x1f'.join(model[field] for field in MODEL_FIELDS).encode('utf-8'))
+            digest.update(b'\x1e')
+        return digest.hexdigest()
+
+def weighted_sums(scores: np.ndarray, mask: np.ndarray, weight_matrix: np.ndarray, orders: Optional[np.ndarray] = None):
+    """(numerator, denominator) of the N x K masked weighted averages
+
+    Without orders both are plain matrix products; with orders (K x B column
+    indices) they are accumulated column by column in each config's order.
+    """
+    weight_matrix = np.atleast_2d(weight_matrix).astype(np.float64)
+    if orders is None:
+        return scores.astype(np.float64) @ weight_matrix.T, mask.astype(np.float64) @ weight_matrix.T
+    numerator = np.zeros((len(scores), len(weight_matrix)), dtype=np.float64)
+    denominator = np.zeros((len(scores), len(weight_matrix)), dtype=np.float64)
+    configs = np.arange(len(weight_matrix))
+    for columns in np.atleast_2d(orders).T:
+        weights = weight_matrix[configs, columns]
+        numerator += scores[:, columns] * weights
+        denominator += mask[:, columns] * weights
+    return numerator, denominator
+
+class SortedBenchmarkIndex:
+    """Per-benchmark descending sorted indexes for threshold-algorithm top-k queries
+
+    order[j] lists the models that have benchmark j, best first (ties in input
+    order). Because scores are renormalized over the benchmarks each model has,
+    the stopping threshold is computed per distinct missing-value pattern: an
+    unseen model with pattern P scores at most the weighted average of the
+    current list frontiers over the weighted benchmarks in P.
+    """
+
+    def __init__(self, matrix: ScoreMatrix):
+        self.matrix = matrix
+        index_dtype = np.int32 if len(matrix) < 2 ** 31 else np.int64
+        self.order = []
+        self.sorted_scores = []
+        for j in range(len(matrix.benchmarks)):
+            present = np.flatnonzero(matrix.mask[:, j]).astype(index_dtype)
+            column = matrix.scores[present, j]
+            ranked = present[np.argsort(-column, kind='stable')]
+            self.order.append(ranked)
+            self.sorted_scores.append(matrix.scores[ranked, j].astype(np.float64))
+        # Distinct missing-value patterns (a handful, even for large catalogs)
+        bits = np.left_shift(1, np.arange(len(matrix.benchmarks), dtype=np.int64))
+        codes = np.unique(np.asarray(matrix.mask, dtype=np.int64) @ bits)
+        self.patterns = (codes[:, np.newaxis] & bits) != 0
+
+    def _threshold(self, weight_vector: np.ndarray, active: np.ndarray, depth: int) -> float:
+        """Upper bound on the score of any model not yet seen at this depth"""
+        frontier = np.zeros(len(weight_vector), dtype=np.float64)
+        exhausted = np.zeros(len(weight_vector), dtype=bool)
+        for j in active:
+            if depth < len(self.order[j]):
+                frontier[j] = self.sorted_scores[j][depth]
+            else:
+                exhausted[j] = True
+
+        # Every model that has an exhausted benchmark has already been seen
+        patterns = self.patterns[~(self.patterns & exhausted).any(axis=1)]
+        weights = patterns * weight_vector
+        totals = weights.sum(axis=1)
+        live = totals > 0
+        if not live.any():
+            return -np.inf
+        return float(((weights[live] @ frontier) / totals[live]).max())
+
+    def top_k(self, weight_vector: np.ndarray, k: int, batch_size: int = 256, order: Optional[np.ndarray] = None):
+        """Top-k (model index, score) pairs for a weight vector, best first
+
+        Walks the weighted benchmarks' sorted lists in lockstep, scoring newly
+        seen models from the matrix, and stops as soon as the k-th best score
+        beats the threshold for unseen models. Models without any weighted
+        benchmark are never returned. order is the accumulation order passed
+        on to ScoreMatrix.score. Returns (indices, scores, models_scored).
+        """
+        matrix = self.matrix
+        weight_vector = np.asarray(weight_vector, dtype=np.float64)
+        orders = None if order is None else np.asarray(order)[np.newaxis, :]
+        active = np.flatnonzero(weight_vector)
+        if k <= 0 or len(active) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0), 0
+        if (weight_vector < 0).any():
+            # Negative weights break monotonicity; fall back to a full scan
+            scores = matrix.score(weight_vector[np.newaxis, :], orders)[:, 0]
+            ranked = [i for i in rank_order(scores) if not np.isnan(scores[i])][:k]
+            return np.array(ranked, dtype=np.int64), scores[ranked], len(matrix)
+
+        seen = np.zeros(len(matrix), dtype=bool)
+        best_indices = np.zeros(0, dtype=np.int64)
+        best_scores = np.zeros(0, dtype=np.float64)
+        max_depth = max(len(self.order[j]) for j in active)
+        depth = 0
+
+        while depth < max_depth:
+            batch = np.concatenate([self.order[j][depth:depth + batch_size] for j in active])
+            batch = np.unique(batch[~seen[batch]])
+            seen[batch] = True
+            depth += batch_size
+
+            if len(batch):
+                numerator, denominator = weighted_sums(matrix.scores[batch], matrix.mask[batch],
+                                                       weight_vector, orders)
+                numerator, denominator = numerator[:, 0], denominator[:, 0]
+                scored = denominator > 0
+                candidates = np.concatenate([best_indices, batch[scored].astype(np.int64)])
+                candidate_scores = np.concatenate([best_scores, numerator[scored] / denominator[scored]])
+                keep = np.lexsort((candidates, -candidate_scores))[:k]
+                best_indices = candidates[keep]
+                best_scores = candidate_scores[keep]
+
+            if len(best_scores) >= k and best_scores[-1] > self._threshold(weight_vector, active, depth):
+                break
+
+        return best_indices, best_scores, int(seen.sum())
+
+def rank_order(scores: np.ndarray) -> np.ndarray:
+    """Descending order of a score column, missing scores last, ties in input order"""
+    raw = np.nan_to_num(scores, nan=0.0)
+    return np.argsort(-raw, kind='stable')
+
+def top_k_order(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k best scored entries of a score column (same order as rank_order, NaN excluded)"""
+    raw = np.where(np.isnan(scores), -np.inf, scores)
+    scored = int(np.isfinite(raw).sum())
+    k = min(k, scored)
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    kth = np.partition(raw, len(raw) - k)[len(raw) - k]
+    candidates = np.flatnonzero(raw >= kth)
+    candidates = candidates[np.lexsort((candidates, -raw[candidates]))]
+    return candidates[:k]
+
+def format_score(score: Optional[float]) -> str:
+    """Format a 0-1 score the way the use-case CSVs store it"""
+    if score is None or np.isnan(score):
+        return 'N/A'
+    return f"{score * 100:.2f}%"
+
+def score_all_usecases(matrix: ScoreMatrix, usecase_weights: Dict[str, Dict]) -> Dict[str, np.ndarray]:
+    """Score every use case in a USE_CASE_WEIGHTS-style dict in one vectorized pass"""
+    names = list(usecase_weights.keys())
+    scores = matrix.score_configs([usecase_weights[name]['weights'] for name in names])
+    return {name: scores[:, k] for k, name in enumerate(names)}
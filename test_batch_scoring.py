@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Equivalence tests for batch scoring of many weight configs
+score_usecase_batch must yield, for every config and whatever the chunk
+size, exactly the scores and ranking that calculate_usecase_score and
+rank_order give one config at a time; --batch files round-trip through
+iter_batch_configs and write_batch_rankings
+"""
+import contextlib
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from create_usecase_scores import (
+    MASTER_CSV,
+    USE_CASE_WEIGHTS,
+    calculate_usecase_score,
+    iter_batch_configs,
+    score_usecase_batch,
+    write_batch_rankings,
+)
+from score_matrix import BENCHMARK_COLUMNS, ScoreMatrix, format_score, rank_order
+
+def read_rows():
+    with open(MASTER_CSV, 'r', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+def reference_scores(rows, weights):
+    """Per-row scores from the original scorer, NaN where a model has none of the benchmarks"""
+    scores = [calculate_usecase_score(row, weights) for row in rows]
+    return np.array([np.nan if score is None else score for score in scores])
+
+def random_configs(n: int, seed: int = 0):
+    """Custom configs over random benchmark subsets, in random key order, some unnormalized"""
+    rng = np.random.default_rng(seed)
+    configs = []
+    for k in range(n):
+        size = int(rng.integers(1, len(BENCHMARK_COLUMNS) + 1))
+        benchmarks = rng.permutation(BENCHMARK_COLUMNS)[:size]
+        weights = {str(b): float(w) for b, w in zip(benchmarks, rng.random(size) * rng.choice([0.1, 1.0, 10.0]))}
+        configs.append((f"random_{k}", {'description': '', 'weights': weights}))
+    # Only benchmarks that take no part in scoring: every model is unscored
+    configs.append(('unscored', {'description': '', 'weights': {'aime': 0.5, 'math_500': 0.5}}))
+    return configs
+
+def all_configs():
+    return list(USE_CASE_WEIGHTS.items()) + random_configs(40)
+
+def test_batch_matches_reference():
+    """Full rankings equal per-config scoring for chunk sizes that split the batch unevenly"""
+    rows = read_rows()
+    matrix = ScoreMatrix.from_rows(rows)
+    configs = all_configs()
+    for chunk_size in (1, 7, len(configs)):
+        results = list(score_usecase_batch(configs, matrix, chunk_size=chunk_size))
+        assert [name for name, *_ in results] == [name for name, _ in configs]
+        for name, weights_config, order, scores in results:
+            expected = reference_scores(rows, weights_config['weights'])
+            np.testing.assert_array_equal(matrix.score_weights(weights_config['weights']), expected, err_msg=name)
+            assert list(order) == list(rank_order(expected)), f"chunk_size={chunk_size} {name}"
+            np.testing.assert_array_equal(scores, expected[order], err_msg=name)
+
+def test_batch_top_k():
+    """top_k keeps the first k scored entries of the full ranking"""
+    rows = read_rows()
+    matrix = ScoreMatrix.from_rows(rows)
+    for top_k in (1, 5, len(rows) + 10):
+        for name, weights_config, order, scores in score_usecase_batch(all_configs(), matrix, top_k=top_k, chunk_size=5):
+            expected = reference_scores(rows, weights_config['weights'])
+            ranked = [i for i in rank_order(expected) if not np.isnan(expected[i])][:top_k]
+            assert list(order) == ranked, f"top_k={top_k} {name}"
+            np.testing.assert_array_equal(scores, expected[ranked], err_msg=name)
+
+def test_batch_file_round_trip():
+    """A JSONL batch of predefined and custom configs is written as one ranked NDJSON record per line"""
+    rows = read_rows()
+    lines = [
+        {'use_case': {'type': 'predefined', 'name': 'translation'}},
+        {'type': 'custom', 'name': 'agentic', 'weights': {'tau2': 2, 'terminalbench_hard': 1}},
+        {'type': 'custom', 'name': 'typo', 'weights': {'mmlu_pro': 1, 'not_a_benchmark': 1}},
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        batch_file = os.path.join(tmp_dir, 'batch.jsonl')
+        output_file = os.path.join(tmp_dir, 'rankings.ndjson')
+        with open(batch_file, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(json.dumps(line) for line in lines[:2]) + '\n\n' + json.dumps(lines[2]) + '\n')
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            count = write_batch_rankings(iter_batch_configs(batch_file), output_file, ScoreMatrix.from_rows(rows), top_k=3)
+        with open(output_file, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        assert count == len(records) == 3
+        assert [r['name'] for r in records] == ['translation', 'agentic', 'typo']
+        assert records[1]['weights'] == {'tau2': 2 / 3, 'terminalbench_hard': 1 / 3}
+        assert records[2]['weights'] == {'mmlu_pro': 1.0}
+        for record in records:
+            expected = reference_scores(rows, record['weights'])
+            ranked = [i for i in rank_order(expected) if not np.isnan(expected[i])][:3]
+            assert [r['Model Name'] for r in record['rankings']] == [rows[i]['Model Name'] for i in ranked]
+            assert [r['Use Case Score'] for r in record['rankings']] == [format_score(expected[i]) for i in ranked]
+            assert [r['rank'] for r in record['rankings']] == [1, 2, 3]
+
+        with open(batch_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'type': 'custom', 'name': 'empty', 'weights': {}}) + '\n')
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                list(iter_batch_configs(batch_file))
+        except ValueError as e:
+            assert f"{batch_file}:5:" in str(e), e
+        else:
+            raise AssertionError("a config without weights was accepted")
+
+def main():
+    print("=" * 70)
+    print("  Batch Scoring (vs per-config reference)")
+    print("=" * 70)
+    try:
+        test_batch_matches_reference()
+        test_batch_top_k()
+        test_batch_file_round_trip()
+    except AssertionError as e:
+        print(f"\n✗ {e}")
+        return False
+    print("\n✓ All batch scoring tests passed")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
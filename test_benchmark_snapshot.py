@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests for the memory-mapped benchmark snapshot
+A snapshot written from the master CSV must load back to the same matrix the
+CSV parser builds, load_score_matrix must only use it while it is at least as
+new as the CSV, and foreign or future-version files must be rejected
+"""
+import contextlib
+import io
+import os
+import struct
+import sys
+import tempfile
+
+import numpy as np
+
+from benchmark_snapshot import (
+    SNAPSHOT_VERSION,
+    load_score_matrix,
+    load_snapshot,
+    write_snapshot,
+    write_snapshot_from_csv,
+)
+from create_usecase_scores import MASTER_CSV, USE_CASE_WEIGHTS
+from fetch_opensource_all_benchmarks import export_to_csv
+from score_matrix import ScoreMatrix
+
+def assert_same_matrix(actual: ScoreMatrix, expected: ScoreMatrix):
+    assert actual.benchmarks == expected.benchmarks, (actual.benchmarks, expected.benchmarks)
+    assert list(actual.models) == list(expected.models)
+    np.testing.assert_array_equal(actual.mask, expected.mask)
+    np.testing.assert_array_equal(actual.scores, expected.scores)
+
+def test_round_trip_master_csv():
+    """Snapshot of the master CSV == parsed CSV, and scores every use case identically"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, 'master.snapshot')
+        parsed = write_snapshot_from_csv(MASTER_CSV, filename)
+        snapshot = load_snapshot(filename)
+        assert_same_matrix(snapshot, parsed)
+        assert snapshot.column_hashes() == parsed.column_hashes()
+        assert snapshot.models_hash() == parsed.models_hash()
+        for name, config in USE_CASE_WEIGHTS.items():
+            np.testing.assert_array_equal(snapshot.score_weights(config['weights']),
+                                          parsed.score_weights(config['weights']), err_msg=name)
+
+def test_round_trip_edge_values():
+    """Unicode and empty names, repeated strings, missing cells and more than 8 benchmarks"""
+    models = [
+        {'Model Name': 'Modèle ünïcode 模型', 'Provider': 'Acme', 'Dataset': 'Open Source'},
+        {'Model Name': '', 'Provider': 'Acme', 'Dataset': 'Open Source'},
+        {'Model Name': 'x', 'Provider': '', 'Dataset': ''},
+    ]
+    benchmarks = [f"bench_{j}" for j in range(11)]
+    rng = np.random.default_rng(0)
+    scores = rng.random((3, 11)).astype(np.float32)
+    mask = rng.random((3, 11)) > 0.3
+    mask[2] = False  # a model without any score
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, 'edge.snapshot')
+        write_snapshot(models, benchmarks, scores, mask, filename)
+        snapshot = load_snapshot(filename)
+        assert_same_matrix(snapshot, ScoreMatrix(models, benchmarks, np.where(mask, scores, 0.0), mask))
+        assert snapshot.models[0]['Model Name'] == 'Modèle ünïcode 模型'
+        assert snapshot.models[1:] == models[1:]
+
+def test_staleness():
+    """The snapshot is used only while it is at least as new as the CSV"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_file = os.path.join(tmp_dir, 'master.csv')
+        snapshot_file = os.path.join(tmp_dir, 'master.snapshot')
+        with open(MASTER_CSV, 'r', encoding='utf-8') as src, open(csv_file, 'w', encoding='utf-8') as dst:
+            text = src.read()
+            dst.write(text)
+        n_columns = len(text.splitlines()[0].split(','))
+        assert not hasattr(load_score_matrix(csv_file), 'snapshot_buffer')  # no snapshot yet
+
+        write_snapshot_from_csv(csv_file, snapshot_file)
+        csv_mtime = os.path.getmtime(csv_file)
+        os.utime(snapshot_file, (csv_mtime + 10, csv_mtime + 10))
+        assert hasattr(load_score_matrix(csv_file), 'snapshot_buffer')
+
+        # The CSV is rewritten (e.g. by a fresh fetch): the old snapshot is stale
+        with open(csv_file, 'a', encoding='utf-8') as f:
+            f.write('New Model,NewCo,Open Source' + ',N/A' * (n_columns - 3) + '\n')
+        os.utime(csv_file, (csv_mtime + 20, csv_mtime + 20))
+        matrix = load_score_matrix(csv_file)
+        assert not hasattr(matrix, 'snapshot_buffer') and matrix.models[-1]['Model Name'] == 'New Model'
+
+        # A snapshot from another format version is ignored while the CSV exists
+        write_snapshot_from_csv(csv_file, snapshot_file)
+        with open(snapshot_file, 'r+b') as f:
+            f.write(struct.pack('<4sH', b'AABS', SNAPSHOT_VERSION - 1))
+        os.utime(snapshot_file, (csv_mtime + 30, csv_mtime + 30))
+        with contextlib.redirect_stderr(io.StringIO()):
+            assert not hasattr(load_score_matrix(csv_file), 'snapshot_buffer')
+
+        write_snapshot_from_csv(csv_file, snapshot_file)
+        os.remove(csv_file)  # snapshot alone is enough
+        assert hasattr(load_score_matrix(csv_file, snapshot_file), 'snapshot_buffer')
+
+def test_export_snapshot_matches_csv():
+    """The snapshot written by the fetch export holds the CSV's numbers, not the raw API floats"""
+    models = [
+        {'name': 'Tiny', 'provider': 'Acme', 'dataset': 'Open Source',
+         'scores': {'gpqa': 0.008, 'hle': 0.12345, 'mmlu_pro': 0.87543}},
+        {'name': 'Sparse', 'provider': 'Acme', 'dataset': 'Open Source', 'scores': {'lcr': 0.5}},
+        {'name': 'Empty', 'provider': 'Other', 'dataset': 'Open Source', 'scores': {}},
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_file = os.path.join(tmp_dir, 'master.csv')
+        with contextlib.redirect_stdout(io.StringIO()):
+            export_to_csv(models, csv_file)
+        from_snapshot = load_score_matrix(csv_file)
+        assert hasattr(from_snapshot, 'snapshot_buffer')
+        from_csv = ScoreMatrix.from_csv(csv_file)
+        assert_same_matrix(from_snapshot, from_csv)
+        assert from_snapshot.column_hashes() == from_csv.column_hashes()
+        for name, config in USE_CASE_WEIGHTS.items():
+            np.testing.assert_array_equal(from_snapshot.score_weights(config['weights']),
+                                          from_csv.score_weights(config['weights']), err_msg=name)
+
+def test_rejects_foreign_files():
+    """Wrong magic or an unknown format version raise ValueError instead of misreading"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, 'bad.snapshot')
+        with open(filename, 'wb') as f:
+            f.write(b'\0' * 256)
+        for header in (None, struct.pack('<4sH', b'AABS', SNAPSHOT_VERSION + 1)):
+            if header is not None:
+                with open(filename, 'r+b') as f:
+                    f.write(header)
+            try:
+                load_snapshot(filename)
+            except ValueError:
+                continue
+            raise AssertionError(f"loaded a snapshot with header {header!r}")
+
+def main():
+    print("=" * 70)
+    print("  Benchmark Snapshot (round trip, staleness, validation)")
+    print("=" * 70)
+    try:
+        test_round_trip_master_csv()
+        test_round_trip_edge_values()
+        test_staleness()
+        test_export_snapshot_matches_csv()
+        test_rejects_foreign_files()
+    except AssertionError as e:
+        print(f"\n✗ {e}")
+        return False
+    print("\n✓ All snapshot tests passed")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
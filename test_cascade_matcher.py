@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for the keyword-first cascade matcher
+Confident keyword matches are answered without importing the embedding
+packages; ambiguous descriptions and a raised margin fall through to the
+semantic tier
+"""
+import os
+import subprocess
+import sys
+
+from cascade_matcher import KEYWORD_TIER, SEMANTIC_TIER, cascade_tier
+
+def test_cascade_tiers():
+    """Tier selection follows the keyword margin over the runner-up"""
+    tier, matches = cascade_tier("I need translation service for 500 customers")
+    assert tier == KEYWORD_TIER and matches[0][0] == 'translation', (tier, matches[:2])
+    tier, _ = cascade_tier("I need translation service for 500 customers", margin=0.9)
+    assert tier == SEMANTIC_TIER
+    tier, _ = cascade_tier("I need a math problem solver")
+    assert tier == SEMANTIC_TIER
+
+def test_keyword_tier_skips_embedding_model():
+    """A keyword-tier request ranks models without importing torch or sentence-transformers"""
+    code = (
+        "import sys, contextlib, io\n"
+        "from cascade_matcher import get_best_models_cascade\n"
+        "config = {'type': 'custom', 'name': 't', 'description': 'I need translation service for 500 customers'}\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    models, match_info, tier = get_best_models_cascade(config, top_k=3)\n"
+        "heavy = [m for m in ('torch', 'sentence_transformers', 'onnxruntime') if m in sys.modules]\n"
+        "print(tier, len(models), list(match_info), heavy)\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            env=dict(os.environ, RANKING_DAEMON='off'), capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "keyword 3 ['translation'] []", result.stdout
+
+def main():
+    print("=" * 70)
+    print("  Cascade Matcher (keyword tier first, semantic fallback)")
+    print("=" * 70)
+    try:
+        test_cascade_tiers()
+        test_keyword_tier_skips_embedding_model()
+    except AssertionError as e:
+        print(f"\n✗ {e}")
+        return False
+    print("\n✓ All cascade matcher tests passed")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
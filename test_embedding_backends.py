@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Parity test for the ONNX embedding backends
+Verifies that the top-3 use case matches for the test_extract_usecase.py inputs
+are unchanged between the torch, ONNX fp32 and ONNX int8 backends
+"""
+import sys
+import time
+from typing import List
+
+import pytest
+
+from embedding_backends import load_embedding_model
+from embedding_index import EmbeddingIndex
+from extract_and_match_usecase import ALL_CSVS, EMBEDDING_MODEL_NAME, EMBEDDING_MODEL_REVISION
+from extract_usecase_from_text import extract_use_case_description
+from test_extract_usecase import TEST_CASES
+
+REQUIRED_PACKAGES = ['sentence_transformers', 'onnxruntime', 'tokenizers']
+
+def top3_matches(backend: str) -> List[List[str]]:
+    """Top-3 use case/subject names for every test input with one backend"""
+    model = load_embedding_model(EMBEDDING_MODEL_NAME, EMBEDDING_MODEL_REVISION, backend)
+    names = list(ALL_CSVS.keys())
+    index = EmbeddingIndex(names, model.encode([ALL_CSVS[name]['description'] for name in names]))
+    queries = [extract_use_case_description(test_case['input']) for test_case in TEST_CASES]
+    start = time.perf_counter()
+    query_embeddings = model.encode(queries)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"  {backend:10s} encoded {len(queries)} queries in {elapsed:.1f} ms")
+    return [[name for name, _ in matches] for matches in index.rank_batch(query_embeddings, k=3)]
+
+def test_backend_top3_parity():
+    """ONNX fp32 and int8 give the same top-3 matches as torch"""
+    for package in REQUIRED_PACKAGES:
+        pytest.importorskip(package)
+
+    reference = top3_matches('torch')
+    for backend in ('onnx', 'onnx-int8'):
+        matches = top3_matches(backend)
+        for test_case, expected, actual in zip(TEST_CASES, reference, matches):
+            assert actual == expected, f"{backend} top-3 for {test_case['input']!r}: {actual} != torch {expected}"
+        print(f"✓ {backend} top-3 matches identical to torch")
+
+def main():
+    print("=" * 70)
+    print("  Embedding Backend Parity (torch vs ONNX fp32 vs ONNX int8)")
+    print("=" * 70)
+    try:
+        test_backend_top3_parity()
+    except pytest.skip.Exception as e:
+        print(f"\n⚠ Skipped: {e}")
+        return True
+    except AssertionError as e:
+        print(f"\n✗ {e}")
+        return False
+    print("\n✓ All embedding backend parity tests passed")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
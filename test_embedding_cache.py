@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk description embedding cache
+Only uncached texts are encoded, and two processes sharing a cache file keep
+each other's rows instead of overwriting them
+"""
+import sys
+import tempfile
+
+import numpy as np
+
+from embedding_cache import EmbeddingCache
+
+def fake_encode(calls):
+    def encode(texts):
+        calls.extend(texts)
+        return np.array([[len(text), text.count('a'), 1.0] for text in texts], dtype=np.float32)
+    return encode
+
+def test_only_new_texts_are_encoded():
+    """A reopened cache answers from disk and encodes only what it has not seen"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        calls = []
+        first = EmbeddingCache('model', 'r1', cache_dir).encode(['alpha', 'beta'], fake_encode(calls))
+        assert calls == ['alpha', 'beta']
+        again = EmbeddingCache('model', 'r1', cache_dir).encode(['beta', 'gamma', 'alpha'], fake_encode(calls))
+        assert calls == ['alpha', 'beta', 'gamma']
+        np.testing.assert_array_equal(again[[2, 0]], first)
+        assert len(EmbeddingCache('model', 'r2', cache_dir)) == 0  # other revision, other file
+
+def test_concurrent_writers_merge():
+    """Rows saved by another cache instance since loading survive our save"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        calls = []
+        one = EmbeddingCache('model', 'r1', cache_dir)
+        two = EmbeddingCache('model', 'r1', cache_dir)
+        one.encode(['alpha'], fake_encode(calls))
+        two.encode(['beta'], fake_encode(calls))
+        merged = EmbeddingCache('model', 'r1', cache_dir)
+        assert len(merged) == 2
+        vectors = merged.encode(['alpha', 'beta'], fake_encode(calls))
+        assert calls == ['alpha', 'beta']
+        np.testing.assert_array_equal(vectors, fake_encode([])(['alpha', 'beta']))
+
+def main():
+    print("=" * 70)
+    print("  Embedding Cache (incremental encoding, concurrent writers)")
+    print("=" * 70)
+    try:
+        test_only_new_texts_are_encoded()
+        test_concurrent_writers_merge()
+    except AssertionError as e:
+        print(f"\n✗ {e}")
+        return False
+    print("\n✓ All embedding cache tests passed")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-process encoder pool
+Spawned workers load a small stand-in sentence_transformers module (written
+to a temporary directory and put on the workers' path) whose embedding of
+"text-<i>" encodes i, so any shard reordering or offset bug in the
+imap_unordered reassembly shows up as a wrong row; also covers a single
+string, an empty input and the stats() counters
+"""
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+import encoder_pool
+from encoder_pool import EncoderPool
+
+# Shards finish out of order: each one sleeps depending on its first index
+STUB_SENTENCE_TRANSFORMERS = '''
+import os
+import time
+import numpy as np
+
+class SentenceTransformer:
+    def __init__(self, model_name, **kwargs):
+        self.model_name = model_name
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False, **kwargs):
+        indices = [int(text.rsplit('-', 1)[1]) for text in texts]
+        if indices:
+            time.sleep((indices[0] * 7919) % 5 * 0.002)
+        return np.array([[index, len(text), os.getpid()] for index, text in zip(indices, texts)], dtype=np.float32)
+'''
+STUB_TORCH = '''
+def set_num_threads(threads):
+    pass
+'''
+
+def start_pool(stub_dir: str, workers: int, shard_size: int) -> EncoderPool:
+    """Start a pool whose spawned workers import the stub modules from stub_dir
+
+    Spawned workers copy the parent's sys.path, so the stub directory is on it
+    only while the workers start; the test process itself never imports the stubs.
+    """
+    real_available_cores = encoder_pool.available_cores
+    # One worker per (possibly shared) core, so the test also reorders shards on small machines
+    encoder_pool.available_cores = lambda: real_available_cores()[:1] * workers
+    sys.path.insert(0, stub_dir)
+    try:
+        return EncoderPool(workers=workers, shard_size=shard_size, batch_size=16)
+    finally:
+        sys.path.remove(stub_dir)
+        encoder_pool.available_cores = real_available_cores
+
+def write_stubs(stub_dir: str):
+    os.makedirs(os.path.join(stub_dir, 'sentence_transformers'))
+    with open(os.path.join(stub_dir, 'sentence_transformers', '__init__.py'), 'w', encoding='utf-8') as f:
+        f.write(STUB_SENTENCE_TRANSFORMERS)
+    os.makedirs(os.path.join(stub_dir, 'torch'))
+    with open(os.path.join(stub_dir, 'torch', '__init__.py'), 'w', encoding='utf-8') as f:
+        f.write(STUB_TORCH)
+
+def test_shards_reassemble_in_input_order():
+    """5,000 texts in 97-text shards over 3 workers come back in input order"""
+    with tempfile.TemporaryDirectory() as stub_dir:
+        write_stubs(stub_dir)
+        with start_pool(stub_dir, workers=3, shard_size=97) as pool:
+            texts = [f"text-{i}" for i in range(5000)]
+            embeddings = pool.encode(texts)
+            assert embeddings.shape == (5000, 3) and embeddings.dtype == np.float32
+            np.testing.assert_array_equal(embeddings[:, 0], np.arange(5000))
+            np.testing.assert_array_equal(embeddings[:, 1], [len(text) for text in texts])
+            assert len(set(embeddings[:, 2].tolist())) > 1, "every shard ran on one worker"
+
+            # Fewer texts than one shard, a single string and an empty batch
+            np.testing.assert_array_equal(pool.encode(texts[10:15])[:, 0], np.arange(10, 15))
+            single = pool.encode("text-42")
+            assert single.shape == (3,) and single[0] == 42
+            assert pool.encode([]).shape == (0, 0)
+
+            stats = pool.stats()
+            assert stats['workers'] == 3 and len(stats['worker_texts']) == 3
+            assert stats['texts'] == 5000 + 5 + 1 and sum(stats['worker_texts']) == stats['texts']
+            assert stats['shards'] == (5000 + 96) // 97 + 1 + 1
+            assert stats['wall_seconds'] > 0 and stats['encode_seconds'] > 0
+
+def main():
+    print("=" * 70)
+    print("  Encoder Pool (shard reassembly, single/empty input, counters)")
+    print("=" * 70)
+    try:
+        test_shards_reassemble_in_input_order()
+    except AssertionError as e:
+        print(f"\n✗ {e}")
+        return False
+    print("\n✓ All encoder pool tests passed")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
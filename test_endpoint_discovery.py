@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for endpoint discovery in the API clients
+Candidates are probed together once, the working pattern is remembered
+(also across processes via the state file) and only re-probed when it stops
+answering or expires; HTTP runs against a local test server
+"""
+import os
+import sys
+import tempfile
+import time
+
+from endpoint_discovery import EndpointResolver, EndpointState
+from fetch_engine import FetchEngine, _start_test_server, run, run_all
+
+def test_probe_once_then_remembered_endpoint():
+    """N models cost one concurrent probe plus one request per other model"""
+    server, base_url = _start_test_server(latency=0.0, missing=lambda path: not path.endswith('/evaluations'))
+    patterns = [f"{base_url}/v1/models/{{model_id}}/scores", f"{base_url}/v1/models/{{model_id}}/evaluations",
+                f"{base_url}/models/{{model_id}}/scores"]
+    try:
+        with tempfile.TemporaryDirectory() as state_dir:
+            state_file = os.path.join(state_dir, 'endpoints.json')
+            engine = FetchEngine(rate_limit=1000, burst=1000)
+            resolver = EndpointResolver(EndpointState(state_file), engine)
+
+            async def scores(engine, model_id):
+                return await resolver.fetch('get_model_scores', patterns, model_id=model_id)
+
+            results = run_all(scores, [f"m{i}" for i in range(11)], engine=engine)
+            assert results == [{'path': f"/v1/models/m{i}/evaluations"} for i in range(11)], results
+            # The last candidate may be cancelled before it is sent once the second one answers
+            assert len(patterns) - 1 + 10 <= len(server.requests) <= len(patterns) + 10, server.requests
+            assert resolver.probes == 1
+
+            # A new process reads the remembered pattern from the state file
+            del server.requests[:]
+            resolver = EndpointResolver(EndpointState(state_file), engine)
+            assert run(resolver.fetch('get_model_scores', patterns, model_id='x')) == {'path': '/v1/models/x/evaluations'}
+            assert server.requests == [('/v1/models/x/evaluations', None)] and resolver.probes == 0
+
+            # Expired state is re-discovered
+            resolver = EndpointResolver(EndpointState(state_file, ttl=0), engine)
+            run(resolver.fetch('get_model_scores', patterns, model_id='y'))
+            assert resolver.probes == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_remembered_endpoint_that_stops_answering():
+    """A failing remembered pattern triggers a probe of the others and the memo moves"""
+    server, base_url = _start_test_server(latency=0.0, missing=lambda path: path.startswith('/old/'))
+    patterns = [f"{base_url}/new/{{model_id}}", f"{base_url}/old/{{model_id}}"]
+    try:
+        with tempfile.TemporaryDirectory() as state_dir:
+            state = EndpointState(os.path.join(state_dir, 'endpoints.json'))
+            state.remember('get_model_scores', patterns[1])
+            resolver = EndpointResolver(state, FetchEngine(rate_limit=1000, burst=1000))
+            assert run(resolver.fetch('get_model_scores', patterns, model_id='a')) == {'path': '/new/a'}
+            assert state.get('get_model_scores') == patterns[0]
+            assert run(resolver.fetch('get_model_scores', patterns, lambda data: None, model_id='b')) is None
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_probe_does_not_wait_for_slower_candidates():
+    """The preferred answer wins as soon as every candidate ahead of it has failed"""
+    fast, fast_url = _start_test_server(latency=0.0, missing=lambda path: path.startswith('/missing/'))
+    slow, slow_url = _start_test_server(latency=1.5, missing=lambda path: path.startswith('/missing/'))
+    try:
+        with tempfile.TemporaryDirectory() as state_dir:
+            engine = FetchEngine(rate_limit=1000, burst=1000)
+
+            def probe(patterns):
+                resolver = EndpointResolver(EndpointState(os.path.join(state_dir, 'endpoints.json'), ttl=0), engine)
+                start = time.perf_counter()
+                result = run(resolver.fetch('get_model_scores', patterns, model_id='m'))
+                return result, time.perf_counter() - start
+
+            # Preferred answers at once: the slow fallback is not waited for
+            result, elapsed = probe([f"{fast_url}/ok/{{model_id}}", f"{slow_url}/ok/{{model_id}}"])
+            assert result == {'path': '/ok/m'} and elapsed < 1.0, (result, elapsed)
+
+            # A failing preferred candidate is skipped as soon as it fails
+            result, elapsed = probe([f"{fast_url}/missing/{{model_id}}", f"{fast_url}/second/{{model_id}}",
+                                     f"{slow_url}/third/{{model_id}}"])
+            assert result == {'path': '/second/m'} and elapsed < 1.0, (result, elapsed)
+
+            # A slow preferred candidate still beats a fast fallback
+            result, elapsed = probe([f"{slow_url}/first/{{model_id}}", f"{fast_url}/second/{{model_id}}"])
+            assert result == {'path': '/first/m'} and elapsed >= 1.4, (result, elapsed)
+    finally:
+        for server in (fast, slow):
+            server.shutdown()
+            server.server_close()
+
+def main():
+    print("=" * 70)
+    print("  Endpoint Discovery (concurrent probes, remembered patterns)")
+    print("=" * 70)
+    try:
+        test_probe_once_then_remembered_endpoint()
+        test_remembered_endpoint_that_stops_answering()
+        test_probe_does_not_wait_for_slower_candidates()
+    except AssertionError as e:
+        print(f"\n✗ {e}")
+        return False
+    print("\n✓ All endpoint discovery tests passed")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
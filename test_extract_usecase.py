@@ -49,55 +49,57 @@ def test_usecase(input_text: str, expected_fields: list = None, description: str
         traceback.print_exc()
         return None
 
+# Test cases (also used by test_embedding_backends.py)
+TEST_CASES = [
+    {
+        "input": "I need a chatbot for 100 users with high priority",
+        "expected": ["use_case", "user_count", "priority"],
+        "description": "Full information: chatbot, users, priority"
+    },
+    {
+        "input": "I need code autocomplete for my IDE, needs GPU",
+        "expected": ["use_case", "hardware"],
+        "description": "Code completion with hardware requirement"
+    },
+    {
+        "input": "I need a math problem solver for 50 employees",
+        "expected": ["use_case", "user_count"],
+        "description": "Math solver with user count"
+    },
+    {
+        "input": "I need document summarization",
+        "expected": ["use_case"],
+        "description": "Minimal input: only use case"
+    },
+    {
+        "input": "I need a QA medical expert for 200 users, urgent, needs cloud infrastructure",
+        "expected": ["use_case", "user_count", "priority", "hardware"],
+        "description": "Custom use case with all optional fields"
+    },
+    {
+        "input": "I need translation service for 500 customers, medium priority",
+        "expected": ["use_case", "user_count", "priority"],
+        "description": "Translation with users and priority"
+    },
+    {
+        "input": "I need a financial analysis tool",
+        "expected": ["use_case"],
+        "description": "Custom use case (no match to predefined)"
+    },
+    {
+        "input": "I need content generation for 10 team members, low priority, needs server",
+        "expected": ["use_case", "user_count", "priority", "hardware"],
+        "description": "Content generation with all fields"
+    },
+]
+
 def main():
     print("=" * 70)
     print("  Testing Use Case Extraction & Matching")
     print("=" * 70)
     print()
     
-    # Test cases
-    test_cases = [
-        {
-            "input": "I need a chatbot for 100 users with high priority",
-            "expected": ["use_case", "user_count", "priority"],
-            "description": "Full information: chatbot, users, priority"
-        },
-        {
-            "input": "I need code autocomplete for my IDE, needs GPU",
-            "expected": ["use_case", "hardware"],
-            "description": "Code completion with hardware requirement"
-        },
-        {
-            "input": "I need a math problem solver for 50 employees",
-            "expected": ["use_case", "user_count"],
-            "description": "Math solver with user count"
-        },
-        {
-            "input": "I need document summarization",
-            "expected": ["use_case"],
-            "description": "Minimal input: only use case"
-        },
-        {
-            "input": "I need a QA medical expert for 200 users, urgent, needs cloud infrastructure",
-            "expected": ["use_case", "user_count", "priority", "hardware"],
-            "description": "Custom use case with all optional fields"
-        },
-        {
-            "input": "I need translation service for 500 customers, medium priority",
-            "expected": ["use_case", "user_count", "priority"],
-            "description": "Translation with users and priority"
-        },
-        {
-            "input": "I need a financial analysis tool",
-            "expected": ["use_case"],
-            "description": "Custom use case (no match to predefined)"
-        },
-        {
-            "input": "I need content generation for 10 team members, low priority, needs server",
-            "expected": ["use_case", "user_count", "priority", "hardware"],
-            "description": "Content generation with all fields"
-        },
-    ]
+    test_cases = TEST_CASES
     
     results = []
     passed = 0
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Golden-output tests for the single-pass extractor in extract_usecase_from_text
+extract_usecase_json must keep producing the outputs of the original per-field
+extract_* passes, including the description cleanup corner cases, and the
+streaming bulk mode must return them in input order
+"""
+import io
+import json
+import random
+import sys
+
+from extract_usecase_from_text import extract_usecase_json, reference_usecase_json, stream_extract, synthetic_tickets
+
+# Recorded from the per-field implementation before the single-pass scanner
+GOLDEN = [
+    ("I need a chatbot for 100 users with high priority",
+     {"use_case": "I need a chatbot", "user_count": 100, "priority": "high"}),
+    ("I need code autocomplete for my IDE, needs GPU",
+     {"use_case": "I need code autocomplete for my IDE", "hardware": "gpu"}),
+    ("I need a math problem solver for 50 employees",
+     {"use_case": "I need a math problem solver", "user_count": 50}),
+    ("I need document summarization",
+     {"use_case": "I need document summarization"}),
+    ("I need a QA medical expert for 200 users, urgent, needs cloud infrastructure",
+     {"use_case": "I need a QA medical expert", "user_count": 200, "priority": "high", "hardware": "cloud"}),
+    ("I need translation service for 500 customers, medium priority",
+     {"use_case": "I need translation service for 500 customers, medium priority", "user_count": 500,
+      "priority": "medium"}),
+    ("I need a financial analysis tool",
+     {"use_case": "I need a financial analysis tool"}),
+    ("I need content generation for 10 team members, low priority, needs server",
+     {"use_case": "I need content generation for 10 team members", "user_count": 10, "priority": "low",
+      "hardware": "server"}),
+    ("Hi team, our support desk needs a chatbot serving 2500 end users. Critical priority, runs on AWS.",
+     {"use_case": "Hi team, our support desk needs a chatbot serving 2500 end users., runs on AWS.",
+      "user_count": 2500, "priority": "high", "hardware": "cloud"}),
+    ("We want RAG over internal docs for 40 people with low priority on a raspberry pi",
+     {"use_case": "We want RAG over internal docs for on a raspberry pi", "user_count": 40, "priority": "low",
+      "hardware": "edge"}),
+    ("Summarize legal contracts for 0 users and 1000001 customers, nice to have",
+     {"use_case": "Summarize legal contracts and 1000001 customers, nice to have", "priority": "low"}),
+    ("URGENT: CODE COMPLETION FOR 30 USERS, NEEDS GPU",
+     {"use_case": "URGENT: CODE COMPLETION", "user_count": 30, "priority": "high", "hardware": "gpu"}),
+    ("I need a slow workflow tool that should follow standard practice",
+     {"use_case": "I need a slow workflow tool that should follow standard practice", "priority": "medium"}),
+    ("I need a chatbot needs urgent gpu for 20 users",
+     {"use_case": "I need a chatbot", "user_count": 20, "priority": "high", "hardware": "gpu"}),
+    ("I need translation with asap high priority on-premise servers with 16 gb ram",
+     {"use_case": "I need translation with on-premise servers with 16 gb ram", "priority": "high",
+      "hardware": "memory, server"}),
+    ("help", {"use_case": "help"}),
+    ("   ", {"use_case": ""}),
+    ("I need  a\tmodel,, for 12 users , , on mobile and android phones",
+     {"use_case": "I need a model,, on mobile and android phones", "user_count": 12, "hardware": "mobile"}),
+    ("İstanbul office needs a translation bot for 15 users",
+     {"use_case": "İstanbul office needs a translation bot", "user_count": 15}),
+]
+
+def test_golden_outputs():
+    """Recorded outputs are reproduced exactly"""
+    for text, expected in GOLDEN:
+        assert extract_usecase_json(text) == expected, (text, extract_usecase_json(text), expected)
+
+def test_parity_with_per_field_passes():
+    """Synthetic tickets and token soup give the same output as the per-field passes"""
+    texts = synthetic_tickets(5000, seed=11)
+    rng = random.Random(12)
+    tokens = ['for', 'with', 'high', 'low', 'priority', 'critical', 'urgent', 'asap', 'needs', 'cloud',
+              'infrastructure', 'gpu', 'server', 'users', 'employees', 'people', 'team', 'members', 'end',
+              'customers', 'serving', '7', '0', '1000001', 'gb', 'ram', 'edge', ' ', '\n', ',', ', ,', 'ſ', 'é', '١٢']
+    for _ in range(5000):
+        text = ''.join(rng.choice(tokens) + rng.choice(['', ' ', ' ', ',']) for _ in range(rng.randint(0, 12)))
+        texts.append(text.upper() if rng.random() < 0.3 else text)
+    for text in texts:
+        assert extract_usecase_json(text) == reference_usecase_json(text), text
+
+def test_stream_extract_in_order():
+    """Bulk mode keeps input order across workers and reports bad lines instead of stopping"""
+    tickets = synthetic_tickets(200, seed=13)
+    lines = []
+    for i, ticket in enumerate(tickets):
+        ticket = ' '.join(ticket.split())
+        lines.append(json.dumps({'id': i, 'message': ticket}) if i % 2 else ticket)
+    lines[10:10] = ['', '{not json', '{"id": "no text"}', '{"message": 5}']
+    stream = io.StringIO('\n'.join(lines) + '\n')
+
+    records = [json.loads(record) for record in stream_extract(stream, workers=2, chunk_size=7, text_field='message')]
+    assert len(records) == len(tickets) + 3  # the blank line is skipped
+    assert [record['line'] for record in records] == sorted(record['line'] for record in records)
+    errors = [record for record in records if 'error' in record]
+    assert [record['line'] for record in errors] == [12, 13, 14], errors
+    assert errors[1]['id'] == 'no text'
+
+    results = [record for record in records if 'error' not in record]
+    for i, (ticket, record) in enumerate(zip(tickets, results)):
+        assert record.pop('line') and record.pop('id', i) == i
+        assert record == extract_usecase_json(' '.join(ticket.split())), (ticket, record)
+
+def main():
+    print("=" * 70)
+    print("  Single-Pass Extraction (golden outputs and parity)")
+    print("=" * 70)
+    try:
+        test_golden_outputs()
+        test_parity_with_per_field_passes()
+        test_stream_extract_in_order()
+    except AssertionError as e:
+        print(f"\n✗ {e}")
+        return False
+    print("\n✓ All extraction tests passed")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
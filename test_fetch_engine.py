@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared fetch engine
+The token bucket paces requests to the rate limit, the engine keeps at most
+its concurrency in flight, the AIMD controller adapts that limit to 429s,
+retries honour Retry-After, deadlines raise requests' Timeout without
+starving later requests, and run_all returns results in item order; HTTP
+runs against local test servers
+"""
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from fetch_engine import AIMDController, FetchEngine, TokenBucket, _start_test_server, retry_after_seconds, run_all
+
+def test_token_bucket_pacing():
+    """A full bucket serves the burst at once, then one token per 1/rate seconds in call order"""
+    now = [0.0]
+    bucket = TokenBucket(rate=4, capacity=2, clock=lambda: now[0])
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.25, 0.5]
+    now[0] = 10.0  # refills to capacity, not beyond
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.25]
+
+def test_engine_rate_concurrency_and_order():
+    """Refresh time is set by the rate limit, results come back in item order"""
+    server, base_url = _start_test_server(latency=0.0)
+    try:
+        engine = FetchEngine(rate_limit=40, burst=1, concurrency=4)
+
+        async def fetch(engine, i):
+            return (await engine.get(f"{base_url}/models/{i}")).json()['path']
+
+        start = time.perf_counter()
+        paths = run_all(fetch, range(21), engine=engine)
+        elapsed = time.perf_counter() - start
+        assert paths == [f"/models/{i}" for i in range(21)], paths
+        assert 0.45 <= elapsed < 2.0, elapsed  # 20 intervals of 25 ms
+        assert engine.stats()['status_200'] == 21
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    server, base_url = _start_test_server(latency=0.2)
+    try:
+        engine = FetchEngine(rate_limit=1000, burst=1000, concurrency=2, initial_concurrency=2)
+
+        async def fetch(engine, i):
+            return (await engine.get(f"{base_url}/slow/{i}")).status_code
+
+        start = time.perf_counter()
+        assert run_all(fetch, range(6), engine=engine) == [200] * 6
+        assert time.perf_counter() - start >= 0.55  # three rounds of two
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_aimd_controller():
+    """Additive increase while the limit is in use, halving on overload at most once per latency period"""
+    now = [0.0]
+    controller = AIMDController(max_limit=8, initial=2, clock=lambda: now[0])
+    controller.in_flight = 8
+    for _ in range(6):  # +1/limit per response: 2, 2.5, 2.9, 3.24, 3.55, 3.83, 4.09
+        controller.on_success(0.1)
+    assert controller.current == 4 and controller.increases == 2, controller.limit
+    controller.on_overload()
+    controller.on_overload()  # same burst
+    assert controller.current == 2 and controller.decreases == 1
+    now[0] += 1.0
+    controller.on_success(0.5)  # latency jumps well above its baseline
+    assert controller.current == 1 and controller.decreases == 2
+    controller.in_flight = 0
+    limit = controller.limit
+    controller.on_success(0.1)
+    assert controller.limit == limit  # no growth while the limit is not in use
+
+def test_retry_after_and_adaptive_limit():
+    """429s above the server's capacity are retried after Retry-After and the limit settles at the capacity"""
+    assert retry_after_seconds('2') == 2.0 and retry_after_seconds('soon') is None
+    assert retry_after_seconds('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+
+    server, base_url = _start_test_server(latency=0.05, capacity=2, retry_after='0.1')
+    try:
+        engine = FetchEngine(rate_limit=1000, burst=1000, concurrency=8, initial_concurrency=6)
+
+        async def fetch(engine, i):
+            return (await engine.get(f"{base_url}/models/{i}")).status_code
+
+        assert run_all(fetch, range(30), engine=engine) == [200] * 30
+        stats = engine.stats()
+        assert stats['status_429'] >= 1 and stats['retries'] == stats['status_429'], stats
+        assert stats['retry_after_s'] >= 0.1 and stats['limit_decreases'] >= 1, stats
+        assert stats['concurrency_limit'] <= 3, stats
+        assert server.max_in_flight == 2
+
+        engine = FetchEngine(rate_limit=1000, burst=1000, initial_concurrency=6, retries=1, max_retry_after=0.05)
+        statuses = run_all(fetch, range(6), engine=engine)
+        assert 429 in statuses and engine.stats().get('retries', 0) == 0, statuses  # Retry-After too long
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_engine_timeout():
+    """A response slower than the deadline raises requests' Timeout and is counted"""
+    server, base_url = _start_test_server(latency=0.5)
+    try:
+        engine = FetchEngine(rate_limit=100, concurrency=2, timeout=0.1, retries=0)
+
+        async def fetch(engine, i):
+            return (await engine.get(f"{base_url}/slow/{i}")).status_code
+
+        results = run_all(fetch, range(2), engine=engine)
+        assert all(isinstance(result, requests.exceptions.Timeout) for result in results), results
+        assert engine.stats()['timeouts'] == 2
+
+        engine = FetchEngine(rate_limit=100, concurrency=2, timeout=0.1, retries=1)
+        results = run_all(fetch, range(1), engine=engine)
+        assert isinstance(results[0], requests.exceptions.Timeout) and engine.stats()['retries'] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def start_trickle_server(seconds: float):
+    """Server sending a body one byte per 0.05s for seconds: no socket read ever times out"""
+    chunks = int(seconds / 0.05)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Length', str(chunks))
+            self.end_headers()
+            try:
+                for _ in range(chunks):
+                    self.wfile.write(b'x')
+                    self.wfile.flush()
+                    time.sleep(0.05)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def test_timeouts_do_not_starve_later_requests():
+    """Threads left running by timed-out requests do not hold up the next ones; close() stops the engine"""
+    slow_server, slow_url = start_trickle_server(1.5)
+    fast_server, fast_url = _start_test_server(latency=0.0)
+    try:
+        with FetchEngine(rate_limit=100, burst=100, concurrency=2, initial_concurrency=2, timeout=0.2, retries=0) as engine:
+            async def fetch(engine, url):
+                return (await engine.get(url)).status_code
+
+            results = run_all(fetch, [f"{slow_url}/slow/{i}" for i in range(2)], engine=engine)
+            assert all(isinstance(result, requests.exceptions.Timeout) for result in results), results
+            # Both slow responses are still trickling in; the fast requests must not queue behind them
+            assert run_all(fetch, [f"{fast_url}/fast/{i}" for i in range(2)], engine=engine) == [200, 200]
+        result = run_all(fetch, [f"{fast_url}/closed"], engine=engine)[0]
+        assert isinstance(result, RuntimeError), result
+        assert engine.stats()['timeouts'] == 2 and fast_server.requests == [('/fast/0', None), ('/fast/1', None)]
+    finally:
+        for server in (slow_server, fast_server):
+            server.shutdown()
+            server.server_close()
+
+def main():
+    print("=" * 70)
+    print("  Fetch Engine (token bucket, AIMD concurrency, retries, deadlines)")
+    print("=" * 70)
+    try:
+        test_token_bucket_pacing()
+        test_engine_rate_concurrency_and_order()
+        test_aimd_controller()
+        test_retry_after_and_adaptive_limit()
+        test_engine_timeout()
+        test_timeouts_do_not_starve_later_requests()
+    except AssertionError as e:
+        print(f"\n✗ {e}")
+        return False
+    print("\n✓ All fetch engine tests passed")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
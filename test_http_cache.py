@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk HTTP cache behind the fetch engine
+Fresh entries are served without a request, stale ones are revalidated with
+If-None-Match and a 304 serves the stored body; HTTP runs against a local
+test server
+"""
+import gzip
+import os
+import sys
+import tempfile
+
+from fetch_engine import FetchEngine, _start_test_server, run
+from http_cache import HTTPCache
+
+def fetch_twice(cache: HTTPCache, etag=None):
+    """(server requests, first body, second body, engine stats) for two GETs of one URL"""
+    server, base_url = _start_test_server(latency=0.0, etag=etag)
+    try:
+        engine = FetchEngine(rate_limit=100, cache=cache)
+        url = f"{base_url}/data/llms/models"
+        first = run(engine.get(url, params={'open_source': 'true'}))
+        second = run(engine.get(url, params={'open_source': 'true'}))
+        return server.requests, first.json(), second.json(), engine.stats()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_fresh_entry_needs_no_request():
+    """Within the TTL the second GET is answered from disk"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        requests_seen, first, second, stats = fetch_twice(HTTPCache(cache_dir, ttl=60), etag='"v1"')
+        assert requests_seen == [('/data/llms/models?open_source=true', None)], requests_seen
+        assert first == second == {'path': '/data/llms/models?open_source=true'}
+        assert stats['cache_hits'] == 1 and stats['requests'] == 1, stats
+
+        body_files = [f for f in os.listdir(cache_dir) if f.endswith('.body.gz')]
+        assert len(body_files) == 1, os.listdir(cache_dir)
+        with gzip.open(os.path.join(cache_dir, body_files[0]), 'rb') as f:
+            assert f.read() == b'{"path": "/data/llms/models?open_source=true"}'
+
+def test_stale_entry_is_revalidated():
+    """Past the TTL the stored ETag is sent and a 304 serves the stored body"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        requests_seen, first, second, stats = fetch_twice(HTTPCache(cache_dir, ttl=0), etag='"v1"')
+        assert [inm for _, inm in requests_seen] == [None, '"v1"'], requests_seen
+        assert first == second
+        assert stats['status_304'] == 1 and stats['cache_revalidated'] == 1, stats
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        requests_seen, first, second, stats = fetch_twice(HTTPCache(cache_dir, ttl=0))
+        assert [inm for _, inm in requests_seen] == [None, None], requests_seen  # no validators, plain GET
+        assert first == second and stats['cache_stores'] == 2, stats
+
+def test_damaged_body_is_refetched():
+    """A truncated body file is a miss, not a bad response"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = HTTPCache(cache_dir, ttl=60)
+        fetch_twice(cache)
+        for filename in os.listdir(cache_dir):
+            if filename.endswith('.body.gz'):
+                with open(os.path.join(cache_dir, filename), 'wb') as f:
+                    f.write(b'\x1f\x8b')
+        requests_seen, first, second, _ = fetch_twice(cache)
+        assert len(requests_seen) == 1 and first == second, requests_seen
+
+def main():
+    print("=" * 70)
+    print("  HTTP Cache (TTL hits, conditional revalidation)")
+    print("=" * 70)
+    try:
+        test_fresh_entry_needs_no_request()
+        test_stale_entry_is_revalidated()
+        test_damaged_body_is_refetched()
+    except AssertionError as e:
+        print(f"\n✗ {e}")
+        return False
+    print("\n✓ All HTTP cache tests passed")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
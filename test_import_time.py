@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Import-time budget test for the non-semantic paths
+Runs predefined lookups, --model-info and text extraction under
+`python -X importtime` and fails if they import torch/sentence-transformers
+(or other embedding packages). As a looser check, their import time must stay
+within a multiple of a bare `import numpy` measured in the same run, so the
+budget follows the speed of the machine.
+"""
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+# Total import time allowed per path, as a multiple of `import numpy`; numpy is
+# the only heavy dependency left, torch + sentence-transformers take 20x or more
+IMPORT_TIME_BUDGET_RATIO = 4.0
+BASELINE_RUNS = 3
+FORBIDDEN_MODULES = {'torch', 'sentence_transformers', 'transformers', 'sklearn', 'onnxruntime', 'tokenizers'}
+
+PATHS = {
+    'predefined use case': (
+        "import get_best_models_semantic as g; "
+        "g.get_best_models_for_usecase({'type': 'predefined', 'name': 'code_completion'}, {})"
+    ),
+    'predefined subject': (
+        "import get_best_models_semantic as g; "
+        "g.get_best_models_for_usecase({'type': 'predefined', 'name': 'mathematics'}, {})"
+    ),
+    '--model-info': "import get_best_models_semantic as g; g.print_model_info()",
+    'get_models_from_json import': "import get_models_from_json",
+    'text extraction': (
+        "import extract_and_match_usecase as e; "
+        "e.extract_use_case_description('I need a chatbot for 100 users')"
+    ),
+}
+
+def measure_imports(code: str) -> Tuple[float, Dict[str, float]]:
+    """(total import ms, {module: cumulative ms}) for running code in a fresh interpreter"""
+    env = dict(os.environ, RANKING_DAEMON='off')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env, capture_output=True, text=True, check=True,
+    )
+    total_us = 0
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        modules[name.strip()] = int(cumulative) / 1000
+        if not name[1:].startswith(' '):  # top-level import (nested ones are indented)
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+def test_import_time_budget():
+    """Non-semantic paths never load embedding packages and stay within the budget"""
+    numpy_ms = statistics.median(measure_imports("import numpy")[0] for _ in range(BASELINE_RUNS))
+    budget_ms = IMPORT_TIME_BUDGET_RATIO * numpy_ms
+    print(f"  {'import numpy (baseline)':30s} {numpy_ms:7.1f} ms, budget {budget_ms:.0f} ms")
+    for label, code in PATHS.items():
+        total_ms, modules = measure_imports(code)
+        heavy = sorted(m for m in modules if m.split('.')[0] in FORBIDDEN_MODULES)
+        print(f"  {label:30s} {total_ms:7.1f} ms")
+        assert not heavy, f"{label} imports embedding packages: {heavy[:5]}"
+        assert total_ms <= budget_ms, \
+            f"{label} import time {total_ms:.0f} ms exceeds budget of {budget_ms:.0f} ms ({IMPORT_TIME_BUDGET_RATIO:g}x numpy)"
+
+def main():
+    print("=" * 70)
+    print(f"  Import-Time Budget (no embedding packages, ≤ {IMPORT_TIME_BUDGET_RATIO:g}x numpy per path)")
+    print("=" * 70)
+    try:
+        test_import_time_budget()
+    except AssertionError as e:
+        print(f"\n✗ {e}")
+        return False
+    print("\n✓ All paths within budget")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Equivalence tests for the compiled keyword matcher
+find_best_matching_usecases (KeywordIndex) must reproduce the per-use-case
+calculate_similarity scan exactly: same scores, same float rounding, same order
+"""
+import sys
+
+from get_best_models import PREDEFINED_USE_CASES, calculate_similarity, find_best_matching_usecases
+from keyword_automaton import AhoCorasick, KeywordIndex, reference_scores, synthetic_descriptions
+from test_extract_usecase import TEST_CASES
+
+EDGE_CASES = [
+    "",
+    "   ",
+    "Chatbot",
+    "CHAT CHAT chat chatting chatbots",
+    "I need Q&A over documents, qa and rag (retrieval-augmented)",
+    "code completion code completion code",
+    "code\ncompletion and code\tgeneration",
+    "translate translation translator mistranslated",
+    "long document summarization of a long text: summary, summarize!",
+    "research/legal document analysis for scholarly, academic research papers",
+    "real-time interactive short response dialogue",
+    "content generation blog article marketing copywriting creative writing",
+    "docs docu document documents analysis analyses",
+    "Ünïcode téxt with chatbot and ÇODE COMPLETION",
+]
+
+def test_automaton_finds_all_substrings():
+    """Overlapping and nested patterns are all reported"""
+    patterns = ['he', 'she', 'his', 'hers', 'ushers', 's']
+    automaton = AhoCorasick(patterns)
+    for text in ('ushers', 'ahishers', 'shhe', '', 'xyz'):
+        expected = {i for i, pattern in enumerate(patterns) if pattern in text}
+        assert automaton.find(text) == expected, (text, automaton.find(text), expected)
+
+def test_keyword_similarities_match_reference():
+    """Per-use-case keyword similarity equals calculate_similarity bit for bit"""
+    index = KeywordIndex(PREDEFINED_USE_CASES)
+    texts = EDGE_CASES + [test_case['input'] for test_case in TEST_CASES]
+    texts += synthetic_descriptions(3000, PREDEFINED_USE_CASES, seed=3)
+    for text in texts:
+        expected = [calculate_similarity(text, info['keywords']) for info in PREDEFINED_USE_CASES.values()]
+        assert index.keyword_similarities(text) == expected, text
+
+def test_rankings_match_reference():
+    """find_best_matching_usecases returns the reference ranking, ties in use case order"""
+    top_n = len(PREDEFINED_USE_CASES)
+    for text in EDGE_CASES + synthetic_descriptions(3000, PREDEFINED_USE_CASES, seed=4):
+        expected = sorted(reference_scores(text, PREDEFINED_USE_CASES), key=lambda x: x[1], reverse=True)
+        assert find_best_matching_usecases(text, top_n) == expected, text
+        assert find_best_matching_usecases(text) == expected[:3], text
+
+def test_duplicate_and_shared_keywords():
+    """Duplicate keywords count twice and keywords shared between use cases count for each"""
+    use_cases = {
+        'a_case': {'keywords': ['alpha beta', 'alpha beta', 'gamma']},
+        'b_case': {'keywords': ['alpha beta', 'qa']},
+        'empty': {'keywords': []},
+    }
+    index = KeywordIndex(use_cases)
+    for text in ('alpha', 'alpha beta gamma', 'aqua alphabet', 'a case of qa', 'betamax gammas', ''):
+        assert index.scores(text) == reference_scores(text, use_cases), text
+
+def main():
+    print("=" * 70)
+    print("  Compiled Keyword Matcher (equivalence with calculate_similarity)")
+    print("=" * 70)
+    try:
+        test_automaton_finds_all_substrings()
+        test_keyword_similarities_match_reference()
+        test_rankings_match_reference()
+        test_duplicate_and_shared_keywords()
+    except AssertionError as e:
+        print(f"\n✗ {e}")
+        return False
+    print("\n✓ All keyword matcher tests passed")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for the quality vs latency Pareto frontier
+skyline must agree with a pairwise-dominance check for any number of
+objectives (ties and duplicate points included), epsilon_buckets must box
+points consistently, and build_candidates/pareto_frontier must join scores
+with latency rows and keep only complete, non-dominated candidates
+"""
+import sys
+
+import numpy as np
+
+from pareto_frontier import build_candidates, epsilon_buckets, pareto_frontier, skyline
+
+def pairwise_skyline(points: np.ndarray) -> np.ndarray:
+    """Reference: a row is kept unless another row is <= everywhere and < somewhere"""
+    keep = np.ones(len(points), dtype=bool)
+    for i in range(len(points)):
+        for j in range(len(points)):
+            if (points[j] <= points[i]).all() and (points[j] < points[i]).any():
+                keep[i] = False
+                break
+    return keep
+
+def test_skyline_matches_pairwise():
+    """Random integer points with many ties and duplicates, d = 1..4"""
+    rng = np.random.default_rng(0)
+    for d in (1, 2, 3, 4):
+        for n in (0, 1, 2, 5, 40, 200):
+            for levels in (3, 10, 1000):
+                points = rng.integers(0, levels, size=(n, d)).astype(np.float64)
+                np.testing.assert_array_equal(skyline(points), pairwise_skyline(points),
+                                              err_msg=f"d={d} n={n} levels={levels}")
+    # Duplicates of a frontier point are all kept, duplicates of a dominated point all dropped
+    points = np.array([[1, 1, 1], [1, 1, 1], [2, 2, 2], [2, 2, 2], [0, 3, 1]], dtype=np.float64)
+    assert skyline(points).tolist() == [True, True, False, False, True]
+
+def test_epsilon_buckets():
+    """Rows share an id exactly when they share a box; box flags are the skyline of the boxes"""
+    points = np.array([[0.0, 0.0, 5.0], [0.05, 0.04, 5.0], [1.0, 1.0, 5.0], [0.5, 0.2, 5.0]])
+    box_ids, on_frontier = epsilon_buckets(points, 0.1)
+    assert box_ids[0] == box_ids[1] and len(set(box_ids.tolist())) == 3
+    assert on_frontier.tolist() == [True, True, False, False]
+
+    rng = np.random.default_rng(1)
+    for epsilon in (0.05, 0.25, 1.0):
+        points = rng.random((300, 3)) * [1.0, 100.0, 5000.0]
+        box_ids, on_frontier = epsilon_buckets(points, epsilon)
+        boxes = np.floor((points - points.min(axis=0)) / ((points.max(axis=0) - points.min(axis=0)) * epsilon))
+        for i in range(0, 300, 7):
+            same_box = (boxes == boxes[i]).all(axis=1)
+            np.testing.assert_array_equal(box_ids == box_ids[i], same_box, err_msg=f"epsilon={epsilon} row={i}")
+        np.testing.assert_array_equal(on_frontier, pairwise_skyline(boxes), err_msg=f"epsilon={epsilon}")
+
+def test_build_candidates():
+    """Case-insensitive name join, one candidate per latency row, unscored and unknown models skipped"""
+    model_scores = [
+        {'Model Name': 'Alpha 7B', 'Provider': 'Acme', 'Dataset': 'Open Source', 'score': 0.8},
+        {'Model Name': 'alpha 7b', 'Provider': 'Copy', 'Dataset': 'Open Source', 'score': 0.1},
+        {'Model Name': 'Beta', 'Provider': 'Acme', 'Dataset': 'Open Source', 'score': None},
+    ]
+    latency_rows = [
+        {'model_name': ' ALPHA 7B ', 'provider': 'Host A', 'ttft_ms': 100.0, 'throughput_tokens_per_sec': 50.0},
+        {'model_name': 'Alpha 7B', 'provider': 'Host B', 'ttft_ms': 300.0, 'throughput_tokens_per_sec': 90.0},
+        {'model_name': 'Beta', 'provider': 'Host A', 'ttft_ms': 50.0, 'throughput_tokens_per_sec': 10.0},
+        {'model_name': 'Gamma', 'provider': 'Host A', 'ttft_ms': 10.0, 'throughput_tokens_per_sec': 10.0},
+    ]
+    candidates = build_candidates(model_scores, latency_rows)
+    assert [(c['Model Name'], c['Provider'], c['latency_provider']) for c in candidates] == [
+        ('Alpha 7B', 'Acme', 'Host A'), ('Alpha 7B', 'Acme', 'Host B')]
+    assert [c['score'] for c in candidates] == [0.8, 0.8]
+    assert candidates[1]['ttft_ms'] == 300.0 and candidates[1]['throughput_tokens_per_sec'] == 90.0
+
+def test_pareto_frontier():
+    """Mixed min/max objectives, incomplete candidates skipped, best score first, epsilon fields"""
+    def candidate(name, score, ttft, throughput):
+        return {'Model Name': name, 'Provider': 'p', 'Dataset': 'd', 'score': score,
+                'ttft_ms': ttft, 'throughput_tokens_per_sec': throughput}
+
+    candidates = [
+        candidate('fast', 0.5, 50.0, 200.0),
+        candidate('smart', 0.9, 400.0, 40.0),
+        candidate('balanced', 0.7, 150.0, 100.0),
+        candidate('worse', 0.6, 200.0, 90.0),     # dominated by balanced
+        candidate('unmeasured', 0.99, None, 500.0),
+    ]
+    frontier = pareto_frontier(candidates, ['score', 'ttft', 'throughput'])
+    assert [c['Model Name'] for c in frontier] == ['smart', 'balanced', 'fast']
+    assert [c['Model Name'] for c in pareto_frontier(candidates, ['score', 'ttft'])] == ['smart', 'balanced', 'fast']
+    # Only the requested objectives have to be present
+    assert [c['Model Name'] for c in pareto_frontier(candidates, ['score'])] == ['unmeasured']
+    assert pareto_frontier(candidates[4:], ['score', 'ttft']) == []
+
+    with_buckets = pareto_frontier(candidates, ['score', 'ttft'], epsilon=0.5)
+    assert all(isinstance(c['epsilon_bucket'], int) and isinstance(c['epsilon_frontier'], bool) for c in with_buckets)
+    try:
+        pareto_frontier(candidates, ['score', 'cost'])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("an unknown objective was accepted")
+
+def main():
+    print("=" * 70)
+    print("  Pareto Frontier (skyline, epsilon buckets, candidate join)")
+    print("=" * 70)
+    try:
+        test_skyline_matches_pairwise()
+        test_epsilon_buckets()
+        test_build_candidates()
+        test_pareto_frontier()
+    except AssertionError as e:
+        print(f"\n✗ {e}")
+        return False
+    print("\n✓ All Pareto frontier tests passed")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
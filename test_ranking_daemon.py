@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Tests for the ranking daemon and its thin client
+Starts ranking_daemon.py on a temporary Unix socket, in a temporary copy of
+the benchmark CSVs, with a small stand-in sentence_transformers module on its
+PYTHONPATH (no model download). Rankings through ranking_client must equal
+in-process get_best_models_for_usecase, bad requests must come back as
+DaemonError, a daemon serving another directory must not be used, and the
+CLI must fall back to in-process ranking (and keep --cascade in-process)
+"""
+import csv
+import glob
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import get_best_models_semantic as semantic
+from ranking_client import DaemonError, daemon_available, ping_daemon, rank_usecases
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+STARTUP_TIMEOUT = 60
+
+# Bag-of-words hashing "embeddings": deterministic and dependency-free
+STUB_SENTENCE_TRANSFORMERS = '''
+import hashlib
+import numpy as np
+
+class SentenceTransformer:
+    def __init__(self, model_name, **kwargs):
+        self.model_name = model_name
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False, **kwargs):
+        single = isinstance(texts, str)
+        vectors = np.zeros((1 if single else len(texts), 64), dtype=np.float32)
+        for i, text in enumerate([texts] if single else texts):
+            for word in text.lower().split():
+                vectors[i, int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1
+        return vectors[0] if single else vectors
+'''
+
+def daemon_env(stub_dir: str, socket_path: str, data_dir: str):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([stub_dir, REPO_DIR] + [p for p in [env.get('PYTHONPATH')] if p])
+    env['RANKING_DAEMON_SOCKET'] = socket_path
+    env['EMBEDDING_CACHE_DIR'] = os.path.join(data_dir, '.embedding_cache')
+    env['EMBEDDING_BACKEND'] = 'torch'
+    env.pop('RANKING_DAEMON', None)
+    return env
+
+def start_daemon(data_dir: str, env):
+    process = subprocess.Popen([sys.executable, os.path.join(REPO_DIR, 'ranking_daemon.py'),
+                                '--socket', env['RANKING_DAEMON_SOCKET'], '--no-http'],
+                               cwd=data_dir, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    deadline = time.time() + STARTUP_TIMEOUT
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise AssertionError(f"daemon exited during startup:\n{process.stdout.read()}")
+        if ping_daemon(env['RANKING_DAEMON_SOCKET']) is not None:
+            return process
+        time.sleep(0.1)
+    process.kill()
+    raise AssertionError("daemon did not answer a ping in time")
+
+def stop_daemon(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    process.stdout.close()
+
+def raw_request(socket_path: str, line: bytes):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(10)
+        sock.connect(socket_path)
+        sock.sendall(line)
+        with sock.makefile('rb') as reader:
+            return json.loads(reader.readline())
+
+def run_cli(args, cwd: str, env):
+    return subprocess.run([sys.executable, os.path.join(REPO_DIR, 'get_best_models_semantic.py')] + args,
+                          cwd=cwd, env=env, capture_output=True, text=True, timeout=120)
+
+def read_csv(filename: str):
+    with open(filename, 'r', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+def test_daemon_protocol_and_fallback():
+    """Rankings, error replies, data-directory pinning and CLI fallback against a live daemon"""
+    if not hasattr(socket, 'AF_UNIX'):
+        return
+    cwd = os.getcwd()
+    saved_socket = os.environ.get('RANKING_DAEMON_SOCKET')
+    saved_switch = os.environ.pop('RANKING_DAEMON', None)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        stub_dir = os.path.join(tmp_dir, 'stubs')
+        os.makedirs(os.path.join(stub_dir, 'sentence_transformers'))
+        with open(os.path.join(stub_dir, 'sentence_transformers', '__init__.py'), 'w', encoding='utf-8') as f:
+            f.write(STUB_SENTENCE_TRANSFORMERS)
+        data_dir = os.path.join(tmp_dir, 'data')
+        other_dir = os.path.join(tmp_dir, 'other')
+        for directory in (data_dir, other_dir):
+            os.makedirs(directory)
+            for filename in glob.glob(os.path.join(REPO_DIR, '*.csv')):
+                shutil.copy(filename, directory)
+        socket_path = os.path.join(tmp_dir, 'ranking.sock')
+        env = daemon_env(stub_dir, socket_path, data_dir)
+        os.environ['RANKING_DAEMON_SOCKET'] = socket_path
+
+        process = start_daemon(data_dir, env)
+        try:
+            os.chdir(data_dir)
+            assert daemon_available()
+            assert ping_daemon()['data_dir'] == os.path.realpath(data_dir)
+
+            # Predefined use cases rank exactly as in-process
+            configs = [{'type': 'predefined', 'name': 'translation'},
+                       {'type': 'predefined', 'name': 'code_completion'}]
+            remote = rank_usecases(configs, top_k=5)
+            for config, (models, match_info) in zip(configs, remote):
+                expected_models, expected_match = semantic.get_best_models_for_usecase(config, {}, top_k=5)
+                assert models == json.loads(json.dumps(expected_models)), config
+                assert match_info == expected_match and len(models) == 5
+
+            # Bad requests come back as errors and the daemon keeps serving
+            for bad in ([{'type': 'predefined', 'name': 'no_such_use_case'}], [{'type': 'mystery'}]):
+                try:
+                    rank_usecases(bad)
+                except DaemonError as e:
+                    assert str(e), bad
+                else:
+                    raise AssertionError(f"no DaemonError for {bad}")
+            assert raw_request(socket_path, b'{not json\n')['ok'] is False
+            assert raw_request(socket_path, b'{"op": "launch"}\n') == {'ok': False, 'error': 'Unknown op: launch'}
+            assert len(rank_usecases(configs[:1])) == 1
+
+            # The CLI uses the daemon here, but not for --cascade
+            result = run_cli(['--json', json.dumps({'use_case': configs[0]}), '--top-k', '5', '--output', 'daemon.csv'],
+                             data_dir, env)
+            assert result.returncode == 0 and 'Using ranking daemon' in result.stdout, result.stdout + result.stderr
+            assert [row['Model Name'] for row in read_csv('daemon.csv')] == [m['Model Name'] for m in remote[0][0]]
+            cascade = {'use_case': {'type': 'custom', 'name': 't', 'description': 'I need translation of documents between languages'}}
+            result = run_cli(['--cascade', '--json', json.dumps(cascade), '--top-k', '3'], data_dir, env)
+            assert result.returncode == 0, result.stdout + result.stderr
+            assert 'Using ranking daemon' not in result.stdout and 'Answered by' in result.stdout, result.stdout
+
+            # A daemon pinned to another directory is not used: requests fail, the CLI ranks in-process
+            os.chdir(other_dir)
+            assert not daemon_available()
+            try:
+                rank_usecases(configs[:1])
+            except DaemonError as e:
+                assert 'Daemon serves data in' in str(e), e
+            else:
+                raise AssertionError("a daemon serving another directory answered")
+            result = run_cli(['--json', json.dumps({'use_case': configs[0]}), '--top-k', '5', '--output', 'local.csv'],
+                             other_dir, env)
+            assert result.returncode == 0 and 'Using ranking daemon' not in result.stdout, result.stdout + result.stderr
+            assert read_csv('local.csv') == read_csv(os.path.join(data_dir, 'daemon.csv'))
+        finally:
+            os.chdir(cwd)
+            stop_daemon(process)
+            if saved_socket is None:
+                os.environ.pop('RANKING_DAEMON_SOCKET', None)
+            else:
+                os.environ['RANKING_DAEMON_SOCKET'] = saved_socket
+            if saved_switch is not None:
+                os.environ['RANKING_DAEMON'] = saved_switch
+        assert not os.path.exists(socket_path), "daemon left its socket behind"
+
+def main():
+    print("=" * 70)
+    print("  Ranking Daemon (client protocol, errors, data-directory pinning)")
+    print("=" * 70)
+    try:
+        test_daemon_protocol_and_fallback()
+    except AssertionError as e:
+        print(f"\n✗ {e}")
+        return False
+    print("\n✓ All ranking daemon tests passed")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
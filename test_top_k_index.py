@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Equivalence tests for the threshold-algorithm top-k
+ScoreMatrix.top_k (SortedBenchmarkIndex) must return the same models and
+scores as a full scan (ScoreMatrix.score + rank_order), on the master CSV and
+on synthetic matrices with missing values, ties and sparse weights
+"""
+import sys
+
+import numpy as np
+
+from create_usecase_scores import MASTER_CSV, USE_CASE_WEIGHTS
+from score_matrix import ScoreMatrix, rank_order
+
+K_VALUES = (1, 3, 10, 50)
+
+def full_scan_top_k(matrix: ScoreMatrix, weight_vector: np.ndarray, k: int):
+    """Reference: score every model, rank, drop models without a weighted benchmark"""
+    scores = matrix.score(weight_vector[np.newaxis, :])[:, 0]
+    order = [i for i in rank_order(scores) if not np.isnan(scores[i])][:k]
+    return order, scores[order]
+
+def assert_same_top_k(matrix: ScoreMatrix, weight_vector: np.ndarray, k: int, label: str):
+    indices, scores, models_scored = matrix.sorted_index().top_k(weight_vector, k)
+    expected_indices, expected_scores = full_scan_top_k(matrix, weight_vector, k)
+    np.testing.assert_allclose(scores, expected_scores, rtol=0, atol=1e-12, err_msg=label)
+    assert list(indices) == expected_indices, f"{label}: {list(indices)} != {expected_indices}"
+    assert models_scored <= len(matrix)
+
+def synthetic_matrix(n_models: int, n_benchmarks: int, missing: float, seed: int, levels: int = 0) -> ScoreMatrix:
+    """Random 0-1 scores with a missing-value rate; levels > 0 quantizes scores to force ties"""
+    rng = np.random.default_rng(seed)
+    scores = rng.random((n_models, n_benchmarks)).astype(np.float32)
+    if levels:
+        scores = (np.floor(scores * levels) / levels).astype(np.float32)
+    mask = rng.random((n_models, n_benchmarks)) >= missing
+    scores[~mask] = 0.0
+    models = [{'Model Name': f"m{i}", 'Provider': 'p', 'Dataset': 'd'} for i in range(n_models)]
+    return ScoreMatrix(models, [f"b{j}" for j in range(n_benchmarks)], scores, mask)
+
+def test_master_csv_use_cases():
+    """Every predefined use case gives the full-scan top-k on the master data"""
+    matrix = ScoreMatrix.from_csv(MASTER_CSV)
+    for name, config in USE_CASE_WEIGHTS.items():
+        weight_vector = matrix.weight_vector(config['weights'])
+        for k in K_VALUES + (len(matrix),):
+            assert_same_top_k(matrix, weight_vector, k, f"{name} k={k}")
+
+def test_synthetic_matrices():
+    """Random weights (some zero) over sparse, dense and tie-heavy matrices"""
+    rng = np.random.default_rng(7)
+    for seed, (missing, levels) in enumerate([(0.0, 0), (0.3, 0), (0.7, 0), (0.3, 4)]):
+        matrix = synthetic_matrix(2000, 8, missing, seed, levels)
+        for trial in range(20):
+            weight_vector = rng.random(8) * (rng.random(8) < 0.6)
+            for k in K_VALUES:
+                assert_same_top_k(matrix, weight_vector, k, f"missing={missing} levels={levels} trial={trial} k={k}")
+
+def test_edge_weights():
+    """No weights, a single benchmark, and negative weights (full-scan fallback)"""
+    matrix = synthetic_matrix(500, 5, 0.4, seed=11)
+    indices, scores, _ = matrix.sorted_index().top_k(np.zeros(5), 10)
+    assert len(indices) == 0 and len(scores) == 0
+    assert_same_top_k(matrix, np.array([0.0, 0.0, 1.0, 0.0, 0.0]), 10, "single benchmark")
+    assert_same_top_k(matrix, np.array([0.5, -0.2, 0.3, 0.0, 0.4]), 10, "negative weight")
+    assert_same_top_k(matrix, np.ones(5), 0, "k=0")
+
+def test_early_termination():
+    """With complete data the threshold stops well before scanning every model"""
+    matrix = synthetic_matrix(20000, 6, 0.0, seed=3)
+    _, _, models_scored = matrix.sorted_index().top_k(np.array([1.0, 0.0, 0.0, 0.0, 0.0, 0.0]), 10)
+    assert models_scored < len(matrix), models_scored
+
+def main():
+    print("=" * 70)
+    print("  Threshold-Algorithm Top-K (vs full scan)")
+    print("=" * 70)
+    try:
+        test_master_csv_use_cases()
+        test_synthetic_matrices()
+        test_edge_weights()
+        test_early_termination()
+    except AssertionError as e:
+        print(f"\n✗ {e}")
+        return False
+    print("\n✓ All top-k tests passed")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests for the LRU + TTL ranking cache
+Entries expire after their TTL, a lookup with another version invalidates
+them, the least recently used entry is evicted first and every outcome is
+counted; rankings from get_best_models_for_usecase are reused until their
+source CSV changes on disk
+"""
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+from ttl_cache import TTLCache
+import get_best_models_semantic as semantic
+
+def test_ttl_expiry():
+    """An entry is served up to its TTL and gone after it"""
+    now = [0.0]
+    cache = TTLCache(maxsize=4, ttl=10.0, clock=lambda: now[0])
+    cache.put('a', 1)
+    now[0] = 10.0
+    assert cache.get('a') == 1
+    now[0] = 10.5
+    assert cache.get('a', default='missing') == 'missing'
+    assert len(cache) == 0 and cache.expirations == 1
+
+    cache.put('a', 2)  # a fresh put restarts the clock
+    now[0] = 20.0
+    assert cache.get('a') == 2
+
+    forever = TTLCache(maxsize=4, ttl=None, clock=lambda: now[0])
+    forever.put('a', 1)
+    now[0] = 1e9
+    assert forever.get('a') == 1
+
+def test_version_invalidation():
+    """A lookup with another version misses and drops the entry"""
+    cache = TTLCache(maxsize=4, ttl=None)
+    cache.put('ranking', ['m1', 'm2'], version=(1, 100))
+    assert cache.get('ranking', version=(1, 100)) == ['m1', 'm2']
+    assert cache.get('ranking', version=(2, 100)) is None
+    assert cache.invalidations == 1 and len(cache) == 0
+    assert cache.get('ranking', version=(1, 100)) is None  # not resurrected by the old version
+    cache.put('plain', 1)
+    assert cache.get('plain', version='v1') is None  # unversioned entries only match unversioned lookups
+
+def test_lru_eviction_and_stats():
+    """The least recently used entry is evicted first; counters add up"""
+    cache = TTLCache(maxsize=3, ttl=None)
+    for key in 'abc':
+        cache.put(key, key.upper())
+    assert cache.get('a') == 'A'  # a is now the most recently used
+    cache.put('d', 'D')
+    assert cache.get('b') is None and len(cache) == 3
+    cache.put('c', 'C2')  # re-putting refreshes recency without evicting
+    cache.put('e', 'E')
+    assert cache.get('a') is None and cache.get('c') == 'C2' and cache.get('d') == 'D'
+
+    stats = cache.stats()
+    assert stats['size'] == 3 and stats['maxsize'] == 3
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (3, 2, 2), stats
+    assert stats['hit_rate'] == 3 / 5
+    cache.clear()
+    assert len(cache) == 0 and cache.stats()['hits'] == 3
+
+def test_thread_safety():
+    """Concurrent puts and gets keep the size bounded and every lookup counted"""
+    cache = TTLCache(maxsize=50, ttl=None)
+
+    def worker(offset):
+        for i in range(2000):
+            cache.put((offset + i) % 80, i)
+            cache.get((offset * 7 + i) % 80)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.stats()
+    assert len(cache) <= 50 and stats['hits'] + stats['misses'] == 8000, stats
+
+def test_ranking_cache_follows_csv():
+    """A predefined ranking is served from the cache until its CSV is rewritten"""
+    source = os.path.abspath(semantic.ALL_CSVS['translation']['csv_file'])
+    cwd = os.getcwd()
+    cache = semantic._ranking_cache
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            shutil.copy(source, 'opensource_translation.csv')
+            config = {'type': 'predefined', 'name': 'translation'}
+            hits, invalidations = cache.hits, cache.invalidations
+
+            models, match_info = semantic.get_best_models_for_usecase(config, {}, top_k=3)
+            assert match_info == {'translation': 1.0} and len(models) == 3
+            assert semantic.get_best_models_for_usecase(config, {}, top_k=3)[0] == models
+            assert cache.hits == hits + 1
+
+            # Rewrite the CSV with the top model dropped
+            with open('opensource_translation.csv', 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines(keepends=True)
+            with open('opensource_translation.csv', 'w', encoding='utf-8') as f:
+                f.writelines(lines[:1] + lines[2:])
+            stat = os.stat('opensource_translation.csv')
+            os.utime('opensource_translation.csv', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+            reloaded, _ = semantic.get_best_models_for_usecase(config, {}, top_k=3)
+            assert cache.invalidations == invalidations + 1
+            assert reloaded[:2] == models[1:], (reloaded, models)
+        finally:
+            os.chdir(cwd)
+
+def main():
+    print("=" * 70)
+    print("  TTL Cache (expiry, versions, LRU, ranking invalidation)")
+    print("=" * 70)
+    try:
+        test_ttl_expiry()
+        test_version_invalidation()
+        test_lru_eviction_and_stats()
+        test_thread_safety()
+        test_ranking_cache_follows_csv()
+    except AssertionError as e:
+        print(f"\n✗ {e}")
+        return False
+    print("\n✓ All TTL cache tests passed")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
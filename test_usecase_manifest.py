@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental use-case CSV generation
+generate_usecase_csvs must rebuild exactly the use cases whose weights or
+weighted benchmark columns changed (or whose CSV is missing), and the CSVs it
+writes must match the per-row calculate_usecase_score reference
+"""
+import contextlib
+import csv
+import io
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from create_usecase_scores import (
+    MASTER_CSV,
+    USE_CASE_WEIGHTS,
+    calculate_usecase_score,
+    generate_usecase_csvs,
+    load_manifest,
+)
+from score_matrix import ScoreMatrix, format_score
+
+MASTER_PATH = os.path.abspath(MASTER_CSV)
+
+def read_rows():
+    with open(MASTER_PATH, 'r', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+def use_cases(overrides=None):
+    """(name, weights_config) pairs of every predefined use case, with some weights replaced"""
+    overrides = overrides or {}
+    return [(name, {**config, 'weights': overrides.get(name, config['weights'])})
+            for name, config in USE_CASE_WEIGHTS.items()]
+
+def generate(matrix, cases, force=False):
+    """(rebuilt, unchanged) as sets, with the progress output silenced"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        rebuilt, unchanged = generate_usecase_csvs(cases, matrix, force, 'manifest.json')
+    return set(rebuilt), set(unchanged)
+
+def users_of(column: str):
+    return {name for name, config in USE_CASE_WEIGHTS.items() if config['weights'].get(column)}
+
+def test_dirty_tracking():
+    """Only use cases touched by a weight, column, model or file change are rebuilt"""
+    rows = read_rows()
+    all_names = set(USE_CASE_WEIGHTS)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            matrix = ScoreMatrix.from_rows(rows)
+            assert generate(matrix, use_cases()) == (all_names, set())
+            assert set(load_manifest('manifest.json')) == all_names
+            assert generate(matrix, use_cases()) == (set(), all_names)
+
+            # A weight change dirties only that use case
+            weights = dict(USE_CASE_WEIGHTS['translation']['weights'])
+            weights['mmlu_pro'] = weights.get('mmlu_pro', 0) + 0.05
+            assert generate(matrix, use_cases({'translation': weights})) == ({'translation'}, all_names - {'translation'})
+            assert generate(matrix, use_cases()) == ({'translation'}, all_names - {'translation'})
+
+            # A changed benchmark column dirties the use cases that weight it
+            changed = [dict(row) for row in rows]
+            changed[0]['lcr'] = '0.1234'
+            assert users_of('lcr') and users_of('lcr') != all_names
+            assert generate(ScoreMatrix.from_rows(changed), use_cases()) == (users_of('lcr'), all_names - users_of('lcr'))
+
+            # A renamed model changes every ranking; a missing CSV or --force rebuilds too
+            changed[1]['Model Name'] += ' (renamed)'
+            assert generate(ScoreMatrix.from_rows(changed), use_cases())[0] == all_names
+            os.remove('opensource_summarization_short.csv')
+            assert generate(ScoreMatrix.from_rows(changed), use_cases())[0] == {'summarization_short'}
+            assert generate(ScoreMatrix.from_rows(changed), use_cases(), force=True)[0] == all_names
+        finally:
+            os.chdir(cwd)
+
+def test_csvs_match_reference():
+    """Generated scores and order equal calculate_usecase_score row by row"""
+    rows = read_rows()
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            generate(ScoreMatrix.from_rows(rows), use_cases())
+            for name, config in USE_CASE_WEIGHTS.items():
+                reference = [calculate_usecase_score(row, config['weights']) for row in rows]
+                order = sorted(range(len(rows)), key=lambda i: -(reference[i] or 0.0))
+                with open(f"opensource_{name}.csv", 'r', encoding='utf-8') as f:
+                    written = list(csv.DictReader(f))
+                assert [row['Model Name'] for row in written] == [rows[i]['Model Name'] for i in order], name
+                for row, i in zip(written, order):
+                    expected = format_score(reference[i] if reference[i] is not None else np.nan)
+                    assert row['Use Case Score'] == expected, (name, row, expected)
+        finally:
+            os.chdir(cwd)
+
+def main():
+    print("=" * 70)
+    print("  Use Case Manifest (dirty tracking, reference scores)")
+    print("=" * 70)
+    try:
+        test_dirty_tracking()
+        test_csvs_match_reference()
+    except AssertionError as e:
+        print(f"\n✗ {e}")
+        return False
+    print("\n✓ All manifest tests passed")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
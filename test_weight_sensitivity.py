@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for the Monte Carlo weight sensitivity analyzer
+With a near-infinite Dirichlet concentration every sample reproduces the
+deterministic ranking; statistics must not depend on how samples are split
+into chunks or spread over a worker pool; invalid sample counts and
+concentrations are rejected
+"""
+import sys
+
+import numpy as np
+
+from analyze_weight_sensitivity import (
+    analyze_sensitivity,
+    merge_rank_stats,
+    new_rank_stats,
+    rank_stats_for_weights,
+    sample_weight_vectors,
+    summarize_sensitivity,
+)
+from create_usecase_scores import MASTER_CSV, USE_CASE_WEIGHTS
+from score_matrix import ScoreMatrix, rank_order
+
+def assert_same_stats(actual, expected, label):
+    assert actual.keys() == expected.keys()
+    for key in expected:
+        np.testing.assert_array_equal(actual[key], expected[key], err_msg=f"{label}: {key}")
+
+def test_infinite_concentration_is_deterministic():
+    """Every sample ranks a model where the configured weights do (within exact-score tie groups)"""
+    matrix = ScoreMatrix.from_csv(MASTER_CSV)
+    for name, config in USE_CASE_WEIGHTS.items():
+        stats = analyze_sensitivity(config['weights'], 300, 1e12, top_k=3, seed=1, matrix=matrix, task_size=128)
+        scores = matrix.score_weights(config['weights'])
+        base_rank = np.empty(len(matrix), dtype=np.int64)
+        base_rank[rank_order(scores)] = np.arange(1, len(matrix) + 1)
+        raw = np.nan_to_num(scores, nan=-1.0)
+        for i in range(len(matrix)):
+            # Models whose scores differ by a few ulps may swap under tiny weight noise
+            tied = base_rank[np.abs(raw - raw[i]) <= 1e-9]
+            assert tied.min() <= stats['best_rank'][i] <= stats['worst_rank'][i] <= tied.max(), (name, i)
+        assert int(stats['samples'][0]) == 300
+        assert stats['top1'].sum() == stats['top_k'].sum() / 3 == 300
+
+        rows = summarize_sensitivity(matrix, config['weights'], stats, 3)
+        assert [row['P(Top-3)'] for row in rows[:3]] == ['100.00%'] * 3, name
+
+def test_chunking_does_not_change_statistics():
+    """Samples scored in uneven pieces, or by a two-process pool, give the one-chunk statistics"""
+    matrix = ScoreMatrix.from_csv(MASTER_CSV)
+    weights = USE_CASE_WEIGHTS['document_analysis_rag']['weights']
+    samples = sample_weight_vectors(matrix.weight_vector(weights), 500, 20.0, np.random.default_rng(3))
+    whole = rank_stats_for_weights(matrix, samples, 5)
+    pieces = new_rank_stats(len(matrix))
+    for start, end in ((0, 1), (1, 120), (120, 121), (121, 500)):
+        merge_rank_stats(pieces, rank_stats_for_weights(matrix, samples[start:end], 5))
+    assert_same_stats(pieces, whole, "pieces")
+
+    single = analyze_sensitivity(weights, 1000, 20.0, 5, workers=1, seed=7, matrix=matrix, task_size=150)
+    pooled = analyze_sensitivity(weights, 1000, 20.0, 5, workers=2, seed=7, matrix=matrix, task_size=150)
+    assert_same_stats(pooled, single, "pool")
+    assert int(single['histogram'].sum()) == 1000 * len(matrix)
+
+def test_rejects_invalid_parameters():
+    """No samples, non-positive concentration and top_k < 1 raise ValueError"""
+    weights = USE_CASE_WEIGHTS['translation']['weights']
+    matrix = ScoreMatrix.from_csv(MASTER_CSV)
+    for kwargs in ({'n_samples': 0}, {'n_samples': -5}, {'concentration': 0.0},
+                   {'concentration': -1.0}, {'concentration': float('nan')}, {'top_k': 0}):
+        try:
+            analyze_sensitivity(weights, matrix=matrix, **kwargs)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {kwargs}")
+
+def main():
+    print("=" * 70)
+    print("  Weight Sensitivity (deterministic limit, chunking, validation)")
+    print("=" * 70)
+    try:
+        test_infinite_concentration_is_deterministic()
+        test_chunking_does_not_change_statistics()
+        test_rejects_invalid_parameters()
+    except AssertionError as e:
+        print(f"\n✗ {e}")
+        return False
+    print("\n✓ All weight sensitivity tests passed")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
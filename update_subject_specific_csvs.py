@@ -4,14 +4,17 @@ Update subject-specific CSVs to only include the 204 models from opensource_all_
 """
 import csv
 import os
+from benchmark_snapshot import load_score_matrix
+from score_matrix import format_score
 
-# Read the master CSV with 204 models
+# Read the master data with 204 models (binary snapshot when available)
 master_models = {}
-with open('opensource_all_benchmarks.csv', 'r', encoding='utf-8') as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        model_name = row['Model Name']
-        master_models[model_name] = row
+master_matrix = load_score_matrix('opensource_all_benchmarks.csv')
+for i, model in enumerate(master_matrix.models):
+    row = dict(model)
+    for j, benchmark in enumerate(master_matrix.benchmarks):
+        row[benchmark] = format_score(master_matrix.scores[i, j]) if master_matrix.mask[i, j] else 'N/A'
+    master_models[row['Model Name']] = row
 
 print(f"Master CSV contains {len(master_models)} models")
 
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Registry of user-defined use cases for semantic matching
+A registered use case has a name, a description and weights over the built-in
+use cases/subjects (ALL_CSVS), e.g. {"code_completion": 0.7, "mathematics": 0.3}.
+Descriptions are embedded once at registration and kept in an on-disk IVF
+index (ann_index.py), so custom use cases are matched against tens of
+thousands of registered ones with an approximate top-k instead of a full scan.
+
+The registry lives in USECASE_REGISTRY_DIR (default: usecase_registry/).
+
+Usage:
+    # Register one use case
+    python3 usecase_registry.py --add sql_assistant --description "Write and explain SQL queries" \\
+        --weights '{"code_generation_detailed": 0.6, "computer_science": 0.4}'
+
+    # Register many (one {"name", "description", "weights"} object per line)
+    python3 usecase_registry.py --import usecases.jsonl
+
+    # Remove, list, query
+    python3 usecase_registry.py --remove sql_assistant
+    python3 usecase_registry.py --list
+    python3 usecase_registry.py --query "help me write database queries"
+
+    # Recall@k vs latency of the ANN index against exact search
+    python3 usecase_registry.py --benchmark
+"""
+import json
+import os
+import sys
+import time
+import argparse
+import numpy as np
+from typing import Collection, Dict, List, Optional, Tuple
+
+from ann_index import IVFIndex, MIN_TRAIN_SIZE, index_version, perturbed_queries, run_benchmark
+
+DEFAULT_REGISTRY_DIR = os.environ.get('USECASE_REGISTRY_DIR', 'usecase_registry')
+
+def registry_version(path: str = DEFAULT_REGISTRY_DIR) -> Optional[Tuple]:
+    """Generation and (mtime, size) of the registry files, None when nothing is registered"""
+    return index_version(path)
+
+def validate_usecase(usecase: Dict, sources: Collection[str]):
+    """Raise ValueError unless usecase has a name, a description and positive weights over known sources"""
+    name = usecase.get('name')
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("Registered use case must provide a 'name'")
+    if not isinstance(usecase.get('description'), str) or not usecase['description'].strip():
+        raise ValueError(f"Registered use case {name} must provide a 'description'")
+    weights = usecase.get('weights')
+    if not isinstance(weights, dict) or not weights:
+        raise ValueError(f"Registered use case {name} must provide 'weights' over use cases/subjects")
+    unknown = [source for source in weights if source not in sources]
+    if unknown:
+        raise ValueError(f"Registered use case {name} has unknown weight sources: {unknown}. Available: {list(sources)}")
+    if any(not isinstance(w, (int, float)) or w < 0 for w in weights.values()) or sum(weights.values()) <= 0:
+        raise ValueError(f"Registered use case {name} weights must be non-negative and not all zero")
+
+class UseCaseRegistry:
+    """Named use cases (description + source weights) with ANN search over their embeddings"""
+
+    def __init__(self, path: str = DEFAULT_REGISTRY_DIR, embedding_tag: Optional[str] = None):
+        self.path = path
+        self.index = IVFIndex(path, tag=embedding_tag)
+        self.embedding_tag = embedding_tag
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, name: str):
+        return name in self.index
+
+    def names(self) -> List[str]:
+        return self.index.keys()
+
+    @property
+    def compatible(self) -> bool:
+        """Whether the stored embeddings come from the model this registry was opened for"""
+        return self.index.tag is None or self.embedding_tag is None or self.index.tag == self.embedding_tag
+
+    def get(self, name: str) -> Optional[Dict]:
+        """{'name', 'description', 'weights'} of a registered use case"""
+        data = self.index.get(name)
+        return {'name': name, **data} if data is not None else None
+
+    def source_weights(self, name: str) -> Dict[str, float]:
+        """Weights of a registered use case over use cases/subjects, summing to 1"""
+        weights = self.index.get(name)['weights']
+        total = sum(weights.values())
+        return {source: weight / total for source, weight in weights.items()}
+
+    def register(self, usecases: List[Dict], embeddings: np.ndarray):
+        """Add (or replace) use cases with their description embeddings"""
+        self.index.add(
+            [usecase['name'] for usecase in usecases], embeddings,
+            [{'description': usecase['description'], 'weights': usecase['weights']} for usecase in usecases]
+        )
+
+    def remove(self, names: List[str]) -> int:
+        return self.index.remove(names)
+
+    def search(self, query_embedding: np.ndarray, k: int = 10, nprobe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """(name, cosine similarity) of the approximate top-k registered use cases"""
+        if not len(self.index):
+            return []
+        return self.index.search(query_embedding, k, nprobe)
+
+def load_usecases_file(filename: str) -> List[Dict]:
+    """Use cases from a JSONL file (one object per line) or a JSON list"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if text.lstrip().startswith('['):
+        return json.loads(text)
+    usecases = []
+    for line_number, line in enumerate(text.splitlines(), 1):
+        if line.strip():
+            try:
+                usecases.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{filename}:{line_number}: invalid JSON: {e}") from e
+    return usecases
+
+def main():
+    import get_best_models_semantic as semantic
+
+    parser = argparse.ArgumentParser(
+        description='Register, remove and search user-defined use cases',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 usecase_registry.py --add sql_assistant --description "Write and explain SQL queries" \\
+      --weights '{"code_generation_detailed": 0.6, "computer_science": 0.4}'
+  python3 usecase_registry.py --import usecases.jsonl
+  python3 usecase_registry.py --query "help me write database queries" --top-k 5
+  python3 usecase_registry.py --benchmark --k 10
+        """
+    )
+    parser.add_argument('--registry', type=str, default=DEFAULT_REGISTRY_DIR,
+                        help=f'Registry directory (default: {DEFAULT_REGISTRY_DIR}, env USECASE_REGISTRY_DIR)')
+    parser.add_argument('--add', type=str, metavar='NAME', help='Register (or replace) a use case')
+    parser.add_argument('--description', type=str, help='Description for --add')
+    parser.add_argument('--weights', type=str, help='JSON weights over use cases/subjects for --add')
+    parser.add_argument('--import', dest='import_file', type=str, help='Register use cases from a JSONL/JSON file')
+    parser.add_argument('--remove', nargs='+', metavar='NAME', help='Remove registered use cases')
+    parser.add_argument('--list', action='store_true', help='List registered use cases')
+    parser.add_argument('--query', type=str, help='Show the registered use cases closest to a description')
+    parser.add_argument('--top-k', type=int, default=10, help='Matches for --query (default: 10)')
+    parser.add_argument('--benchmark', action='store_true', help='Recall@k and latency of ANN vs exact search')
+    parser.add_argument('--k', type=int, default=10, help='k for --benchmark recall@k (default: 10)')
+    parser.add_argument('--compact', action='store_true', help='Retrain the index and drop deleted entries')
+
+    args = parser.parse_args()
+    registry = UseCaseRegistry(args.registry, semantic.embedding_tag())
+
+    if args.add or args.import_file:
+        if args.add:
+            try:
+                weights = json.loads(args.weights or '')
+            except json.JSONDecodeError as e:
+                print(f"Error: --weights must be a JSON object: {e}")
+                sys.exit(1)
+            usecases = [{'name': args.add, 'description': args.description or '', 'weights': weights}]
+        else:
+            usecases = load_usecases_file(args.import_file)
+        start = time.time()
+        try:
+            count = semantic.register_usecases(usecases, registry)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"✓ Registered {count} use case(s) in {time.time() - start:.1f}s ({len(registry)} total)")
+    elif args.remove:
+        print(f"✓ Removed {registry.remove(args.remove)} use case(s) ({len(registry)} left)")
+    elif args.list:
+        for name in registry.names():
+            usecase = registry.get(name)
+            print(f"  {name}: {usecase['description']}")
+            print(f"    weights: {json.dumps(usecase['weights'])}")
+        print(f"\n{len(registry)} registered use case(s)")
+    elif args.query:
+        for i, (name, score) in enumerate(registry.search(semantic.get_query_embedding(args.query), args.top_k), 1):
+            print(f"  {i}. {name}: {score:.3f}")
+    elif args.benchmark:
+        if not len(registry):
+            print(f"Error: no use cases registered in {args.registry}")
+            sys.exit(1)
+        run_benchmark(registry.index, perturbed_queries(registry.index, 200), args.k)
+    elif args.compact:
+        registry.index.compact()
+        if len(registry) >= MIN_TRAIN_SIZE:
+            registry.index.train()
+        print(f"✓ Compacted {args.registry} ({len(registry)} use cases)")
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()